@@ -0,0 +1,107 @@
+"""Benchmarks the status and badge parsing of `_extract_applicant_fields` per applicant.
+
+The saved rows are parsed into text once, then only the status/badge step is timed, with
+the precompiled `BADGE_PATTERN` and `DECISION_DATE_PATTERNS` and with the if/elif chain of
+uncompiled `re` calls they replaced. Full field extraction is timed for comparison.
+
+Run from the project root:
+    python benchmarks/bench_badges.py --applicants 30000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from bench_parsers import load_fixture
+from web_scraper.parsers import ApplicantText, get_parser
+from web_scraper.utils import _classify_badge, _extract_applicant_fields, _parse_status
+
+def chain_fields(text:ApplicantText) -> dict[str, str|None]:
+    """Status and badge fields parsed by the original if/elif chain, as a reference."""
+    entry = dict.fromkeys(("status", "date_decision", "term", "nationality",
+                           "gre", "gre_v", "gre_aw", "gpa"))
+    status_text = text.status
+    if status_text is not None:
+        for decision in ("Accepted", "Rejected", "Wait listed", "Interview"):
+            if decision in status_text:
+                entry["status"] = decision
+                m = re.search(decision + r" on ([\w\s\d]+)", status_text)
+                if m:
+                    entry["date_decision"] = m.group(1)
+                break
+        else:
+            entry["status"] = status_text
+    for badge in text.badges:
+        if re.search(r"(Fall|Spring|Summer)\s*\d{4}", badge):
+            entry["term"] = badge
+        elif badge in ("American", "International"):
+            entry["nationality"] = badge
+        elif badge.startswith("GRE ") and "V" not in badge and "AW" not in badge:
+            m = re.match(r"GRE (\d+)", badge)
+            if m:
+                entry["gre"] = m.group(1)
+        elif badge.startswith("GRE V"):
+            m = re.match(r"GRE V (\d+)", badge)
+            if m:
+                entry["gre_v"] = m.group(1)
+        elif badge.startswith("GRE AW"):
+            m = re.match(r"GRE AW ([\d\.]+)", badge)
+            if m:
+                entry["gre_aw"] = m.group(1)
+        elif badge.startswith("GPA"):
+            m = re.match(r"GPA ([\d\.]+)", badge)
+            if m:
+                entry["gpa"] = m.group(1)
+    return entry
+
+def compiled_fields(text:ApplicantText) -> dict[str, str|None]:
+    """Status and badge fields parsed by `_parse_status` and `_classify_badge`."""
+    entry = dict.fromkeys(("status", "date_decision", "term", "nationality",
+                           "gre", "gre_v", "gre_aw", "gpa"))
+    if text.status is not None:
+        entry["status"], entry["date_decision"] = _parse_status(text.status)
+    for badge in text.badges:
+        _classify_badge(entry, badge)
+    return entry
+
+def best_of(repeat:int, func, items:list) -> tuple[float, list]:
+    """Applies `func` to every item `repeat` times; returns the fastest seconds and the output."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = [func(item) for item in items]
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+def main() -> None:
+    """Times status/badge parsing both ways and checks they produce the same fields."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark status and badge parsing.")
+    arg_parser.add_argument("--applicants", type=int, default=30000, help="Number of applicants to parse")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is kept")
+    arg_parser.add_argument("--parser", help="Parser backend (default: fastest installed)")
+    args = arg_parser.parse_args()
+
+    raw_data = load_fixture(args.applicants)
+    backend = get_parser(args.parser)
+    texts = [backend.applicant_text(backend.parse_rows(rows)) for rows in raw_data]
+
+    timings = {}
+    timings["if/elif chain"], reference = best_of(args.repeat, chain_fields, texts)
+    timings["compiled"], fields = best_of(args.repeat, compiled_fields, texts)
+    if fields != reference:
+        raise AssertionError("Compiled badge parsing differs from the if/elif chain")
+    timings[f"full extraction ({backend.name})"], _ = best_of(
+        1, lambda rows: _extract_applicant_fields(rows, backend.name), raw_data)
+
+    badges = sum(len(text.badges) for text in texts)
+    print(f"{len(texts)} applicants, {badges / len(texts):.1f} badges each")
+    for name, elapsed in timings.items():
+        print(f"{name:>28}: {elapsed:8.3f} s total, "
+              f"{elapsed / len(texts) * 1e6:8.2f} us/applicant")
+
+if __name__ == "__main__":
+    main()
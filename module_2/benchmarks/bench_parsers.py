@@ -0,0 +1,50 @@
+"""Benchmarks the parser backends of `_extract_applicant_fields` on saved applicant rows.
+
+Run from the project root:
+    python benchmarks/bench_parsers.py --applicants 30000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from web_scraper.parsers import PARSERS
+from web_scraper.utils import _extract_applicant_fields
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "raw_rows.json"
+
+def load_fixture(applicants:int) -> list[list[str]]:
+    """Loads the saved raw rows, repeated up to `applicants` applicants."""
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [rows[i % len(rows)] for i in range(applicants)]
+
+def bench_parser(parser:str, raw_data:list[list[str]]) -> tuple[float, list[dict]]:
+    """Cleans `raw_data` with one parser backend and returns the elapsed seconds and output."""
+    start = time.perf_counter()
+    cleaned = [_extract_applicant_fields(rows, parser) for rows in raw_data]
+    return time.perf_counter() - start, cleaned
+
+def main() -> None:
+    """Times every installed parser backend and checks they produce the same output."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark applicant field extraction backends.")
+    arg_parser.add_argument("--applicants", type=int, default=10000, help="Number of applicants to clean")
+    args = arg_parser.parse_args()
+
+    raw_data = load_fixture(args.applicants)
+    reference = None
+    for name in PARSERS:
+        elapsed, cleaned = bench_parser(name, raw_data)
+        if reference is None:
+            reference = cleaned
+        elif cleaned != reference:
+            raise AssertionError(f"Parser {name!r} output differs from {next(iter(PARSERS))!r}")
+        print(f"{name:>12}: {elapsed:8.3f} s total, "
+              f"{elapsed / len(raw_data) * 1e6:8.1f} us/applicant")
+
+if __name__ == "__main__":
+    main()
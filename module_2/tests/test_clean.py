@@ -0,0 +1,49 @@
+import pytest
+from web_scraper import clean
+from web_scraper.clean import MIN_CHUNK_SIZE, _clean_chunk, _clean_parallel
+
+def raw_applicant(result_id:int) -> list[str]:
+    """The raw row HTML of one applicant, as saved with `scrape_data(..., raw_savepath=...)`."""
+    main = (
+        '<tr><td><div class="tw-font-medium tw-text-gray-900 tw-text-sm">'
+        f'University {result_id % 7}</div></td>'
+        f'<td><div><span>Program {result_id % 5}</span><span>Masters</span></div></td>'
+        '<td class="tw-px-3">March 3, 2025</td>'
+        '<td><div class="tw-inline-flex">Accepted on 15 Mar</div></td>'
+        f'<td><div><a href="/result/{result_id}">See More</a></div></td></tr>'
+    )
+    badges = (
+        '<tr class="tw-border-none"><td colspan="5"><div>'
+        '<div class="tw-inline-flex">Fall 2025</div>'
+        f'<div class="tw-inline-flex">GPA 3.{result_id % 100:02d}</div>'
+        '</div></td></tr>'
+    )
+    return [main, badges]
+
+class CountingExecutor(clean.ProcessPoolExecutor):
+    """A process pool that counts the chunks submitted to it."""
+    submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        CountingExecutor.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+@pytest.mark.clean
+def test_parallel_cleaning_keeps_input_order_and_matches_serial(monkeypatch):
+    """Test that cleaning on 2 processes yields, in input order, what cleaning serially does."""
+    monkeypatch.setattr(clean, "ProcessPoolExecutor", CountingExecutor)
+    raw_data = [raw_applicant(result_id) for result_id in range(2 * MIN_CHUNK_SIZE + 123)]
+
+    parallel = list(_clean_parallel(iter(raw_data), workers=2))
+    assert CountingExecutor.submitted == 3
+    assert parallel == _clean_chunk(raw_data)
+    assert [a["url"] for a in parallel] == [
+        f"https://www.thegradcafe.com/result/{result_id}" for result_id in range(len(raw_data))]
+    assert parallel[1]["gpa"] == "3.01"
+
+@pytest.mark.clean
+def test_too_little_data_is_cleaned_serially(monkeypatch):
+    """Test that fewer than workers * MIN_CHUNK_SIZE applicants never start a process pool."""
+    monkeypatch.setattr(clean, "ProcessPoolExecutor", None)
+    raw_data = [raw_applicant(result_id) for result_id in range(10)]
+    assert list(_clean_parallel(raw_data, workers=2)) == _clean_chunk(raw_data)
@@ -0,0 +1,65 @@
+import importlib.util
+import sys
+from pathlib import Path
+import pytest
+
+# The script shares its name with the web_scraper package, so it is loaded from its path
+SCRIPT = Path(__file__).parents[1] / "web_scraper.py"
+
+@pytest.fixture
+def script():
+    """The web_scraper.py script, loaded as a module."""
+    spec = importlib.util.spec_from_file_location("web_scraper_script", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.mark.cli
+def test_workers_and_max_rate_flags(script, monkeypatch):
+    """Test that --workers and --max_rate are parsed from the command line."""
+    monkeypatch.setattr(sys, "argv", ["web_scraper.py", "--workers", "4", "--max_rate", "2.5"])
+    args = script.parse_args()
+    assert (args.workers, args.max_rate) == (4, 2.5)
+
+@pytest.mark.cli
+def test_flag_defaults(script, monkeypatch):
+    """Test that the scraper fetches one page at a time at an adaptive rate by default."""
+    monkeypatch.setattr(sys, "argv", ["web_scraper.py"])
+    args = script.parse_args()
+    assert (args.workers, args.max_rate) == (1, None)
+
+@pytest.mark.cli
+def test_main_passes_workers_and_max_rate(script, monkeypatch, tmp_path):
+    """Test that main hands the concurrency options on to scrape_data."""
+    calls = []
+    monkeypatch.setattr(script, "scrape_data", lambda *args, **kwargs: calls.append(kwargs))
+    script.main(tmp_path / "applicants.jsonl", workers=4, max_rate=2.5)
+    assert calls[0]["workers"] == 4
+    assert calls[0]["max_rate"] == 2.5
+
+@pytest.mark.cli
+def test_incremental_and_cache_dir_flags(script, monkeypatch, tmp_path):
+    """Test that --incremental and --cache_dir are parsed from the command line."""
+    monkeypatch.setattr(sys, "argv", ["web_scraper.py", "--incremental", "--cache_dir", str(tmp_path)])
+    args = script.parse_args()
+    assert args.incremental is True
+    assert args.cache_dir == tmp_path
+
+@pytest.mark.cli
+def test_full_scrape_with_default_cache_by_default(script, monkeypatch):
+    """Test that the scraper does a full scrape into data/page_cache by default."""
+    monkeypatch.setattr(sys, "argv", ["web_scraper.py"])
+    args = script.parse_args()
+    assert args.incremental is False
+    assert args.cache_dir == SCRIPT.parent / "data" / "page_cache"
+
+@pytest.mark.cli
+def test_main_scrapes_incrementally(script, monkeypatch, tmp_path):
+    """Test that an incremental main passes the saved result ids on and merges the new ones."""
+    calls = []
+    monkeypatch.setattr(script, "load_known_ids", lambda path: {"1", "2"})
+    monkeypatch.setattr(script, "scrape_data", lambda *args, **kwargs: calls.append(kwargs))
+    script.main(tmp_path / "applicants.jsonl", incremental=True, cache_dir=tmp_path / "cache")
+    assert calls[0]["known_ids"] == {"1", "2"}
+    assert calls[0]["merge"] is True
+    assert calls[0]["cache_dir"] == tmp_path / "cache"
@@ -0,0 +1,184 @@
+import pytest
+import urllib3
+from web_scraper import fetch
+from web_scraper.fetch import Fetcher, RobotsDisallowed, TokenBucket
+
+class FakeClock:
+    """Stands in for the `time` module, advancing only when slept."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds:float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FakeResponse:
+    def __init__(self, status:int=200, data:bytes=b"", headers:dict|None=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake clock in place of the fetch module's `time`."""
+    fake = FakeClock()
+    monkeypatch.setattr(fetch, "time", fake)
+    return fake
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """The upper bounds of the jittered backoffs drawn; each draw returns its bound."""
+    bounds = []
+    def uniform(low:float, high:float) -> float:
+        assert low == 0
+        bounds.append(high)
+        return high
+    monkeypatch.setattr(fetch.random, "uniform", uniform)
+    return bounds
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serves scripted responses to `urllib3.PoolManager.request`, recording the URLs requested.
+
+    `server.robots` is the robots.txt response, and `server.pages` a list of responses (or
+    exceptions to raise) returned in turn for every other URL.
+    """
+    class Server:
+        robots = FakeResponse(404)
+        pages = []
+        requested = []
+    def request(_pool, method:str, url:str, **kwargs):
+        assert method == "GET"
+        if url.endswith("/robots.txt"):
+            return Server.robots
+        Server.requested.append(url)
+        page = Server.pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return page
+    monkeypatch.setattr(urllib3.PoolManager, "request", request)
+    Server.requested = []
+    return Server
+
+URL = "https://www.thegradcafe.com/survey/?page=1"
+
+@pytest.mark.fetch
+def test_rate_increases_additively_up_to_max_rate(clock):
+    """Test that each success adds RATE_INCREASE to the rate, without passing max_rate."""
+    bucket = TokenBucket(max_rate=3)
+    for _ in range(3):
+        bucket.succeeded()
+    assert bucket.rate == fetch.INITIAL_RATE + 3 * fetch.RATE_INCREASE
+    for _ in range(10):
+        bucket.succeeded()
+    assert bucket.rate == 3
+
+@pytest.mark.fetch
+def test_throttle_halves_the_rate_down_to_min_rate(clock):
+    """Test that a throttle multiplies the rate by RATE_DECREASE, never below MIN_RATE."""
+    bucket = TokenBucket()
+    bucket.throttled()
+    assert bucket.rate == fetch.INITIAL_RATE * 0.5
+    for _ in range(20):
+        bucket.throttled()
+    assert bucket.rate == fetch.MIN_RATE
+
+@pytest.mark.fetch
+def test_acquire_paces_requests_at_the_rate(clock):
+    """Test that requests beyond the burst wait 1 / rate seconds each."""
+    bucket = TokenBucket(max_rate=2)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+@pytest.mark.fetch
+def test_retry_after_pauses_every_request(clock):
+    """Test that a throttle with Retry-After holds the next request back that long."""
+    bucket = TokenBucket(max_rate=2)
+    bucket.acquire()
+    bucket.throttled(retry_after=10)
+    bucket.acquire()
+    assert clock.sleeps == [10]
+
+@pytest.mark.fetch
+def test_failing_requests_are_retried_max_attempts_times(clock, backoffs, server):
+    """Test that a failing page is requested MAX_ATTEMPTS times, with full-jitter backoff between."""
+    server.pages = [FakeResponse(500) for _ in range(fetch.MAX_ATTEMPTS)]
+    response = Fetcher().get(URL)
+    assert response.status == 500
+    assert len(server.requested) == fetch.MAX_ATTEMPTS
+    expected = [min(fetch.BACKOFF_MAX, fetch.BACKOFF_BASE * 2 ** attempt)
+                for attempt in range(1, fetch.MAX_ATTEMPTS)]
+    assert backoffs == expected
+    assert all(sleep in clock.sleeps for sleep in expected)
+
+@pytest.mark.fetch
+def test_connection_errors_raise_after_max_attempts(clock, backoffs, server):
+    """Test that a page that can't be reached raises once every attempt has failed."""
+    server.pages = [urllib3.exceptions.NewConnectionError(None, "refused")
+                    for _ in range(3)]
+    with pytest.raises(urllib3.exceptions.NewConnectionError):
+        Fetcher(max_attempts=3).get(URL)
+    assert len(server.requested) == 3
+    assert len(backoffs) == 2
+
+@pytest.mark.fetch
+def test_transient_failure_then_success(clock, backoffs, server):
+    """Test that a request that fails once is retried and its success returned."""
+    server.pages = [FakeResponse(502), FakeResponse(200, b"ok")]
+    assert Fetcher().get(URL).data == b"ok"
+    assert len(backoffs) == 1
+
+@pytest.mark.fetch
+def test_throttle_with_retry_after_slows_the_host(clock, backoffs, server):
+    """Test that a 429 with Retry-After halves the host's rate and waits instead of backing off."""
+    server.pages = [FakeResponse(429, headers={"Retry-After": "7"}), FakeResponse(200)]
+    fetcher = Fetcher()
+    assert fetcher.get(URL).status == 200
+    assert not backoffs
+    assert 7 in clock.sleeps
+    assert fetcher._buckets["www.thegradcafe.com"].rate == (
+        fetch.INITIAL_RATE * fetch.RATE_DECREASE + fetch.RATE_INCREASE)
+
+@pytest.mark.fetch
+def test_crawl_delay_caps_the_rate(clock, server):
+    """Test that a robots.txt Crawl-delay caps the host's rate at one request per delay."""
+    server.robots = FakeResponse(200, b"User-agent: *\nCrawl-delay: 4\n")
+    server.pages = [FakeResponse(200) for _ in range(3)]
+    fetcher = Fetcher()
+    for _ in range(3):
+        fetcher.get(URL)
+    assert fetcher._buckets["www.thegradcafe.com"].rate == 0.25
+    assert clock.sleeps == [4, 4]
+
+@pytest.mark.fetch
+@pytest.mark.parametrize("status", [401, 403])
+def test_forbidden_robots_txt_disallows_the_host(clock, server, status):
+    """Test that a robots.txt answered with 401 or 403 keeps the scraper off the host."""
+    server.robots = FakeResponse(status)
+    with pytest.raises(RobotsDisallowed):
+        Fetcher().get(URL)
+    assert not server.requested
+
+@pytest.mark.fetch
+def test_missing_robots_txt_allows_the_host(clock, server):
+    """Test that a missing robots.txt (404) allows every URL."""
+    server.robots = FakeResponse(404)
+    server.pages = [FakeResponse(200)]
+    assert Fetcher().get(URL).status == 200
+
+@pytest.mark.fetch
+def test_disallowed_url_is_never_requested(clock, server):
+    """Test that a URL disallowed by robots.txt raises without being requested."""
+    server.robots = FakeResponse(200, b"User-agent: *\nDisallow: /survey/\n")
+    with pytest.raises(RobotsDisallowed):
+        Fetcher().get(URL)
+    assert not server.requested
@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import urllib3
+from web_scraper import pipeline
+from web_scraper.pipeline import scrape_pipeline, threaded
+
+# Long enough for a hung stage to be a failure rather than a stuck test run
+TIMEOUT = 5
+
+def within_timeout(function, *args):
+    """Calls `function` on another thread, failing if it doesn't return within TIMEOUT."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        return executor.submit(function, *args).result(timeout=TIMEOUT)
+    finally:
+        # Don't wait for a hung call: the timeout has already failed the test
+        executor.shutdown(wait=False)
+
+@pytest.mark.pipeline
+def test_threaded_yields_every_item_in_order():
+    """Test that a threaded stage hands over all its items, in order."""
+    assert within_timeout(list, threaded(range(100), maxsize=4)) == list(range(100))
+
+@pytest.mark.pipeline
+def test_full_queue_blocks_the_producer():
+    """Test that a producer stops maxsize items ahead of a consumer that isn't reading."""
+    produced = []
+    def items():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    stage = threaded(items(), maxsize=3)
+    assert next(stage) == 0
+    # The queue holds 3 items and the producer holds the one it is waiting to put
+    deadline = time.monotonic() + TIMEOUT
+    while len(produced) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.2)
+    assert len(produced) == 5
+    stage.close()
+
+@pytest.mark.pipeline
+def test_closing_the_consumer_stops_the_producer():
+    """Test that closing a threaded stage early ends its thread and closes its source."""
+    closed = threading.Event()
+    def items():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    stage = threaded(items(), maxsize=2, name="endless")
+    assert next(stage) == 0
+    stage.close()
+    assert closed.is_set()
+    assert not any(thread.name == "endless" for thread in threading.enumerate())
+
+@pytest.mark.pipeline
+def test_producer_exception_reaches_the_consumer():
+    """Test that an exception in a producer is raised to the consumer after the items before it."""
+    received = []
+    def items():
+        yield from range(3)
+        raise ValueError("stage failed")
+    def consume():
+        for item in threaded(items(), maxsize=1):
+            received.append(item)
+
+    with pytest.raises(ValueError, match="stage failed"):
+        within_timeout(consume)
+    assert received == [0, 1, 2]
+
+@pytest.mark.pipeline
+def test_fetch_error_reaches_the_scrape_pipeline_consumer(monkeypatch):
+    """Test that a fetch failure two stages upstream is raised by scrape_pipeline."""
+    def failing_pages(*_args):
+        raise urllib3.exceptions.HTTPError("GET page 1 failed")
+        yield
+    monkeypatch.setattr(pipeline, "_iter_pages", failing_pages)
+
+    with pytest.raises(urllib3.exceptions.HTTPError, match="page 1 failed"):
+        within_timeout(list, scrape_pipeline(pages=3, queue_size=1))
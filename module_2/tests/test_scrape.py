@@ -0,0 +1,154 @@
+import random
+import time
+import pytest
+import urllib3
+from web_scraper import cache as page_cache, scrape
+from web_scraper.cache import PageCache
+from web_scraper.scrape import BASE_URL, _fetch_page
+
+class Ticker:
+    """Stands in for the cache module's `time`; every reading is one second later."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        self.now += 1
+        return self.now
+
+class FakeResponse:
+    def __init__(self, status:int=200, data:bytes=b"", headers:dict|None=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+class StubFetcher:
+    """Answers `get` from a page number -> response mapping, recording each request."""
+
+    def __init__(self, responses:dict[int, FakeResponse]):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url:str, headers:dict|None=None) -> FakeResponse:
+        page = int(url.rsplit("=", 1)[1])
+        self.requests.append((page, headers))
+        return self.responses[page]
+
+def results_page(page:int, version:int=1) -> bytes:
+    return f"<table><tbody><tr><td>page {page} v{version}</td></tr></tbody></table>".encode()
+
+def ok(page:int, version:int=1) -> FakeResponse:
+    return FakeResponse(200, results_page(page, version), {"ETag": f'"{page}-{version}"'})
+
+@pytest.fixture(autouse=True)
+def ticker(monkeypatch):
+    """A clock that always moves forward, so `is_current` never depends on timer resolution."""
+    fake = Ticker()
+    monkeypatch.setattr(page_cache, "time", fake)
+    return fake
+
+def fetched_pages(fetcher:StubFetcher) -> list[int]:
+    return [page for page, _ in fetcher.requests]
+
+@pytest.mark.scrape
+def test_error_page_is_rejected_and_not_cached(tmp_path):
+    """Test that a 200 without RESULTS_TABLE_MARKER raises and leaves nothing in the cache."""
+    cache = PageCache(tmp_path)
+    fetcher = StubFetcher({1: FakeResponse(200, b"<html>Service unavailable</html>")})
+    with pytest.raises(urllib3.exceptions.HTTPError):
+        _fetch_page(fetcher, 1, cache)
+    assert cache.lookup(BASE_URL.format(1)) is None
+
+@pytest.mark.scrape
+def test_interrupted_run_resumes_and_refetches_only_the_failed_page(tmp_path):
+    """Test that rerunning an interrupted scrape requests only the page that failed."""
+    first = StubFetcher({1: ok(1), 2: ok(2), 3: FakeResponse(503)})
+    cache = PageCache(tmp_path)
+    assert not cache.resumed
+    assert _fetch_page(first, 1, cache) == results_page(1)
+    assert _fetch_page(first, 2, cache) == results_page(2)
+    with pytest.raises(urllib3.exceptions.HTTPError):
+        _fetch_page(first, 3, cache)
+
+    second = StubFetcher({1: ok(1), 2: ok(2), 3: ok(3)})
+    resumed = PageCache(tmp_path)
+    assert resumed.resumed
+    assert resumed.run_started == cache.run_started
+    assert [_fetch_page(second, page, resumed) for page in (1, 2, 3)] == [
+        results_page(1), results_page(2), results_page(3)]
+    assert fetched_pages(second) == [3]
+    assert second.requests[0][1] is None
+
+@pytest.mark.scrape
+def test_finish_run_removes_the_checkpoint(tmp_path):
+    """Test that finish_run ends the run, so the next PageCache starts a new one."""
+    cache = PageCache(tmp_path)
+    assert (tmp_path / "checkpoint.json").exists()
+    _fetch_page(StubFetcher({1: ok(1)}), 1, cache)
+    cache.finish_run()
+    assert not (tmp_path / "checkpoint.json").exists()
+
+    fresh = PageCache(tmp_path)
+    assert not fresh.resumed
+    assert fresh.run_started > cache.run_started
+    assert not fresh.is_current(fresh.lookup(BASE_URL.format(1)))
+
+@pytest.mark.scrape
+def test_finish_run_deletes_unreferenced_bodies(tmp_path):
+    """Test that finish_run keeps the bodies URLs refer to and deletes replaced ones."""
+    cache = PageCache(tmp_path)
+    url = BASE_URL.format(1)
+    cache.store(url, results_page(1, version=1))
+    old = cache._object_path(cache.lookup(url).sha256)
+    cache.store(url, results_page(1, version=2))
+    cache.finish_run()
+    assert not old.exists()
+    assert cache.read(cache.lookup(url)) == results_page(1, version=2)
+
+@pytest.mark.scrape
+def test_page_from_an_earlier_run_is_revalidated(tmp_path):
+    """Test that a page cached by a finished run is fetched conditionally and a 304 reuses it."""
+    cache = PageCache(tmp_path)
+    _fetch_page(StubFetcher({1: ok(1)}), 1, cache)
+    cache.finish_run()
+
+    cache = PageCache(tmp_path)
+    fetcher = StubFetcher({1: FakeResponse(304)})
+    assert _fetch_page(fetcher, 1, cache) == results_page(1)
+    assert fetcher.requests == [(1, {"If-None-Match": '"1-1"'})]
+    # The 304 makes the entry current, so the page is not requested again in this run
+    assert cache.is_current(cache.lookup(BASE_URL.format(1)))
+    assert _fetch_page(fetcher, 1, cache) == results_page(1)
+    assert len(fetcher.requests) == 1
+
+@pytest.mark.scrape
+def test_changed_page_replaces_the_cached_one(tmp_path):
+    """Test that a 200 to a conditional GET stores the new body and validators."""
+    cache = PageCache(tmp_path)
+    _fetch_page(StubFetcher({1: ok(1)}), 1, cache)
+    cache.finish_run()
+
+    cache = PageCache(tmp_path)
+    assert _fetch_page(StubFetcher({1: ok(1, version=2)}), 1, cache) == results_page(1, version=2)
+    assert cache.lookup(BASE_URL.format(1)).etag == '"1-2"'
+
+@pytest.mark.scrape
+@pytest.mark.parametrize("workers", [2, 4])
+def test_iter_pages_keeps_page_order_and_bounds_in_flight(monkeypatch, workers):
+    """Test that pages finishing out of order are yielded in page order, at most 2 * workers ahead."""
+    rng = random.Random(workers)
+    delays = {page: rng.uniform(0, 0.02) for page in range(1, 41)}
+    consumed = 0
+    ahead = []
+    def fetch_page(_fetcher, page:int, _cache=None) -> bytes:
+        ahead.append(page - consumed)
+        time.sleep(delays[page])
+        return results_page(page)
+    monkeypatch.setattr(scrape, "_fetch_page", fetch_page)
+
+    pages = []
+    for html in scrape._iter_pages(40, workers=workers):
+        pages.append(html)
+        consumed += 1
+    assert pages == [results_page(page) for page in range(1, 41)]
+    assert max(ahead) <= 2 * workers
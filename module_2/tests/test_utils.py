@@ -0,0 +1,52 @@
+import pytest
+from web_scraper.utils import _classify_badge, _iso_decision_date, _parse_status
+
+@pytest.mark.parse
+@pytest.mark.parametrize("badge, field, value", [
+    ("Fall 2025", "term", "Fall 2025"),
+    ("Spring2024", "term", "Spring2024"),
+    ("American", "nationality", "American"),
+    ("International", "nationality", "International"),
+    ("GRE 320", "gre", "320"),
+    ("GRE V 160", "gre_v", "160"),
+    ("GRE AW 4.5", "gre_aw", "4.5"),
+    ("GPA 3.80", "gpa", "3.80"),
+])
+def test_badge_fills_its_field(badge, field, value):
+    """Test that each kind of badge fills the one entry field it holds."""
+    entry = {}
+    _classify_badge(entry, badge)
+    assert entry == {field: value}
+
+@pytest.mark.parse
+@pytest.mark.parametrize("badge", ["Americans", "GRE", "Total comments 3", ""])
+def test_unknown_badge_is_ignored(badge):
+    """Test that a badge holding no known field leaves the entry unchanged."""
+    entry = {}
+    _classify_badge(entry, badge)
+    assert not entry
+
+@pytest.mark.parse
+@pytest.mark.parametrize("status, expected", [
+    ("Accepted on 15 Mar", ("Accepted", "15 Mar")),
+    ("Wait listed on 2 Feb", ("Wait listed", "2 Feb")),
+    ("Interview", ("Interview", None)),
+    ("Other on 1 Jan", ("Other on 1 Jan", None)),
+])
+def test_parse_status(status, expected):
+    """Test that a status is split into its decision and decision date text."""
+    assert _parse_status(status) == expected
+
+@pytest.mark.parse
+@pytest.mark.parametrize("text, date_added, term, expected", [
+    ("15 Mar", "2025-01-17", None, "2024-03-15"),
+    ("15 Jan", "2025-01-17", None, "2025-01-15"),
+    ("29 Feb", "2025-03-01", None, "2024-02-29"),
+    ("9 Jan", None, "Spring 2024", "2024-01-09"),
+    ("15 Mar 2023", None, None, "2023-03-15"),
+    ("15 Mar", None, None, None),
+    ("soon", "2025-01-17", None, None),
+])
+def test_iso_decision_date(text, date_added, term, expected):
+    """Test that the decision date's year is inferred from the date added, then the term."""
+    assert _iso_decision_date(text, date_added, term) == expected
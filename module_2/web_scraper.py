@@ -1,26 +1,54 @@
+import argparse
 from pathlib import Path
 
-from web_scraper.scrape import scrape_data
-from web_scraper.clean import clean_data
+from web_scraper.scrape import scrape_data, load_known_ids
 
-def main(raw_data_path:Path, clean_data_path:Path) -> None:
+def main(clean_data_path:Path, raw_data_path:Path|None=None, incremental:bool=False,
+         cache_dir:Path|None=None, workers:int=1, max_rate:float|None=None) -> None:
     """Runs the full GradCafe scraping and cleaning pipeline.
 
-    This function scrapes raw applicant data from GradCafe and saves it to the specified path,
-    then processes and cleans the raw data into a structured format and saves the cleaned data.
+    This function scrapes applicant data from GradCafe, extracting the structured fields
+    from each page as it is scraped, and saves the cleaned data to the specified path.
+    The raw row HTML is only saved when `raw_data_path` is given, as a debugging artifact
+    that can be re-cleaned later with `clean_data`.
+
+    In incremental mode, only applicants newer than those already in `clean_data_path` are
+    scraped, and they are merged into the existing cleaned data.
+
+    With a `cache_dir`, fetched pages are cached on disk, so a scrape that fails part way
+    resumes when rerun instead of starting over.
 
     Args:
-        raw_data_path: Path where the raw scraped applicant data will be saved (JSON).
-        clean_data_path: Path where the cleaned/structured applicant data will be saved (JSON).
+        clean_data_path: Path where the cleaned/structured applicant data will be saved (`.jsonl` or `.json`).
+        raw_data_path: Optional path where the raw scraped applicant data will be saved (`.jsonl` or `.json`).
+        incremental: Whether to stop at already scraped results (default False).
+        cache_dir: Optional directory for the on-disk page cache (default None, no cache).
+        workers: Number of pages fetched concurrently (default 1).
+        max_rate: Maximum requests per second to GradCafe (default None, the rate adapts to the server).
 
     Returns:
         None
     """
-    scrape_data(raw_data_path)
-    clean_data(clean_data_path, raw_data_path)
+    known_ids = load_known_ids(clean_data_path) if incremental else None
+    scrape_data(clean_data_path, known_ids=known_ids, merge=incremental,
+                raw_savepath=raw_data_path, cache_dir=cache_dir, workers=workers,
+                max_rate=max_rate)
     return None
 
+def parse_args() -> argparse.Namespace:
+    """Parses the command-line options of the scraper."""
+    parser = argparse.ArgumentParser(description="Scrape and clean GradCafe applicant results.")
+    parser.add_argument("--workers", type=int, default=1, help="Pages fetched concurrently (default 1)")
+    parser.add_argument("--max_rate", type=float,
+                        help="Maximum requests per second to GradCafe (default: adaptive)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only scrape results newer than those already saved, and merge them in")
+    parser.add_argument("--cache_dir", type=Path, default=Path(__file__).parent / "data" / "page_cache",
+                        help="Directory of the on-disk page cache (default data/page_cache)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    raw_data_path = Path(__file__).parent / "data" / "raw_data.json"
-    clean_data_path = Path(__file__).parent / "data" / "applicant_data.json"
-    main(raw_data_path, clean_data_path)
+    args = parse_args()
+    clean_data_path = Path(__file__).parent / "data" / "applicant_data.jsonl"
+    main(clean_data_path, incremental=args.incremental, cache_dir=args.cache_dir,
+         workers=args.workers, max_rate=args.max_rate)
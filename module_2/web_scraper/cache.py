@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+class CachedPage(NamedTuple):
+    """What the cache knows about a URL: its body's hash, HTTP validators and fetch time."""
+    sha256: str
+    etag: str|None
+    last_modified: str|None
+    fetched: float
+
+def _write_atomic(path:Path, data:bytes) -> None:
+    """Writes `data` to `path` through a temporary file, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class PageCache:
+    """On-disk cache of fetched pages that lets an interrupted scrape resume.
+
+    Bodies are stored gzipped under `objects/`, named by the SHA-256 of their content, so
+    a page that has not changed is stored once. Each URL has a small record under `urls/`
+    with its body's hash, its `ETag`/`Last-Modified` validators and when it was fetched.
+    Every file is written atomically, so a crash never leaves a corrupt entry and
+    concurrent fetch threads can share one cache.
+
+    A scrape is checkpointed by `checkpoint.json`, which holds when the run started and
+    is removed by `finish_run()` once the run has been saved. If a run is interrupted, the
+    next one resumes it: pages fetched since the run started are served from the cache
+    without a request, and only older pages are fetched again (conditionally, see
+    `validators`).
+    """
+
+    def __init__(self, directory:Path):
+        self.directory = Path(directory)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        (self.directory / "urls").mkdir(exist_ok=True)
+        self._checkpoint = self.directory / "checkpoint.json"
+        self.resumed = self._checkpoint.exists()
+        if self.resumed:
+            with open(self._checkpoint, "r", encoding="utf-8") as f:
+                self.run_started = json.load(f)["started"]
+        else:
+            self.run_started = time.time()
+            _write_atomic(self._checkpoint, json.dumps({"started": self.run_started}).encode())
+
+    def _record_path(self, url:str) -> Path:
+        return self.directory / "urls" / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _object_path(self, sha256:str) -> Path:
+        return self.directory / "objects" / sha256[:2] / sha256
+
+    def lookup(self, url:str) -> CachedPage|None:
+        """Returns the cache entry for `url`, or None if it was never cached."""
+        try:
+            with open(self._record_path(url), "r", encoding="utf-8") as f:
+                entry = CachedPage(**json.load(f))
+        except FileNotFoundError:
+            return None
+        return entry if self._object_path(entry.sha256).exists() else None
+
+    def is_current(self, entry:CachedPage) -> bool:
+        """Whether an entry was fetched during the current (possibly resumed) run."""
+        return entry.fetched >= self.run_started
+
+    def read(self, entry:CachedPage) -> bytes:
+        """Returns the cached body of an entry."""
+        return gzip.decompress(self._object_path(entry.sha256).read_bytes())
+
+    @staticmethod
+    def validators(entry:CachedPage) -> dict[str, str]:
+        """Conditional GET headers that ask the server to answer 304 if the page is unchanged."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, url:str, body:bytes, etag:str|None=None, last_modified:str|None=None) -> None:
+        """Caches a freshly fetched body for `url`, with the validators the server sent."""
+        sha256 = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(sha256)
+        if not object_path.exists():
+            object_path.parent.mkdir(exist_ok=True)
+            _write_atomic(object_path, gzip.compress(body))
+        self._write_record(url, CachedPage(sha256, etag, last_modified, time.time()))
+
+    def revalidated(self, url:str, entry:CachedPage) -> None:
+        """Records that the server confirmed (with a 304) that a cached page is unchanged."""
+        self._write_record(url, entry._replace(fetched=time.time()))
+
+    def _write_record(self, url:str, entry:CachedPage) -> None:
+        _write_atomic(self._record_path(url), json.dumps(entry._asdict()).encode())
+
+    def finish_run(self) -> None:
+        """Ends the checkpointed run and deletes bodies that no URL refers to any more."""
+        referenced = set()
+        for record in (self.directory / "urls").glob("*.json"):
+            with open(record, "r", encoding="utf-8") as f:
+                referenced.add(json.load(f)["sha256"])
+        for object_path in (self.directory / "objects").glob("*/*"):
+            if object_path.name not in referenced:
+                object_path.unlink(missing_ok=True)
+        self._checkpoint.unlink(missing_ok=True)
@@ -1,29 +1,88 @@
-import json
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
+from .storage import iter_records, write_records
+from .universities import canonicalize_universities
 from .utils import _extract_applicant_fields
 
-def load_data(filepath:Path) -> list[list[str]]:
-    """Loads raw applicant data from a JSON file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
-    return raw_data
-
-def save_data(cleaned_data:list[dict], savepath:Path) -> None:
-    """Saves cleaned applicant data (list of dicts) to a JSON file."""
-    with open(savepath, "w", encoding="utf-8") as f:
-        json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
-        
-def clean_data(savepath:Path, datapath:Path) -> None:
-    """Cleans raw applicant data and saves the structured results."""
-    raw_data = load_data(datapath)
-
-    cleaned_data = []
-    for applicant_data in raw_data:
-        extracted_data = _extract_applicant_fields(applicant_data)
-        cleaned_data.append(extracted_data) 
-    save_data(cleaned_data, savepath)
+# Below this many applicants per worker, process start-up costs more than it saves
+MIN_CHUNK_SIZE = 500
+
+def load_data(filepath:Path) -> Iterator:
+    """Lazily loads applicant data from a JSON Lines (`.jsonl`) or JSON array file."""
+    return iter_records(filepath)
+
+def save_data(cleaned_data:Iterable[dict], savepath:Path) -> int:
+    """Saves cleaned applicant data (an iterable of dicts) to a JSON Lines or JSON file.
+
+    Returns the number of applicants saved.
+    """
+    return write_records(savepath, cleaned_data)
+
+def _merge_with_saved(cleaned_data:Iterable[dict], savepath:Path) -> Iterator[dict]:
+    """Yields new applicants, then those already saved at `savepath` that were not replaced by URL."""
+    new_urls = set()
+    for applicant in cleaned_data:
+        new_urls.add(applicant["url"])
+        yield applicant
+    if savepath.exists():
+        yield from (a for a in load_data(savepath) if a.get("url") not in new_urls)
+
+def _clean_chunk(raw_chunk:list[list[str]], parser:str|None=None) -> list[dict]:
+    """Extracts the fields of every applicant in a chunk of raw data."""
+    return [_extract_applicant_fields(applicant_data, parser) for applicant_data in raw_chunk]
+
+def _chunked(items:Iterator, size:int) -> Iterator[list]:
+    """Splits an iterator into lists of `size` items (the last one may be shorter)."""
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+def _clean_parallel(raw_data:Iterable[list[str]], workers:int, parser:str|None=None) -> Iterator[dict]:
+    """Cleans raw data in chunks on a pool of `workers` processes, keeping the input order.
+
+    At most two chunks per worker are held in memory at a time. Falls back to cleaning
+    serially when there is too little data to split across processes.
+    """
+    raw_data = iter(raw_data)
+    head = list(islice(raw_data, workers * MIN_CHUNK_SIZE))
+    if workers <= 1 or len(head) < workers * MIN_CHUNK_SIZE:
+        yield from _clean_chunk(head, parser)
+        yield from (_extract_applicant_fields(applicant_data, parser) for applicant_data in raw_data)
+        return
+
+    clean_chunk = partial(_clean_chunk, parser=parser)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in _chunked(chain(head, raw_data), MIN_CHUNK_SIZE):
+            in_flight.append(executor.submit(clean_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def clean_data(savepath:Path, datapath:Path, merge:bool=False, parser:str|None=None,
+               workers:int=1) -> None:
+    """Cleans raw applicant data and saves the structured results.
+
+    The scraper already extracts fields while scraping; this re-cleans a raw HTML
+    artifact saved with `scrape_data(..., raw_savepath=...)`. Applicants are streamed
+    from `datapath` to `savepath`, so memory use does not grow with the input when
+    both are JSON Lines files. With `merge`, newly cleaned applicants are placed ahead
+    of those already saved at `savepath` (newest-first, as on GradCafe) instead of
+    replacing them. `parser` names the parser backend (default: fastest installed, see
+    `parsers.PARSERS`). With `workers` > 1, the raw data is split into chunks that are
+    cleaned on a process pool. Every saved applicant gets a `canonical_university`
+    (see `universities.UniversityResolver`).
+    """
+    cleaned_data = _clean_parallel(load_data(datapath), workers, parser)
+    if merge:
+        cleaned_data = _merge_with_saved(cleaned_data, savepath)
+    save_data(canonicalize_universities(cleaned_data), savepath)
 
 if __name__ == "__main__":
-    savepath = Path(__file__).parents[1] / "data" / "applicant_data.json"
-    datapath = Path(__file__).parents[1] / "data" / "raw_data.json"
-    clean_data(savepath, datapath)
\ No newline at end of file
+    savepath = Path(__file__).parents[1] / "data" / "applicant_data.jsonl"
+    datapath = Path(__file__).parents[1] / "data" / "raw_data.jsonl"
+    clean_data(savepath, datapath)
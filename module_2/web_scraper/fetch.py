@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+import urllib3
+from email.utils import parsedate_to_datetime
+from urllib.robotparser import RobotFileParser
+
+USER_AGENT = "jhu-software-concepts-gradcafe-scraper"
+
+# Connect/read timeouts, so a stalled server cannot hold up the scrape
+DEFAULT_TIMEOUT = urllib3.Timeout(connect=5, read=30)
+
+# Attempts per request, and the exponential backoff base and cap between them (seconds)
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 60
+
+# Statuses that mean the server is overloaded or throttling us; the rate is cut and retried
+THROTTLE_STATUSES = {429, 503}
+# Other statuses worth retrying after a backoff
+RETRY_STATUSES = {500, 502, 504}
+
+# robots.txt statuses that mean the host forbids crawling altogether, as in RobotFileParser;
+# any other error status means there are no rules
+ROBOTS_FORBIDDEN_STATUSES = {401, 403}
+
+# Requests per second to start from when no maximum rate is given
+INITIAL_RATE = 2.0
+# Requests per second added after each success, and the factor applied after a throttle
+RATE_INCREASE = 0.25
+RATE_DECREASE = 0.5
+MIN_RATE = 0.05
+
+class RobotsDisallowed(urllib3.exceptions.HTTPError):
+    """Raised instead of requesting a URL that robots.txt disallows."""
+
+class TokenBucket:
+    """Adaptive token bucket pacing the requests sent to one host.
+
+    Tokens refill at `rate` per second, up to `burst`; each request takes one, waiting
+    for it if none is left. The rate adapts like TCP congestion control: it grows by
+    `RATE_INCREASE` after each successful request (up to `max_rate`, if any) and is
+    multiplied by `RATE_DECREASE` when the server throttles, which also pauses every
+    request for as long as the server's `Retry-After` asks.
+    """
+
+    def __init__(self, max_rate:float|None=None, burst:float=1):
+        self.max_rate = max_rate
+        self.rate = min(INITIAL_RATE, max_rate) if max_rate else INITIAL_RATE
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def cap(self, max_rate:float) -> None:
+        """Lowers the maximum rate (e.g. to a robots.txt crawl delay)."""
+        with self._lock:
+            self.max_rate = min(self.max_rate or max_rate, max_rate)
+            self.rate = min(self.rate, self.max_rate)
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(self._paused_until - now, -self._tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+
+    def succeeded(self) -> None:
+        """Additively raises the rate after a request that was not throttled."""
+        with self._lock:
+            self.rate += RATE_INCREASE
+            if self.max_rate:
+                self.rate = min(self.rate, self.max_rate)
+
+    def throttled(self, retry_after:float|None=None) -> None:
+        """Cuts the rate, and pauses all requests for `retry_after` seconds if given."""
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate * RATE_DECREASE)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                self._tokens = min(self._tokens, 0)
+
+def _retry_after(response:urllib3.BaseHTTPResponse) -> float|None:
+    """Seconds to wait from a `Retry-After` header (delta seconds or an HTTP date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _backoff(attempt:int) -> float:
+    """Exponential backoff with full jitter: a random delay up to base * 2^attempt (capped)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+class Fetcher:
+    """HTTP GETs with timeouts, retries, adaptive per-host rate limiting and robots.txt.
+
+    Each host's robots.txt is read before its first request: disallowed URLs raise
+    `RobotsDisallowed`, and a `Crawl-delay` or `Request-rate` caps the host's rate. As with
+    `RobotFileParser.read`, a robots.txt answered with 401 or 403 disallows the whole host,
+    and one that is missing (any other error) allows it all. Requests
+    are paced by a `TokenBucket` per host. Connection errors, timeouts and 5xx responses
+    are retried with exponential backoff and jitter; 429 and 503 responses also slow the
+    host's bucket down and honor `Retry-After`. Safe to share between threads.
+    """
+
+    def __init__(self, workers:int=1, max_rate:float|None=None,
+                 timeout:urllib3.Timeout=DEFAULT_TIMEOUT, max_attempts:int=MAX_ATTEMPTS,
+                 user_agent:str=USER_AGENT):
+        self.http = urllib3.PoolManager(maxsize=max(workers, 1), block=True, timeout=timeout,
+                                        retries=False)
+        self.headers = {"User-Agent": user_agent}
+        self.max_rate = max_rate
+        self.max_attempts = max_attempts
+        self.user_agent = user_agent
+        self._buckets = {}
+        self._robots = {}
+        self._lock = threading.Lock()
+
+    def _host_policy(self, url:urllib3.util.Url) -> tuple[TokenBucket, RobotFileParser]:
+        """Returns the host's token bucket and robots.txt rules, reading robots.txt once."""
+        with self._lock:
+            if url.host in self._buckets:
+                return self._buckets[url.host], self._robots[url.host]
+            bucket = TokenBucket(self.max_rate)
+            robots = RobotFileParser()
+            # Held while robots.txt is read, so it is read once however many threads start
+            status = None
+            try:
+                response = self.http.request("GET", f"{url.scheme}://{url.netloc}/robots.txt",
+                                             headers=self.headers)
+                status = response.status
+                lines = response.data.decode("utf-8", "replace").splitlines()
+                if status >= 400:
+                    lines = []
+            except urllib3.exceptions.HTTPError:
+                lines = []
+            robots.parse(lines)
+            if status in ROBOTS_FORBIDDEN_STATUSES:
+                robots.disallow_all = True
+            crawl_delay = robots.crawl_delay(self.user_agent)
+            request_rate = robots.request_rate(self.user_agent)
+            if crawl_delay:
+                bucket.cap(1 / float(crawl_delay))
+            if request_rate:
+                bucket.cap(request_rate.requests / request_rate.seconds)
+            self._buckets[url.host], self._robots[url.host] = bucket, robots
+            return bucket, robots
+
+    def get(self, url:str, headers:dict[str, str]|None=None) -> urllib3.BaseHTTPResponse:
+        """GETs `url`, retrying transient failures; returns the first non-retryable response.
+
+        A response that is still throttled or failing after the last attempt is returned.
+        `headers` are sent along with the User-Agent.
+
+        Raises:
+            RobotsDisallowed: If robots.txt disallows `url`.
+            urllib3.exceptions.HTTPError: If every attempt failed to connect or timed out.
+        """
+        bucket, robots = self._host_policy(urllib3.util.parse_url(url))
+        if not robots.can_fetch(self.user_agent, url):
+            raise RobotsDisallowed(f"robots.txt disallows {url}")
+        headers = {**self.headers, **(headers or {})}
+        attempt = 0
+        while True:
+            attempt += 1
+            bucket.acquire()
+            try:
+                response = self.http.request("GET", url, headers=headers)
+            except urllib3.exceptions.HTTPError:
+                if attempt == self.max_attempts:
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+            if response.status not in THROTTLE_STATUSES | RETRY_STATUSES:
+                bucket.succeeded()
+                return response
+            retry_after = None
+            if response.status in THROTTLE_STATUSES:
+                retry_after = _retry_after(response)
+                bucket.throttled(retry_after)
+            if attempt == self.max_attempts:
+                return response
+            # After a Retry-After, the bucket itself holds requests back long enough
+            if retry_after is None:
+                time.sleep(_backoff(attempt))
@@ -0,0 +1,181 @@
+import re
+from typing import NamedTuple
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import lxml.html
+except ImportError:  # lxml is an optional dependency
+    lxml = None
+
+AD_ID_PATTERN = re.compile(r"^results-ad-placement")
+UNIVERSITY_CLASS = "tw-font-medium tw-text-gray-900 tw-text-sm"
+BADGE_CLASS = "tw-inline-flex"
+
+class ApplicantText(NamedTuple):
+    """Text pulled out of an applicant's rows, before any field extraction."""
+    university: str|None
+    program_spans: list[str]
+    date_added: str
+    status: str|None
+    hrefs: list[str]
+    badges: list[str]
+    comments: str|None
+
+class SoupParser:
+    """Parser backend using BeautifulSoup with Python's built-in `html.parser`.
+
+    Always available. Rows are `bs4.Tag` objects.
+    """
+    name = "html.parser"
+
+    def table_rows(self, html:bytes) -> list[Tag]:
+        """Returns the top-level <tr> rows of a results page's applicant table."""
+        soup = BeautifulSoup(html, "html.parser")
+        applicant_datatable = soup.find("tbody")
+        return applicant_datatable.find_all("tr", recursive=False)
+
+    def parse_rows(self, applicant_rows:list[str]) -> list[Tag]:
+        """Parses an applicant's row HTML strings with a single BeautifulSoup call."""
+        soup = BeautifulSoup("".join(applicant_rows), "html.parser")
+        return soup.find_all("tr", recursive=False)
+
+    def to_html(self, row:Tag) -> str:
+        """Serializes a row back to an HTML string."""
+        return str(row)
+
+    def is_filler(self, row:Tag) -> bool:
+        """Whether a row is an ad placement or an empty placeholder row."""
+        if row.find("div", id=AD_ID_PATTERN):
+            return True
+        tds = row.find_all("td", recursive=False)
+        return len(tds) == 1 and not tds[0].get_text(strip=True)
+
+    def starts_applicant(self, row:Tag) -> bool:
+        """Whether a row starts a new applicant (a <tr> with no class attribute)."""
+        return not row.get("class")
+
+    def applicant_text(self, applicant_rows:list[Tag]) -> ApplicantText:
+        """Pulls the text of every field out of an applicant's rows."""
+        tds = applicant_rows[0].find_all("td", recursive=False)
+        university_div = tds[0].find("div", class_=UNIVERSITY_CLASS)
+        prog_div = tds[1].find("div")
+        status_div = tds[3].find("div")
+
+        badges = []
+        if len(applicant_rows) > 1:
+            badges = [
+                badge.get_text(" ", strip=True)
+                for badge in applicant_rows[1].find_all("div", class_=BADGE_CLASS)
+            ]
+        comments = None
+        if len(applicant_rows) > 2:
+            p = applicant_rows[2].find("p")
+            if p:
+                comments = p.get_text(strip=True)
+
+        return ApplicantText(
+            university=university_div.get_text(strip=True) if university_div else None,
+            program_spans=(
+                [span.get_text(strip=True) for span in prog_div.find_all("span")]
+                if prog_div else []
+            ),
+            date_added=tds[2].get_text(strip=True),
+            status=status_div.get_text(strip=True) if status_div else None,
+            hrefs=[a.get("href", "") for a in tds[4].find_all("a")],
+            badges=badges,
+            comments=comments,
+        )
+
+def _lxml_text(element, sep:str="") -> str:
+    """Equivalent of BeautifulSoup's `get_text(sep, strip=True)` for an lxml element."""
+    return sep.join(t.strip() for t in element.itertext() if t.strip())
+
+def _lxml_first(element, tag:str):
+    """Returns the first descendant of `element` with the given tag, or None."""
+    return next(element.iterdescendants(tag), None)
+
+class LxmlParser:
+    """Parser backend using lxml's C-based HTML parser and element tree.
+
+    Requires the optional `lxml` dependency. Rows are `lxml.html.HtmlElement` objects.
+    """
+    name = "lxml"
+
+    def table_rows(self, html:bytes) -> list:
+        """Returns the top-level <tr> rows of a results page's applicant table."""
+        applicant_datatable = lxml.html.fromstring(html).find(".//tbody")
+        return applicant_datatable.findall("tr")
+
+    def parse_rows(self, applicant_rows:list[str]) -> list:
+        """Parses an applicant's row HTML strings with a single lxml call."""
+        table = lxml.html.fromstring("<table><tbody>" + "".join(applicant_rows) + "</tbody></table>")
+        return table.find("tbody").findall("tr")
+
+    def to_html(self, row) -> str:
+        """Serializes a row back to an HTML string."""
+        return lxml.html.tostring(row, encoding="unicode", with_tail=False)
+
+    def is_filler(self, row) -> bool:
+        """Whether a row is an ad placement or an empty placeholder row."""
+        for div in row.iterdescendants("div"):
+            if AD_ID_PATTERN.match(div.get("id", "")):
+                return True
+        tds = row.findall("td")
+        return len(tds) == 1 and not _lxml_text(tds[0])
+
+    def starts_applicant(self, row) -> bool:
+        """Whether a row starts a new applicant (a <tr> with no class attribute)."""
+        return not row.get("class")
+
+    def applicant_text(self, applicant_rows:list) -> ApplicantText:
+        """Pulls the text of every field out of an applicant's rows."""
+        tds = applicant_rows[0].findall("td")
+        university_div = next(
+            (div for div in tds[0].iterdescendants("div") if div.get("class") == UNIVERSITY_CLASS),
+            None,
+        )
+        prog_div = _lxml_first(tds[1], "div")
+        status_div = _lxml_first(tds[3], "div")
+
+        badges = []
+        if len(applicant_rows) > 1:
+            badges = [
+                _lxml_text(div, " ") for div in applicant_rows[1].iterdescendants("div")
+                if BADGE_CLASS in div.get("class", "").split()
+            ]
+        comments = None
+        if len(applicant_rows) > 2:
+            p = _lxml_first(applicant_rows[2], "p")
+            if p is not None:
+                comments = _lxml_text(p)
+
+        return ApplicantText(
+            university=_lxml_text(university_div) if university_div is not None else None,
+            program_spans=(
+                [_lxml_text(span) for span in prog_div.iterdescendants("span")]
+                if prog_div is not None else []
+            ),
+            date_added=_lxml_text(tds[2]),
+            status=_lxml_text(status_div) if status_div is not None else None,
+            hrefs=[a.get("href", "") for a in tds[4].iterdescendants("a")],
+            badges=badges,
+            comments=comments,
+        )
+
+PARSERS = {SoupParser.name: SoupParser()}
+if lxml is not None:
+    PARSERS[LxmlParser.name] = LxmlParser()
+
+# The fastest installed backend is used unless one is requested by name
+DEFAULT_PARSER = "lxml" if "lxml" in PARSERS else "html.parser"
+
+def get_parser(name:str|None=None) -> SoupParser|LxmlParser:
+    """Returns the parser backend registered under `name` (default: fastest installed).
+
+    Raises:
+        ValueError: If no backend with that name is installed.
+    """
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Unknown or unavailable parser backend {name!r}; choose from {sorted(PARSERS)}")
+    return PARSERS[name]
@@ -0,0 +1,91 @@
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from .cache import PageCache
+from .scrape import _extract_pages, _iter_pages
+from .universities import canonicalize_universities
+
+# Items each stage may run ahead of the next one before it blocks
+QUEUE_SIZE = 64
+
+# Marks the end of a stage's output
+_DONE = object()
+
+def threaded(items:Iterable, maxsize:int=QUEUE_SIZE, name:str|None=None) -> Iterator:
+    """Iterates `items` on a background thread and yields what it produces.
+
+    The items are handed over through a queue of at most `maxsize` items. When it is full
+    the background thread blocks until the consumer catches up (backpressure), so a fast
+    stage never buffers unbounded output for a slow one. An exception raised while
+    iterating `items` is re-raised to the consumer. Closing the returned generator early
+    stops the thread after its current item.
+
+    The thread starts on the first `next()`.
+    """
+    handoff = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        """Queues an item, giving up (returning False) once the consumer has stopped."""
+        while not stopped.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    break
+            else:
+                put((_DONE, None))
+        except Exception as error:  # handed to the consumer
+            put((_DONE, error))
+        finally:
+            # Generators must be closed on the thread that runs them
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = handoff.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+def scrape_pipeline(pages:int=750, workers:int=1, max_rate:float|None=None,
+                    known_ids:set[str]|None=None, parser:str|None=None,
+                    cache:PageCache|None=None, queue_size:int=QUEUE_SIZE) -> Iterator[dict]:
+    """Yields cleaned applicants while later pages are still being fetched and parsed.
+
+    Fetching and parsing/cleaning run as concurrent stages, each on its own thread,
+    connected by bounded queues. While the consumer handles an applicant (e.g. loading it
+    into a database), the next pages are already being downloaded and parsed, so the
+    total time approaches that of the slowest stage instead of the sum of all of them.
+    Applicants come out in page order with a `canonical_university`, exactly as
+    `scrape_data` would save them.
+
+    The arguments are those of `scrape_data`. A `cache` is not finished here: call its
+    `finish_run()` once the applicants have been stored, so a failure before then can
+    still resume.
+    """
+    def cleaned() -> Iterator[dict]:
+        fetched = threaded(_iter_pages(pages, workers, max_rate, cache), queue_size, "fetch")
+        # Stops fetching as soon as extraction stops, e.g. at the first known page
+        with closing(fetched) as html_pages:
+            extracted = _extract_pages(html_pages, known_ids, parser=parser)
+            yield from canonicalize_universities(applicant for applicant, _ in extracted)
+
+    yield from threaded(cleaned(), queue_size, "clean")
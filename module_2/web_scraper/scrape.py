@@ -1,83 +1,238 @@
 import urllib3
-from bs4 import BeautifulSoup
-import json
-import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
+from .cache import PageCache
+from .clean import load_data, save_data, _merge_with_saved
+from .fetch import Fetcher
+from .parsers import get_parser
+from .storage import RecordWriter
+from .universities import canonicalize_universities
+from .utils import _extract_applicant_fields, _result_id
 
-def _save_scraped_data(raw_data:list[list[str]], savepath:Path) -> None:
-    """Saves scraped raw applicant HTML data to a JSON file.
+BASE_URL = "https://www.thegradcafe.com/survey/?page={}"
+
+# Every results page has the applicant table; error pages served with a 200 do not
+RESULTS_TABLE_MARKER = b"<tbody"
+
+def _fetch_page(fetcher:Fetcher, page:int, cache:PageCache|None=None) -> bytes:
+    """Downloads the HTML of a single results page.
+
+    With a `cache`, a page already fetched during the current run is read from disk
+    without a request, and a page cached by an earlier run is fetched conditionally, so
+    the server can answer 304 Not Modified instead of resending it. Only complete results
+    pages are cached; anything else raises, so a rerun fetches the page again.
+    """
+    url = BASE_URL.format(page)
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and cache.is_current(entry):
+        return cache.read(entry)
+    response = fetcher.get(url, headers=cache.validators(entry) if entry else None)
+    if response.status == 304 and entry is not None:
+        cache.revalidated(url, entry)
+        return cache.read(entry)
+    if response.status != 200 or RESULTS_TABLE_MARKER not in response.data:
+        raise urllib3.exceptions.HTTPError(
+            f"GET {url} returned HTTP {response.status} without a results table")
+    if cache is not None:
+        cache.store(url, response.data, response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"))
+    return response.data
+
+def _iter_pages(pages:int, workers:int=1, max_rate:float|None=None,
+                cache:PageCache|None=None) -> Iterator[bytes]:
+    """Yields the HTML of result pages 1..`pages`, in page order.
+
+    Pages are fetched by a `fetch.Fetcher`, which times out stalled requests, retries
+    failures with backoff and paces requests with a rate limiter that adapts to
+    throttling and robots.txt. With `workers` > 1, pages are fetched concurrently on a
+    thread pool sharing one connection pool and rate limiter. At most `2 * workers` pages
+    are in flight at a time, so pages are handed out in order without buffering the whole
+    scrape in memory.
 
     Args:
-        raw_data: List of applicants, scraped from `_scrape_data`.
-        savepath: Path to save the output JSON file.
+        pages: Number of result pages to fetch.
+        workers: Number of concurrent fetches (default 1, sequential).
+        max_rate: Maximum number of requests per second to the GradCafe host (default: no
+            maximum; the rate adapts to the server).
+        cache: Optional page cache to read from and fill (see `_fetch_page`).
     """
-    with open(savepath, "w", encoding="utf-8") as f:
-        json.dump(raw_data, f, ensure_ascii=False, indent=2)
+    fetcher = Fetcher(workers, max_rate)
+
+    if workers <= 1:
+        for curr_page in range(1, pages+1):
+            yield _fetch_page(fetcher, curr_page, cache)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        next_page = 1
+        try:
+            while in_flight or next_page <= pages:
+                while next_page <= pages and len(in_flight) < 2 * workers:
+                    in_flight.append(executor.submit(_fetch_page, fetcher, next_page, cache))
+                    next_page += 1
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
 
-def _scrape_data(pages:int=750) -> list[list[str]]:
-    """Scrapes applicant data from The GradCafe admissions results pages.
+def _parse_page(html:bytes, parser:str|None=None) -> list[list]:
+    """Groups the rows of a single results page into applicants.
 
     For each page, this function finds the applicant table and groups rows into applicants:
       - The start of a new applicant is indicated by a <tr> with no class attribute.
       - Additional detail rows for the same applicant (such as comments or badges) follow as <tr> tags with a class.
       - Ad placement rows and empty placeholder rows are identified and skipped.
 
-    Each applicant is stored as a list of HTML strings (one for each row belonging to that applicant).
+    Args:
+        html: Raw HTML of a results page.
+        parser: Name of the parser backend (default: fastest installed, see `parsers.PARSERS`).
+
+    Returns:
+        List of applicants on the page, each being a list of row elements from the page tree.
+    """
+    backend = get_parser(parser)
+
+    page_data = []
+    curr_applicant = []
+    for row in backend.table_rows(html):
+        # Skip ad placement and placeholder rows
+        if backend.is_filler(row):
+            continue
+
+        # Parsing applicant data
+        if backend.starts_applicant(row):
+            if curr_applicant:
+                page_data.append(curr_applicant)
+            curr_applicant = [row]
+        else:
+            curr_applicant.append(row)
+
+    if curr_applicant:
+        page_data.append(curr_applicant)
+    return page_data
+
+def load_known_ids(filepath:Path) -> set[str]:
+    """Loads the GradCafe result ids already present in a cleaned `applicant_data` file.
+
+    Returns an empty set if the file does not exist yet.
+    """
+    if not filepath.exists():
+        return set()
+    return {
+        result_id for applicant in load_data(filepath)
+        if (result_id := _result_id(applicant.get("url"))) is not None
+    }
+
+def _scrape_data(pages:int=750, workers:int=1, max_rate:float|None=None,
+                 known_ids:set[str]|None=None, keep_raw:bool=False, parser:str|None=None,
+                 cache:PageCache|None=None) -> Iterator[tuple[dict[str, str|None], list[str]|None]]:
+    """Scrapes and extracts applicant data from The GradCafe admissions results pages.
+
+    Pages are downloaded by `_iter_pages` (optionally concurrently) and grouped into
+    applicants by `_parse_page`. Each page is parsed once: the applicant fields are
+    extracted directly from the page tree. Applicants are yielded in page order, as soon
+    as their page is parsed, regardless of the order in which the downloads finish.
+
+    GradCafe lists results newest-first, so when `known_ids` is given the scrape is
+    incremental: applicants whose result id is already known are dropped, and paging
+    stops at the first page on which every applicant is already known.
 
     Args:
         pages: Number of result pages to scrape (default 750).
+        workers: Number of pages fetched concurrently (default 1).
+        max_rate: Maximum requests per second to GradCafe (default: no maximum, the rate adapts).
+        known_ids: Result ids (`/result/<id>`) from a previous scrape (default None, full scrape).
+        keep_raw: Whether to also yield each applicant's row HTML strings (default False).
+        parser: Name of the parser backend (default: fastest installed, see `parsers.PARSERS`).
+        cache: Optional page cache, so an interrupted scrape can be resumed (see `PageCache`).
 
-    Returns:
-        List of applicants, each being a list of row HTML strings.
+    Yields:
+        Tuples of an extracted applicant (dict) and, if `keep_raw`, its raw row HTML
+        strings (otherwise None).
+    """
+    with closing(_iter_pages(pages, workers, max_rate, cache)) as html_pages:
+        yield from _extract_pages(html_pages, known_ids, keep_raw, parser)
+
+def _extract_pages(html_pages:Iterable[bytes], known_ids:set[str]|None=None, keep_raw:bool=False,
+                   parser:str|None=None) -> Iterator[tuple[dict[str, str|None], list[str]|None]]:
+    """Extracts the applicants of downloaded results pages, stopping at known ones.
+
+    See `_scrape_data` for `known_ids`, `keep_raw`, `parser` and what is yielded.
     """
-    base_url = "https://www.thegradcafe.com/survey/?page={}"
-    http = urllib3.PoolManager()
-    raw_data = []
-
-    for curr_page in range(1, pages+1):
-        url = base_url.format(curr_page)
-        response = http.request("GET", url)
-        soup = BeautifulSoup(response.data, "html.parser")
-        
-        applicant_datatable = soup.find("tbody")
-        all_rows = applicant_datatable.find_all("tr", recursive=False)
-
-        curr_applicant = []
-        for row in all_rows:
-            # Check for ad placement row within applicant
-            ad_div = row.find("div", id=re.compile(r"^results-ad-placement"))
-            if ad_div:
-                continue
-            
-            # Skip ad placeholder rows
-            tds = row.find_all("td", recursive=False)
-            if len(tds) == 1 and not tds[0].get_text(strip=True):
-                continue
-            
-            # Parsing applicant data
-            if not row.get("class"):    
-                if curr_applicant:
-                    raw_data.append([str(r) for r in curr_applicant])    
-                curr_applicant = [row]
-            else:
-                curr_applicant.append(row)
-        
-        if curr_applicant:
-            raw_data.append([str(r) for r in curr_applicant])
-    return raw_data
-
-def scrape_data(savepath:Path, pages:int=750) -> None:
+    backend = get_parser(parser)
+    for html in html_pages:
+        page_rows = _parse_page(html, parser)
+        page_data = [_extract_applicant_fields(rows, parser) for rows in page_rows]
+        if known_ids:
+            is_new = [_result_id(a["url"]) not in known_ids for a in page_data]
+            if page_data and not any(is_new):
+                break
+            page_rows = [r for r, new in zip(page_rows, is_new) if new]
+            page_data = [a for a, new in zip(page_data, is_new) if new]
+        for rows, applicant in zip(page_rows, page_data):
+            yield applicant, [backend.to_html(r) for r in rows] if keep_raw else None
+
+def scrape_data(savepath:Path, pages:int=750, workers:int=1, max_rate:float|None=None,
+                known_ids:set[str]|None=None, merge:bool=False,
+                raw_savepath:Path|None=None, parser:str|None=None,
+                cache_dir:Path|None=None) -> None:
     """Orchestrates scraping and saving of applicant data.
 
+    Applicants are written as they are scraped. With `.jsonl` paths (JSON Lines), memory
+    use stays constant. The file is moved into place once the scrape completes; to load
+    applicants while they are still being scraped, use `pipeline.scrape_pipeline`.
+    Every saved applicant gets a `canonical_university` (see `universities.UniversityResolver`).
+
+    With a `cache_dir`, fetched pages are kept in a `PageCache` there and the run is
+    checkpointed. If the scrape fails part way (a network error, or an error page instead
+    of results), rerunning it re-parses the pages already fetched from disk and only
+    requests the rest; pages cached by earlier completed runs are revalidated with
+    conditional GETs.
+
     Args:
-        savepath: Path to save the output JSON file.
+        savepath: Path to save the extracted applicant data (`.jsonl` or `.json`).
         pages: Number of result pages to scrape. Default is 750.
+        workers: Number of pages fetched concurrently. Default is 1.
+        max_rate: Maximum requests per second to GradCafe. Default is no maximum (the rate adapts to the server).
+        known_ids: Already scraped result ids; only newer applicants are saved. Default is None.
+        merge: Whether to place new applicants ahead of those already saved at `savepath`. Default is False.
+        raw_savepath: Optional path to also save the raw row HTML, for debugging. Default is None.
+        parser: Name of the parser backend. Default is the fastest installed one.
+        cache_dir: Optional directory of the on-disk page cache. Default is None (no cache).
     """
-    raw_data = _scrape_data(pages)
-    _save_scraped_data(raw_data, savepath)
-    
-    print(f"Scraped and saved {len(raw_data)} applicants.")
-    
+    scraped = 0
+    cache = PageCache(cache_dir) if cache_dir is not None else None
+    if cache is not None and cache.resumed:
+        print("Resuming the interrupted scrape from the page cache.")
+    raw_writer = RecordWriter(raw_savepath) if raw_savepath is not None else None
+
+    def applicants():
+        nonlocal scraped
+        for applicant, raw_rows in _scrape_data(pages, workers, max_rate, known_ids,
+                                                keep_raw=raw_writer is not None, parser=parser,
+                                                cache=cache):
+            if raw_writer is not None:
+                raw_writer.write(raw_rows)
+            scraped += 1
+            yield applicant
+
+    try:
+        cleaned_data = applicants()
+        if merge:
+            cleaned_data = _merge_with_saved(cleaned_data, savepath)
+        save_data(canonicalize_universities(cleaned_data), savepath)
+    finally:
+        if raw_writer is not None:
+            raw_writer.close()
+    if cache is not None:
+        cache.finish_run()
+
+    print(f"Scraped and saved {scraped} applicants.")
+
 if __name__ == "__main__":
-    savepath = Path(__file__).parents[1] / "data" / "raw_data.json"
-    scrape_data(savepath, pages=5)
\ No newline at end of file
+    savepath = Path(__file__).parents[1] / "data" / "applicant_data.jsonl"
+    scrape_data(savepath, pages=5)
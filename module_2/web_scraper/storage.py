@@ -0,0 +1,71 @@
+import json
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+def _is_jsonl(path:Path) -> bool:
+    """Whether a path uses the JSON Lines format (`.jsonl`) rather than a JSON array."""
+    return path.suffix == ".jsonl"
+
+def iter_records(filepath:Path) -> Iterator:
+    """Yields the records stored in a JSON Lines file (one JSON value per line) or a JSON array file.
+
+    JSON Lines files are read one line at a time, so memory use does not grow with the file.
+    JSON array files are supported for importing data saved in the older format.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        if not _is_jsonl(filepath):
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+class RecordWriter:
+    """Writes records one at a time to a JSON Lines file, or to a JSON array file.
+
+    JSON Lines records are written as they come, so memory use stays constant. JSON array
+    files are only written on `close()`, since a JSON array is not valid until it is complete.
+
+    Use as a context manager:
+        with RecordWriter(path) as writer:
+            writer.write(record)
+    """
+
+    def __init__(self, filepath:Path):
+        self.filepath = filepath
+        self.count = 0
+        self._records = None if _is_jsonl(filepath) else []
+        self._file = open(filepath, "w", encoding="utf-8")
+
+    def write(self, record) -> None:
+        if self._records is None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._records.append(record)
+        self.count += 1
+
+    def close(self) -> None:
+        if self._records is not None:
+            json.dump(self._records, self._file, indent=2, ensure_ascii=False)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_records(filepath:Path, records:Iterable) -> int:
+    """Writes records to `filepath` and returns how many were written.
+
+    The file is written to a temporary path first and moved into place once complete, so
+    `records` may itself be streaming from the file being replaced, and readers of
+    `filepath` never see a partially written file.
+    """
+    tmp_path = filepath.with_name(f"{filepath.stem}.tmp{filepath.suffix}")
+    with RecordWriter(tmp_path) as writer:
+        for record in records:
+            writer.write(record)
+    os.replace(tmp_path, filepath)
+    return writer.count
@@ -0,0 +1,94 @@
+import difflib
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from .storage import iter_records, write_records
+
+# Canonical names of institutions whose names GradCafe users often abbreviate or misspell,
+# with the aliases they are reported under
+KNOWN_ALIASES = {
+    "Johns Hopkins University": ["JHU", "Johns Hopkins", "John Hopkins", "John Hopkin", "Johns Hopkin"],
+    "Massachusetts Institute of Technology": ["MIT"],
+    "Carnegie Mellon University": ["CMU", "Carnegie Mellon"],
+    "University of California, Berkeley": ["UC Berkeley", "UCB"],
+    "University of California, Los Angeles": ["UCLA"],
+    "University of California, San Diego": ["UCSD", "UC San Diego"],
+    "University of Illinois Urbana-Champaign": ["UIUC"],
+    "Georgia Institute of Technology": ["Georgia Tech", "GaTech"],
+    "University of Southern California": ["USC"],
+    "New York University": ["NYU"],
+}
+
+# Minimum difflib similarity for a misspelled name to be merged with a known one
+FUZZY_CUTOFF = 0.9
+
+def normalize_name(name:str) -> str:
+    """Normalizes a university name for alias lookups.
+
+    Case, punctuation, whitespace, '&' vs 'and' and a leading 'The' are ignored, so
+    "The Johns-Hopkins  University" and "johns hopkins university" are the same alias.
+    """
+    name = re.sub(r"[^\w\s]", " ", name.casefold().replace("&", " and "))
+    words = name.split()
+    if words[:1] == ["the"]:
+        words = words[1:]
+    return " ".join(words)
+
+class UniversityResolver:
+    """Maps the university names reported on GradCafe to canonical institution names.
+
+    A name resolves, in order, to:
+      1. the institution it is a known alias of (after `normalize_name`);
+      2. the institution whose known alias appears in it as whole words
+         ("JHU Whiting School", "MIT (Massachusetts Institute of Technology)");
+      3. the closest known or previously seen name, if at least `cutoff` similar
+         ("Standford University");
+      4. otherwise, itself, which makes it a known name for later lookups.
+    Every resolved name is remembered, so each distinct spelling is matched only once.
+    """
+
+    def __init__(self, aliases:dict[str, list[str]]=KNOWN_ALIASES, cutoff:float=FUZZY_CUTOFF):
+        self.cutoff = cutoff
+        self._canonical = {}
+        for canonical, names in aliases.items():
+            for name in (canonical, *names):
+                self._canonical[normalize_name(name)] = canonical
+        # Longest first, so "johns hopkins" is preferred over a shorter alias it contains
+        self._alias_patterns = [
+            (re.compile(rf"\b{re.escape(alias)}\b"), canonical)
+            for alias, canonical in sorted(self._canonical.items(), key=lambda item: -len(item[0]))
+        ]
+
+    def resolve(self, name:str|None) -> str|None:
+        """Returns the canonical name of the institution `name` refers to (None for None)."""
+        if not name:
+            return None
+        key = normalize_name(name)
+        if key not in self._canonical:
+            self._canonical[key] = self._match(key) or name.strip()
+        return self._canonical[key]
+
+    def _match(self, key:str) -> str|None:
+        """Finds the canonical name for an unseen normalized name, or None if it is new."""
+        for pattern, canonical in self._alias_patterns:
+            if pattern.search(key):
+                return canonical
+        close = difflib.get_close_matches(key, self._canonical, n=1, cutoff=self.cutoff)
+        return self._canonical[close[0]] if close else None
+
+def canonicalize_universities(applicants:Iterable[dict],
+                              resolver:UniversityResolver|None=None) -> Iterator[dict]:
+    """Yields applicants with a `canonical_university` field added from their `university`.
+
+    Resolution runs in the order applicants are given, so the result does not depend on
+    how the cleaning was split across processes.
+    """
+    resolver = resolver or UniversityResolver()
+    for applicant in applicants:
+        applicant["canonical_university"] = resolver.resolve(applicant.get("university"))
+        yield applicant
+
+if __name__ == "__main__":
+    # Adds canonical names to applicant data cleaned before they were introduced
+    datapath = Path(__file__).parents[1] / "data" / "applicant_data.jsonl"
+    write_records(datapath, canonicalize_universities(iter_records(datapath)))
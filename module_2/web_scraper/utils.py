@@ -1,12 +1,118 @@
-from bs4 import BeautifulSoup
 import re
+from datetime import date, datetime
+from .parsers import get_parser
 
-def _extract_applicant_fields(applicant_rows) -> dict[str, str|None]:
+RESULT_ID_PATTERN = re.compile(r"/result/(\d+)")
+TERM_PATTERN = re.compile(r"(Fall|Spring|Summer|Winter)\s*(\d{4})", re.IGNORECASE)
+
+# Decisions in the order they are looked for in the status ("Accepted on 15 Mar"), each
+# with its precompiled pattern for the decision date
+DECISIONS = ("Accepted", "Rejected", "Wait listed", "Interview")
+DECISION_DATE_PATTERNS = {decision: re.compile(rf"{decision} on ([\w\s\d]+)") for decision in DECISIONS}
+
+# Classifies a badge and extracts its value in a single match. Each alternative's named
+# group is the entry field it fills; the term and nationality are the whole badge.
+BADGE_PATTERN = re.compile(r"""
+      (?=.*?(?:Fall|Spring|Summer)\s*\d{4})(?P<term>.*) # a season and year anywhere
+    | (?P<nationality>American|International)\Z
+    | GRE\ (?!.*(?:V|AW))(?P<gre>\d+)                   # not GRE V or GRE AW
+    | GRE\ V\ (?P<gre_v>\d+)
+    | GRE\ AW\ (?P<gre_aw>[\d.]+)
+    | GPA\ (?P<gpa>[\d.]+)
+""", re.VERBOSE | re.DOTALL)
+
+# Formats GradCafe uses for the date an entry was added ("January 17, 2025")
+DATE_ADDED_FORMATS = ("%B %d, %Y", "%b %d, %Y")
+# Formats of the decision date in the status: "15 Mar 2025", or usually just "15 Mar"
+DECISION_DATE_FORMATS = ("%d %b %Y", "%d %B %Y")
+DECISION_DAY_FORMATS = ("%d %b", "%d %B")
+
+# First month of each term; decisions for a term are made before it starts
+TERM_START_MONTH = {"spring": 2, "summer": 6, "fall": 9, "winter": 12}
+
+def _result_id(text:str|None) -> str|None:
+    """Returns the GradCafe result id (`/result/<id>`) found in a URL or row HTML string."""
+    if not text:
+        return None
+    m = RESULT_ID_PATTERN.search(text)
+    return m.group(1) if m else None
+
+def _parse_date(text:str|None, formats:tuple[str, ...]) -> datetime|None:
+    """Parses `text` with the first matching strptime format, or returns None."""
+    if not text:
+        return None
+    for fmt in formats:
+        try:
+            return datetime.strptime(text.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+def _iso_date_added(text:str|None) -> str|None:
+    """Converts GradCafe's "January 17, 2025" to an ISO date ("2025-01-17")."""
+    parsed = _parse_date(text, DATE_ADDED_FORMATS)
+    return parsed.date().isoformat() if parsed else None
+
+def _iso_decision_date(text:str|None, date_added:str|None, term:str|None) -> str|None:
+    """Converts a decision date such as "15 Mar" to an ISO date, inferring the missing year.
+
+    A decision is reported after it is made, so it is the latest such day on or before the
+    date the entry was added. Without that date, it is the latest such day before the start
+    of the applicant's term. Returns None when the date can't be parsed or the year inferred.
     """
-    Parse applicant data from a list of HTML row strings (1-3 rows per applicant).
+    full_date = _parse_date(text, DECISION_DATE_FORMATS)
+    if full_date is not None:
+        return full_date.date().isoformat()
+    # Parsed within a leap year so that "29 Feb" is accepted
+    day = _parse_date(f"{text} 2000" if text else None,
+                      tuple(f"{fmt} %Y" for fmt in DECISION_DAY_FORMATS))
+    if day is None:
+        return None
+    if date_added is not None:
+        latest = date.fromisoformat(date_added)
+    elif (m := TERM_PATTERN.search(term or "")) is not None:
+        latest = date(int(m.group(2)), TERM_START_MONTH[m.group(1).lower()], 1)
+    else:
+        return None
+    for year in range(latest.year, latest.year - 5, -1):
+        try:
+            decided = date(year, day.month, day.day)
+        except ValueError:  # 29 Feb outside a leap year
+            continue
+        if decided <= latest:
+            return decided.isoformat()
+    return None
+
+def _parse_status(status_text:str) -> tuple[str, str|None]:
+    """Splits a status such as "Accepted on 15 Mar" into the decision and its date text.
+
+    A status without a known decision is returned as is, with no date.
+    """
+    for decision in DECISIONS:
+        if decision in status_text:
+            m = DECISION_DATE_PATTERNS[decision].search(status_text)
+            return decision, m.group(1) if m else None
+    return status_text, None
+
+def _classify_badge(entry:dict[str, str|None], badge:str) -> None:
+    """Sets the field of `entry` that a badge (term, nationality, GRE, GPA...) holds, if any."""
+    m = BADGE_PATTERN.match(badge)
+    if m:
+        entry[m.lastgroup] = m.group(m.lastgroup)
+
+def _extract_applicant_fields(applicant_rows:list, parser:str|None=None) -> dict[str, str|None]:
+    """
+    Parse applicant data from a list of rows (1-3 rows per applicant).
+    Rows are either row elements taken straight from a page tree built by the same
+    parser backend, or HTML row strings from a saved raw data file, which are parsed once.
+    `parser` names the backend (see `parsers.PARSERS`); the fastest installed one is the default.
     Returns a dict with all fields, defaulting to None if not present.
     """
-    
+    backend = get_parser(parser)
+    if isinstance(applicant_rows[0], str):
+        applicant_rows = backend.parse_rows(applicant_rows)
+    text = backend.applicant_text(applicant_rows)
+
     entry = {
         "program": None,
         "university": None,
@@ -25,96 +131,42 @@ def _extract_applicant_fields(applicant_rows) -> dict[str, str|None]:
     }
 
     # Row 1: Program, University, Date Added, Status, Degree, URL
-    soup1 = BeautifulSoup(applicant_rows[0], "html.parser")
-    tr_tag = soup1.find("tr")
-    tds = tr_tag.find_all("td", recursive=False)
-    
     #/ University /#
-    university_div = tds[0].find("div", class_="tw-font-medium tw-text-gray-900 tw-text-sm")
-    if university_div:
-        entry["university"] = university_div.get_text(strip=True)
+    entry["university"] = text.university
         
     #/ Program & Degree /#
-    prog_div = tds[1].find("div")
-    if prog_div:
-        spans = prog_div.find_all("span")
-        if len(spans) >= 1:
-            entry["program"] = spans[0].get_text(strip=True)
-        if len(spans) >= 2:
-            entry["degree"] = spans[1].get_text(strip=True)
+    spans = text.program_spans
+    if len(spans) >= 1:
+        entry["program"] = spans[0]
+    if len(spans) >= 2:
+        entry["degree"] = spans[1]
             
-    #/ Date Added /#
-    entry["date_added"] = tds[2].get_text(strip=True) or None
+    #/ Date Added (ISO) /#
+    entry["date_added"] = _iso_date_added(text.date_added)
     
     #/ Status & Acceptance/Rejection Date /#
-    status_div = tds[3].find("div")
-    if status_div:
-        status_text = status_div.get_text(strip=True)
-        if "Accepted" in status_text:
-            entry["status"] = "Accepted"
-            m = re.search(r"Accepted on ([\w\s\d]+)", status_text)
-            if m:
-                entry["date_decision"] = m.group(1)
-        elif "Rejected" in status_text:
-            entry["status"] = "Rejected"
-            m = re.search(r"Rejected on ([\w\s\d]+)", status_text)
-            if m:
-                entry["date_decision"] = m.group(1)
-        elif "Wait listed" in status_text:
-            entry["status"] = "Wait listed"
-            m = re.search(r"Wait listed on ([\w\s\d]+)", status_text)
-            if m:
-                entry["date_decision"] = m.group(1)
-        elif "Interview" in status_text:
-            entry["status"] = "Interview"
-            m = re.search(r"Interview on ([\w\s\d]+)", status_text)
-            if m:
-                entry["date_decision"] = m.group(1)
-        else:
-            entry["status"] = status_text
+    status_text = text.status
+    if status_text is not None:
+        entry["status"], entry["date_decision"] = _parse_status(status_text)
             
     #/ URL link /#
-    for a in tds[4].find_all("a"):
-        if "/result/" in a['href']:
+    for href in text.hrefs:
+        if "/result/" in href:
             entry["url"] = (
-                "https://www.thegradcafe.com" + a['href']
-                if a['href'].startswith("/")
-                else a['href']
+                "https://www.thegradcafe.com" + href
+                if href.startswith("/")
+                else href
             )
             break
 
     # Row 2: Badges (term, nationality, GRE, GRE V, GPA, GRE AW)
-    if len(applicant_rows) > 1:
-        soup2 = BeautifulSoup(applicant_rows[1], "html.parser")
-        badges = soup2.find_all("div", class_="tw-inline-flex")
-        for badge in badges:
-            text = badge.get_text(" ", strip=True)
-            if re.search(r"(Fall|Spring|Summer)\s*\d{4}", text):
-                entry["term"] = text
-            elif text in ("American", "International"):
-                entry["nationality"] = text
-            elif text.startswith("GRE ") and "V" not in text and "AW" not in text:
-                m = re.match(r"GRE (\d+)", text)
-                if m:
-                    entry["gre"] = m.group(1)
-            elif text.startswith("GRE V"):
-                m = re.match(r"GRE V (\d+)", text)
-                if m:
-                    entry["gre_v"] = m.group(1)
-            elif text.startswith("GRE AW"):
-                m = re.match(r"GRE AW ([\d\.]+)", text)
-                if m:
-                    entry["gre_aw"] = m.group(1)
-            elif text.startswith("GPA"):
-                m = re.match(r"GPA ([\d\.]+)", text)
-                if m:
-                    entry["gpa"] = m.group(1)
+    for badge in text.badges:
+        _classify_badge(entry, badge)
+
+    #/ Decision Date (ISO, year inferred from the date added or the term) /#
+    entry["date_decision"] = _iso_decision_date(entry["date_decision"], entry["date_added"], entry["term"])
 
     # Row 3: Comments
-    if len(applicant_rows) > 2:
-        soup3 = BeautifulSoup(applicant_rows[2], "html.parser")
-        p = soup3.find("p")
-        if p:
-            entry["comments"] = p.get_text(strip=True)
+    entry["comments"] = text.comments
 
     return entry
@@ -1,99 +1,53 @@
-from flask import Flask, render_template
-import psycopg2
+from flask import Flask, g, render_template
 import argparse
+import query_data
+from db_pool import ConnectionPool
 
 app = Flask(__name__)
 args = None
 
 def get_db_connection(args):
-    """"Handles database connection."""
-    DB_CONFIG = {
-        'dbname': args.db_name,
-        'user': args.db_user,
-        'password': args.db_password,
-        'host': args.db_host,
-        'port': args.db_port
-    }
-    return psycopg2.connect(**DB_CONFIG)
+    """Checks out a pooled connection for the current request (returned on teardown)."""
+    if "db_pool" not in app.extensions:
+        app.extensions["db_pool"] = ConnectionPool(
+            args.db_pool_min,
+            args.db_pool_max,
+            dbname=args.db_name,
+            user=args.db_user,
+            password=args.db_password,
+            host=args.db_host,
+            port=args.db_port,
+        )
+    if "db" not in g:
+        g.db = app.extensions["db_pool"].getconn()
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(_exception):
+    """Returns the request's connection, if any, to the pool."""
+    conn = g.pop("db", None)
+    if conn is not None:
+        app.extensions["db_pool"].putconn(conn)
 
 def get_results(args):
     """Handles queries from database and returns a dictionary with results."""
     conn = get_db_connection(args)
-    cur = conn.cursor()
-
-    #/ Query 1: Entries for Spring 2025 /#
-    cur.execute("SELECT COUNT(*) FROM applicants WHERE term ILIKE '%Spring 2025%'")
-    spring_2025_count = cur.fetchone()[0]
-
-    #/ Query 2: Percent international students /#
-    cur.execute("SELECT COUNT(*) FROM applicants WHERE us_or_international ILIKE '%International%'")
-    international = cur.fetchone()[0]
-    cur.execute("SELECT COUNT(*) FROM applicants")
-    total = cur.fetchone()[0]
-    percent_international = (international / total * 100) if total else 0
-
-    #/ Query 3: Average GPA, GRE, GRE V, GRE AW (each individually) /#
-    def get_avg(col):
-        cur.execute(f"SELECT AVG({col}) FROM applicants WHERE {col} IS NOT NULL")
-        return cur.fetchone()[0]
-
-    avg_gpa = get_avg("gpa")
-    avg_gre = get_avg("gre")
-    avg_gre_v = get_avg("gre_v")
-    avg_gre_aw = get_avg("gre_aw")
-
-    #/ Query 4: Average GPA of American students in Spring 2025 /#
-    cur.execute("""
-        SELECT AVG(gpa) FROM applicants
-        WHERE us_or_international ILIKE '%American%'
-        AND term ILIKE '%Spring 2025%'
-        AND gpa IS NOT NULL
-    """)
-    avg_gpa_american = cur.fetchone()[0]
-
-    #/ Query 5: % Acceptances Spring 2025 /#
-    cur.execute("SELECT COUNT(*) FROM applicants WHERE term ILIKE '%Spring 2025%'")
-    total_spring = cur.fetchone()[0]
-    cur.execute("SELECT COUNT(*) FROM applicants WHERE term ILIKE '%Spring 2025%' AND status ILIKE '%Accepted%'")
-    accepted_spring = cur.fetchone()[0]
-    percent_accept_spring = (accepted_spring / total_spring * 100) if total_spring else 0
-
-    #/ Query 6: Avg GPA of accepted Spring 2025 /#
-    cur.execute("""
-        SELECT AVG(gpa) FROM applicants
-        WHERE term ILIKE '%Spring 2025%'
-        AND status ILIKE '%Accepted%'
-        AND gpa IS NOT NULL
-    """)
-    avg_gpa_accepted = cur.fetchone()[0]
-
-    #/ Query 7: JHU Masters Computer Science /#
-    cur.execute("""
-        SELECT COUNT(*) FROM applicants
-        WHERE (university ILIKE '%JHU%' 
-                OR university ILIKE '%Johns Hopkins%' 
-                OR university ILIKE '%John Hopkins%' 
-                OR university ILIKE '%John Hopkin%' 
-                OR university ILIKE '%Johns Hopkin%')
-        AND (degree ILIKE '%Master%' OR degree ILIKE '%MS%' OR degree ILIKE '%Masters%')
-        AND program ILIKE '%Computer Science%'
-    """)
-    jhu_cs_masters = cur.fetchone()[0]
+    stats = query_data.dashboard_stats(conn)
 
-    cur.close()
-    conn.close()
+    def fmt(value):
+        return f"{value:.2f}" if value else "N/A"
 
     return {
-        "spring_2025_count": spring_2025_count,
-        "percent_international": f"{percent_international:.2f}",
-        "avg_gpa": f"{avg_gpa:.2f}" if avg_gpa else "N/A",
-        "avg_gre": f"{avg_gre:.2f}" if avg_gre else "N/A",
-        "avg_gre_v": f"{avg_gre_v:.2f}" if avg_gre_v else "N/A",
-        "avg_gre_aw": f"{avg_gre_aw:.2f}" if avg_gre_aw else "N/A",
-        "avg_gpa_american": f"{avg_gpa_american:.2f}" if avg_gpa_american else "N/A",
-        "percent_accept_spring": f"{percent_accept_spring:.2f}",
-        "avg_gpa_accepted": f"{avg_gpa_accepted:.2f}" if avg_gpa_accepted else "N/A",
-        "jhu_cs_masters": jhu_cs_masters
+        "spring_2025_count": stats.spring_2025_count,
+        "percent_international": f"{stats.percent_international:.2f}",
+        "avg_gpa": fmt(stats.avg_gpa),
+        "avg_gre": fmt(stats.avg_gre),
+        "avg_gre_v": fmt(stats.avg_gre_v),
+        "avg_gre_aw": fmt(stats.avg_gre_aw),
+        "avg_gpa_american": fmt(stats.avg_gpa_american),
+        "percent_accept_spring": f"{stats.percent_accept_spring:.2f}",
+        "avg_gpa_accepted": fmt(stats.avg_gpa_accepted),
+        "jhu_cs_masters": stats.jhu_cs_masters
     }
 
 @app.route("/")
@@ -108,6 +62,10 @@ def parse_args():
     parser.add_argument('--db_password', default='12345', help='Database password')
     parser.add_argument('--db_host', default='localhost', help='Database host')
     parser.add_argument('--db_port', default='5432', help='Database port')
+    parser.add_argument('--db_pool_min', type=int, default=1,
+                        help='Connections kept open in the pool')
+    parser.add_argument('--db_pool_max', type=int, default=10,
+                        help='Maximum connections open at once')
     return parser.parse_args()
 
 if __name__ == "__main__":
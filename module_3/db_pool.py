@@ -0,0 +1,106 @@
+"""Thread-safe PostgreSQL connection pool with health checks for the Flask dashboard."""
+
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool
+
+class ConnectionPool:
+    """Keeps between `minconn` and `maxconn` open connections to reuse across requests.
+
+    Checking out a connection blocks while all `maxconn` connections are in use. A
+    connection that has been idle for longer than `health_check_interval` seconds is
+    pinged before it is handed out; broken connections are discarded until one passes the
+    check or a new one is opened, so the pool recovers on its own after a database restart.
+    New connections are handed out without a ping.
+    """
+
+    def __init__(self, minconn, maxconn, health_check_interval=30, **db_config):
+        """Opens `minconn` connections using psycopg2 connection keyword arguments.
+
+        Args:
+            minconn (int): Connections opened up front and kept open.
+            maxconn (int): Maximum number of connections open at once.
+            health_check_interval (float): Idle seconds after which a connection is pinged.
+            **db_config: Keyword arguments for `psycopg2.connect` (dbname, user, ...).
+        """
+        self._pool = pool.ThreadedConnectionPool(minconn, maxconn, **db_config)
+        self._available = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        # Each idle connection is tried at most once before a new one is opened
+        self._max_attempts = maxconn + 1
+        self.health_check_interval = health_check_interval
+        # Time the connections opened up front from now, like ones the pool opens later
+        opened = [self._pool.getconn() for _ in range(minconn)]
+        for connection in opened:
+            self._last_used[id(connection)] = time.monotonic()
+            self._pool.putconn(connection)
+
+    def _is_healthy(self, connection):
+        """Whether a checked-out connection is open and, if idle for a while, answers a ping."""
+        if connection.closed:
+            return False
+        last_used = self._last_used.setdefault(id(connection), time.monotonic())
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Checks out a healthy connection, discarding broken pooled ones until one passes.
+
+        Connections the pool has not handed out before were just opened and pass without a
+        ping, so at most every idle connection is checked before a new one is opened.
+
+        Raises:
+            psycopg2.pool.PoolError: If no healthy connection is found in `maxconn + 1` tries.
+            psycopg2.OperationalError: If a new connection cannot be opened.
+        """
+        self._available.acquire()  # pylint: disable=consider-using-with
+        try:
+            for _ in range(self._max_attempts):
+                connection = self._pool.getconn()
+                if self._is_healthy(connection):
+                    return connection
+                self._last_used.pop(id(connection), None)
+                self._pool.putconn(connection, close=True)
+            raise pool.PoolError(f"no healthy connection after {self._max_attempts} attempts")
+        except Exception:
+            self._available.release()
+            raise
+
+    def putconn(self, connection):
+        """Returns a connection to the pool, discarding it if it is broken."""
+        try:
+            broken = bool(connection.closed)
+            if not broken:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    broken = True
+            self._last_used[id(connection)] = time.monotonic()
+            self._pool.putconn(connection, close=broken)
+            # The pool also closes connections beyond the `minconn` it keeps idle
+            if connection.closed:
+                self._last_used.pop(id(connection), None)
+        finally:
+            self._available.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks out a connection and always returns it."""
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    def closeall(self):
+        """Closes every connection in the pool."""
+        self._pool.closeall()
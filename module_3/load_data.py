@@ -3,30 +3,17 @@ import json
 import argparse
 from pathlib import Path
 from psycopg2 import OperationalError
+from psycopg2.extras import execute_values
 
-insert_query = """
-    INSERT INTO applicants (
-        p_id, program, university, comments, date_added, url, status, date_decision, term,
-        us_or_international, gpa, gre, gre_v, gre_aw, degree
-    )
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    ON CONFLICT (p_id) DO UPDATE SET
-        program = EXCLUDED.program,
-        university = EXCLUDED.university,
-        comments = EXCLUDED.comments,
-        date_added = EXCLUDED.date_added,
-        url = EXCLUDED.url,
-        status = EXCLUDED.status,
-        date_decision = EXCLUDED.date_decision,
-        term = EXCLUDED.term,
-        us_or_international = EXCLUDED.us_or_international,
-        gpa = EXCLUDED.gpa,
-        gre = EXCLUDED.gre,
-        gre_v = EXCLUDED.gre_v,
-        gre_aw = EXCLUDED.gre_aw,
-        degree = EXCLUDED.degree
-;
-"""
+COLUMNS = (
+    "p_id", "program", "university", "comments", "date_added", "url", "status", "date_decision",
+    "term", "us_or_international", "gre", "gre_v", "degree", "gpa", "gre_aw"
+)
+
+# Rows that are loaded again replace the stored ones
+UPSERT_CLAUSE = "ON CONFLICT (p_id) DO UPDATE SET " + ", ".join(
+    f"{column} = EXCLUDED.{column}" for column in COLUMNS[1:]
+)
 
 def create_connection(db_name, db_user, db_password, db_host, db_port):
     """Creates a connection to a PostgreSQL database.
@@ -93,27 +80,52 @@ def create_table(connection):
         print(f"Error while creating table:\n{e}")
     cursor.close()
 
-def insert_data(connection, data):
-    """Inserts applicant data into the applicants table.
+def _copy_value(value):
+    """Formats a value for PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+class RowStream:
+    """Read-only file-like object that renders rows as COPY text lines on demand."""
+
+    def __init__(self, rows):
+        self._lines = ("\t".join(map(_copy_value, row)) + "\n" for row in rows)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        """Returns up to `size` characters of COPY data (all remaining data if negative)."""
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+def insert_data(connection, data, method="copy"):
+    """Upserts applicant data into the applicants table.
+
+    By default, rows are streamed with `COPY FROM STDIN` into a temporary staging table
+    and merged into applicants with a single `INSERT ... ON CONFLICT DO UPDATE`, so rows
+    loaded again replace the stored ones. `method="values"` falls back to
+    batched multi-row INSERTs with `execute_values`.
 
     Args:
         connection: psycopg2 database connection object.
         data (list): List of dictionaries containing applicant data.
+        method (str): `copy` (default) or `values`.
 
     Returns:
         None
     """
     cursor = connection.cursor()
-    insert_query = """
-        INSERT INTO applicants (
-            p_id, program, university, comments, date_added, url, status, date_decision, term,
-            us_or_international, gre, gre_v, degree, gpa, gre_aw
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (p_id) DO NOTHING;
-    """
-    for i, applicant in enumerate(data):
-        cursor.execute(insert_query, (
+    columns = ", ".join(COLUMNS)
+    rows = (
+        (
             i,
             applicant.get('program'),
             applicant.get('university'),
@@ -129,7 +141,26 @@ def insert_data(connection, data):
             applicant.get('degree'),
             applicant.get('gpa'),
             applicant.get('gre_aw')
-        ))
+        )
+        for i, applicant in enumerate(data)
+    )
+    if method == "copy":
+        cursor.execute("CREATE TEMP TABLE applicants_staging (LIKE applicants) ON COMMIT DROP;")
+        cursor.copy_expert(f"COPY applicants_staging ({columns}) FROM STDIN;", RowStream(rows))
+        cursor.execute(f"""
+            INSERT INTO applicants ({columns})
+            SELECT {columns} FROM applicants_staging
+            {UPSERT_CLAUSE};
+        """)
+    elif method == "values":
+        execute_values(
+            cursor,
+            f"INSERT INTO applicants ({columns}) VALUES %s {UPSERT_CLAUSE};",
+            rows,
+            page_size=1000,
+        )
+    else:
+        raise ValueError(f"Unknown load method: {method}")
     connection.commit()
     print("Data inserted successfully.")
     cursor.close()
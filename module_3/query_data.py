@@ -1,5 +1,20 @@
 import psycopg2
 import argparse
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class DashboardStats:
+    """Every metric shown on the results page; averages are None when nobody reported the metric."""
+    spring_2025_count: int
+    percent_international: float
+    avg_gpa: float | None
+    avg_gre: float | None
+    avg_gre_v: float | None
+    avg_gre_aw: float | None
+    avg_gpa_american: float | None
+    percent_accept_spring: float
+    avg_gpa_accepted: float | None
+    jhu_cs_masters: int
 
 def create_connection(db_name, db_user, db_password, db_host, db_port):
     """Creates a connection to a PostgreSQL database.
@@ -150,6 +165,50 @@ def count_jhu_cs_masters(conn):
     print(f"JHU Masters Computer Science applicants: {result}")
     return result
 
+def dashboard_stats(conn):
+    """Computes every results page metric in a single scan of the applicants table.
+
+    Each metric is an aggregate with its own FILTER (WHERE ...) clause instead of a separate query.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT
+            COUNT(*) FILTER (WHERE term ILIKE '%Spring 2025%'),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE us_or_international ILIKE '%International%'),
+            AVG(gpa),
+            AVG(gre),
+            AVG(gre_v),
+            AVG(gre_aw),
+            AVG(gpa) FILTER (WHERE us_or_international ILIKE '%American%'
+                             AND term ILIKE '%Spring 2025%'),
+            COUNT(*) FILTER (WHERE term ILIKE '%Spring 2025%' AND status ILIKE '%Accepted%'),
+            AVG(gpa) FILTER (WHERE term ILIKE '%Spring 2025%' AND status ILIKE '%Accepted%'),
+            COUNT(*) FILTER (WHERE (university ILIKE '%JHU%'
+                                    OR university ILIKE '%Johns Hopkins%'
+                                    OR university ILIKE '%John Hopkins%'
+                                    OR university ILIKE '%John Hopkin%'
+                                    OR university ILIKE '%Johns Hopkin%')
+                             AND (degree ILIKE '%Master%' OR degree ILIKE '%MS%' OR degree ILIKE '%Masters%')
+                             AND program ILIKE '%Computer Science%')
+        FROM applicants
+    """)
+    (spring_count, total, international, avg_gpa, avg_gre, avg_gre_v, avg_gre_aw,
+     avg_gpa_american, spring_accepted, avg_gpa_accepted, jhu_cs_masters) = cur.fetchone()
+    cur.close()
+    return DashboardStats(
+        spring_2025_count=spring_count,
+        percent_international=(international / total * 100) if total else 0,
+        avg_gpa=avg_gpa,
+        avg_gre=avg_gre,
+        avg_gre_v=avg_gre_v,
+        avg_gre_aw=avg_gre_aw,
+        avg_gpa_american=avg_gpa_american,
+        percent_accept_spring=(spring_accepted / spring_count * 100) if spring_count else 0,
+        avg_gpa_accepted=avg_gpa_accepted,
+        jhu_cs_masters=jhu_cs_masters,
+    )
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Query applicant data from PostgreSQL.")
     parser.add_argument('--db_name', default='postgres', help='Database name')
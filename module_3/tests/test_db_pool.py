@@ -0,0 +1,48 @@
+"""Tests for the connection pool's health checks."""
+import psycopg2
+import pytest
+
+from db_pool import ConnectionPool
+from tests.conftest import TEST_DB_NAME
+
+def _backend_pid(connection):
+    """Returns the server process id behind a connection."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid();")
+        return cursor.fetchone()[0]
+
+@pytest.mark.db
+def test_getconn_skips_every_broken_connection(connection):
+    """Test that getconn discards broken idle connections until it finds a working one."""
+    connection_pool = ConnectionPool(2, 3, health_check_interval=0, dbname=TEST_DB_NAME)
+    idle = [connection_pool.getconn() for _ in range(2)]
+    pids = [_backend_pid(pooled) for pooled in idle]
+    for pooled in idle:
+        connection_pool.putconn(pooled)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_terminate_backend(pid) FROM unnest(%s) AS pid;", (pids,))
+    with connection_pool.connection() as pooled:
+        assert _backend_pid(pooled) not in pids
+    connection_pool.closeall()
+
+class _CountingConnection(psycopg2.extensions.connection):  # pylint: disable=too-few-public-methods
+    """A connection that counts the cursors opened on it."""
+    cursors = 0
+
+    def cursor(self, *args, **kwargs):
+        """Opens a cursor and counts it."""
+        self.cursors += 1
+        return super().cursor(*args, **kwargs)
+
+@pytest.mark.db
+def test_new_connections_are_not_pinged(connection):
+    """Test that connections the pool has just opened are handed out without a ping."""
+    connection.close()
+    connection_pool = ConnectionPool(1, 2, health_check_interval=60, dbname=TEST_DB_NAME,
+                                     connection_factory=_CountingConnection)
+    first, second = connection_pool.getconn(), connection_pool.getconn()
+    assert (first.cursors, second.cursors) == (0, 0)
+    connection_pool.putconn(first)
+    connection_pool.putconn(second)
+    connection_pool.closeall()
@@ -0,0 +1,34 @@
+import pytest
+from load_data import RowStream, create_table, insert_data
+
+@pytest.mark.load
+def test_row_stream_reads_copy_text_in_chunks():
+    """Test RowStream renders rows as COPY lines, escaping and returning them in chunks."""
+    stream = RowStream([(1, "a\tb", None), (2, "c\nd", 3.5)])
+    chunks = []
+    while chunk := stream.read(4):
+        chunks.append(chunk)
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    assert "".join(chunks) == "1\ta\\tb\t\\N\n2\tc\\nd\t3.5\n"
+
+@pytest.mark.db
+@pytest.mark.load
+@pytest.mark.parametrize("method", ["copy", "values"])
+def test_reload_updates_changed_rows(connection, method):
+    """Test loading applicants again replaces the stored rows instead of keeping stale ones."""
+    create_table(connection)
+    applicants = [{"program": "Computer Science", "gpa": "3.50"}, {"program": "Mathematics"}]
+    insert_data(connection, applicants, method)
+    insert_data(connection, [dict(applicants[0], program="Physics", gpa="3.90")], method)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT p_id, program, gpa FROM applicants ORDER BY p_id;")
+        assert cursor.fetchall() == [(0, "Physics", 3.9), (1, "Mathematics", None)]
+
+@pytest.mark.db
+@pytest.mark.load
+def test_unknown_load_method(connection):
+    """Test an unknown load method is rejected."""
+    create_table(connection)
+    with pytest.raises(ValueError):
+        insert_data(connection, [], "bogus")
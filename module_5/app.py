@@ -1,16 +1,66 @@
 """Flask web application for displaying PostgreSQL query results."""
 
 import argparse
-from flask import Flask, render_template
+import hashlib
+from dataclasses import asdict
+from flask import Flask, Response, g, jsonify, render_template, request, stream_with_context
 import psycopg2
 import query_data
+from db_pool import ConnectionPool
+from cache import ResultCache, start_listener
 
 app = Flask(__name__)
 ARGS = None
 LIMIT = 100
 
+def _db_config(db_args):
+    """Builds psycopg2 connection keyword arguments from the DB flags."""
+    return {
+        'dbname': db_args.db_name,
+        'user': db_args.db_user,
+        'password': db_args.db_password,
+        'host': db_args.db_host,
+        'port': db_args.db_port,
+    }
+
+def get_pool(db_args):
+    """Returns the app's connection pool, creating it on first use.
+
+    Args:
+        db_args: Parsed command-line arguments with DB credentials and pool sizes.
+
+    Returns:
+        ConnectionPool: The pool shared by all requests.
+    """
+    if 'db_pool' not in app.extensions:
+        app.extensions['db_pool'] = ConnectionPool(
+            db_args.db_pool_min, db_args.db_pool_max, **_db_config(db_args)
+        )
+    return app.extensions['db_pool']
+
+def get_cache(db_args):
+    """Returns the app's result cache, creating it on first use.
+
+    Creating the cache also starts a background listener that invalidates it whenever
+    `load_data.py` commits changed applicants.
+
+    Args:
+        db_args: Parsed command-line arguments with DB credentials, cache TTL and size.
+
+    Returns:
+        ResultCache: The cache shared by all requests.
+    """
+    if 'result_cache' not in app.extensions:
+        app.extensions['result_cache'] = ResultCache(
+            ttl=db_args.cache_ttl, maxsize=db_args.cache_size)
+        start_listener(app.extensions['result_cache'], _db_config(db_args))
+    return app.extensions['result_cache']
+
 def get_db_connection(db_args):
-    """Handles database connection.
+    """Checks out a pooled connection for the current request.
+
+    The same connection is reused for the rest of the request and returned to the pool
+    when the request ends.
 
     Args:
         db_args: Parsed command-line arguments with DB credentials.
@@ -18,38 +68,146 @@ def get_db_connection(db_args):
     Returns:
         psycopg2 connection object.
     """
-    db_config = {
-        'dbname': db_args.db_name,
-        'user': db_args.db_user,
-        'password': db_args.db_password,
-        'host': db_args.db_host,
-        'port': db_args.db_port
-    }
-    return psycopg2.connect(**db_config)
+    if 'db' not in g:
+        g.db = get_pool(db_args).getconn()
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(_exception):
+    """Returns the request's connection, if any, to the pool."""
+    connection = g.pop('db', None)
+    if connection is not None:
+        app.extensions['db_pool'].putconn(connection)
+
+def _format_average(value):
+    """Formats an average to two decimals, or N/A when no applicant reported the metric."""
+    return f"{value:.2f}" if value is not None else "N/A"
 
 @app.route("/")
 def home():
     """Main route for displaying results page."""
-    conn = query_data.create_connection(
-        ARGS.db_name, ARGS.db_user, ARGS.db_password, ARGS.db_host, ARGS.db_port
-    )
-    if conn is None:
+    try:
+        stats = get_cache(ARGS).get_or_compute(
+            'dashboard_stats', lambda: query_data.dashboard_stats(get_db_connection(ARGS))
+        )
+    except psycopg2.OperationalError as error:
+        print(f"Database connection failed: {error}")
         return "Database connection failed."
     results = {
-        "spring_2025_count": query_data.count_spring_2025_entries(conn),
-        "percent_international": query_data.percent_international(conn),
-        "avg_gpa": f"{query_data.average_metrics(conn)[0]:.2f}",
-        "avg_gre": f"{query_data.average_metrics(conn)[1]:.2f}",
-        "avg_gre_v": f"{query_data.average_metrics(conn)[2]:.2f}",
-        "avg_gre_aw": f"{query_data.average_metrics(conn)[3]:.2f}",
-        "avg_gpa_american": f"{query_data.average_gpa_american_spring_2025(conn):.2f}",
-        "percent_accept_spring": query_data.percent_acceptances_spring_2025(conn),
-        "avg_gpa_accepted": f"{query_data.average_gpa_accepted_spring_2025(conn):.2f}",
-        "jhu_cs_masters": query_data.count_jhu_cs_masters(conn),
+        "spring_2025_count": stats.spring_2025_count,
+        "percent_international": stats.percent_international,
+        "avg_gpa": _format_average(stats.avg_gpa),
+        "avg_gre": _format_average(stats.avg_gre),
+        "avg_gre_v": _format_average(stats.avg_gre_v),
+        "avg_gre_aw": _format_average(stats.avg_gre_aw),
+        "avg_gpa_american": _format_average(stats.avg_gpa_american_spring_2025),
+        "percent_accept_spring": stats.percent_acceptances_spring_2025,
+        "avg_gpa_accepted": _format_average(stats.avg_gpa_accepted_spring_2025),
+        "jhu_cs_masters": stats.jhu_cs_masters,
     }
-    conn.close()
     return render_template("results.html", **results)
 
+@app.route("/search")
+def search():
+    """Searches applicant programs and comments; returns one page of ranked results as JSON.
+
+    Query parameters: `q` (search text), `page` (default 1) and `per_page` (default 20).
+    """
+    try:
+        page = query_data.search(
+            get_db_connection(ARGS),
+            request.args.get('q', ''),
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 20, type=int),
+        )
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    except psycopg2.OperationalError as error:
+        print(f"Database connection failed: {error}")
+        return jsonify(error="Database connection failed."), 503
+    return jsonify(asdict(page))
+
+@app.route("/timeline")
+def timeline():
+    """Returns weekly decision counts as JSON, optionally filtered by university, program and term.
+
+    Query parameters: `university`, `program` and `term` (e.g. 'Fall 2025'). The response
+    carries an ETag built from the data version and the filters, so clients revalidating
+    with `If-None-Match` get a 304 until a load changes the data.
+    """
+    filters = {key: request.args.get(key) for key in ('university', 'program', 'term')}
+    cache = get_cache(ARGS)
+    try:
+        version = cache.get_or_compute(
+            'data_version', lambda: query_data.data_version(get_db_connection(ARGS))
+        )
+        etag = f"{version}-{hashlib.sha1(repr(sorted(filters.items())).encode()).hexdigest()[:16]}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            weeks = cache.get_or_compute(
+                ('timeline', *filters.values()),
+                lambda: query_data.decision_timeline(get_db_connection(ARGS), **filters),
+            )
+            response = jsonify(_timeline_json(weeks))
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    except psycopg2.OperationalError as error:
+        print(f"Database connection failed: {error}")
+        return jsonify(error="Database connection failed."), 503
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _timeline_json(rows):
+    """Groups `(week, decision, count)` rows into one entry per week with per-decision counts."""
+    weeks = {}
+    for week, decision, count in rows:
+        weeks.setdefault(week.isoformat(), {})[decision] = count
+    return [{"week": week, "decisions": counts} for week, counts in weeks.items()]
+
+# Content type of each `query_data.EXPORT_FORMATS` format
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+@app.route("/export")
+def export():
+    """Streams the applicants matching the filters as a CSV, NDJSON or Parquet download.
+
+    Query parameters: `format` (default csv), `university`, `program`, `degree` (both may be
+    repeated; any may match), `term`, `decision` and `nationality`.
+    """
+    fmt = request.args.get('format', 'csv')
+    filters = {
+        'university': request.args.get('university'),
+        'degree': request.args.getlist('degree') or None,
+        'program': request.args.getlist('program') or None,
+        'term': request.args.get('term'),
+        'decision': request.args.get('decision'),
+        'nationality': request.args.get('nationality'),
+    }
+    try:
+        chunks = query_data.export(get_db_connection(ARGS), fmt, **filters)
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    except psycopg2.OperationalError as error:
+        print(f"Database connection failed: {error}")
+        return jsonify(error="Database connection failed."), 503
+    # Keeps the request, and its pooled connection, open until the last chunk is sent
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename=applicants.{fmt}'},
+    )
+
+@app.route("/cache/stats")
+def cache_stats():
+    """Reports the result cache's hit/miss/invalidation counters as JSON."""
+    return jsonify(get_cache(ARGS).stats())
+
 def parse_args():
     """Parses command-line arguments for DB connection.
 
@@ -63,6 +221,14 @@ def parse_args():
     parser.add_argument('--db_password', default='12345', help='Database password')
     parser.add_argument('--db_host', default='localhost', help='Database host')
     parser.add_argument('--db_port', default='5432', help='Database port')
+    parser.add_argument('--db_pool_min', type=int, default=1,
+                        help='Connections kept open in the pool')
+    parser.add_argument('--db_pool_max', type=int, default=10,
+                        help='Maximum connections open at once')
+    parser.add_argument('--cache_ttl', type=float, default=300,
+                        help='Seconds dashboard results are cached')
+    parser.add_argument('--cache_size', type=int, default=256,
+                        help='Most dashboard results cached at once')
     return parser.parse_args()
 
 if __name__ == "__main__":
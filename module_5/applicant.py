@@ -0,0 +1,213 @@
+"""Typed applicant records, one at a time (`Applicant`) or a column at a time (`ApplicantBatch`).
+
+Module 2's cleaner writes each applicant as a JSON object whose values are all strings.
+`Applicant` holds the same fields in `__slots__`, with the GRE scores parsed as ints and
+the GPA and GRE AW as floats. `ApplicantBatch` holds many applicants as one list or array
+per field, for stages that work on a whole column at once. Both convert to and from the
+JSON records losslessly: each float keeps the number of decimal places it was written
+with, so a GPA of "3.80" is written back as "3.80". Numbers written some other way
+(" 3.8 ", "03.5") are written back in their plain form, and fields that hold no number
+are read as None.
+"""
+
+import dataclasses
+import functools
+import math
+from array import array
+from dataclasses import dataclass
+
+# Fields of a cleaned applicant record, in the order the cleaner writes them
+FIELDS = (
+    "program", "university", "comments", "date_added", "url", "status", "date_decision",
+    "term", "nationality", "gre", "gre_v", "degree", "gpa", "gre_aw", "canonical_university"
+)
+INT_FIELDS = ("gre", "gre_v")
+FLOAT_FIELDS = ("gpa", "gre_aw")
+TEXT_FIELDS = tuple(field for field in FIELDS if field not in INT_FIELDS + FLOAT_FIELDS)
+
+# Decimal places stored in a batch for a float that was not read from text
+UNKNOWN_PLACES = 255
+
+def _parse_int(text):
+    """Parses an integer field's JSON string, or returns None if it holds no whole number."""
+    if text is None:
+        return None
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return None
+    return int(value) if value.is_integer() else None
+
+def _parse_float(text):
+    """Parses a decimal field's JSON string into its value and number of decimal places.
+
+    The places are None unless the text is the value written with them, so text such as
+    "03.5" is written back as "3.5". Text that is not a finite number is read as None.
+    """
+    if text is None:
+        return None, None
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return None, None
+    if not math.isfinite(value):
+        return None, None
+    if not isinstance(text, str):
+        return value, None
+    text = text.strip()
+    places = len(text) - text.index(".") - 1 if "." in text else 0
+    return value, places if _format_float(value, places) == text else None
+
+def _format_float(value, places):
+    """Writes a float with `places` decimal places (its shortest repr when None)."""
+    if value is None:
+        return None
+    return repr(value) if places is None else f"{value:.{places}f}"
+
+@dataclass(slots=True, kw_only=True)
+class Applicant:  # pylint: disable=too-many-instance-attributes
+    """One cleaned applicant with typed fields.
+
+    Text fields are strings, `gre` and `gre_v` ints, and `gpa` and `gre_aw` floats; fields
+    that were not reported are None. `gpa_places` and `gre_aw_places` are the decimal places
+    the floats were written with (None when not read from text). Use `from_json` and
+    `to_json` to convert from and to the cleaner's JSON records.
+    """
+    program: str | None = None
+    university: str | None = None
+    comments: str | None = None
+    date_added: str | None = None
+    url: str | None = None
+    status: str | None = None
+    date_decision: str | None = None
+    term: str | None = None
+    nationality: str | None = None
+    gre: int | None = None
+    gre_v: int | None = None
+    degree: str | None = None
+    gpa: float | None = None
+    gre_aw: float | None = None
+    canonical_university: str | None = None
+    gpa_places: int | None = dataclasses.field(default=None, repr=False)
+    gre_aw_places: int | None = dataclasses.field(default=None, repr=False)
+
+    @classmethod
+    def from_json(cls, record):
+        """Builds an applicant from a JSON record, parsing its numeric fields.
+
+        Missing fields, and numeric fields that hold no number, are None. Keys that are
+        not applicant fields are ignored.
+        """
+        gpa, gpa_places = _parse_float(record.get("gpa"))
+        gre_aw, gre_aw_places = _parse_float(record.get("gre_aw"))
+        return cls(**{name: record.get(name) for name in TEXT_FIELDS},
+                   gre=_parse_int(record.get("gre")),
+                   gre_v=_parse_int(record.get("gre_v")),
+                   gpa=gpa, gpa_places=gpa_places, gre_aw=gre_aw, gre_aw_places=gre_aw_places)
+
+    def to_json(self):
+        """Returns the applicant as a JSON record, with its numbers written back as strings."""
+        record = {name: getattr(self, name) for name in FIELDS}
+        record["gre"] = None if self.gre is None else str(self.gre)
+        record["gre_v"] = None if self.gre_v is None else str(self.gre_v)
+        record["gpa"] = _format_float(self.gpa, self.gpa_places)
+        record["gre_aw"] = _format_float(self.gre_aw, self.gre_aw_places)
+        return record
+
+class ApplicantBatch:
+    """Applicants held field by field (a struct of arrays).
+
+    Each field is an attribute holding one column. Text columns are lists of strings (or
+    None). Numeric columns are `array('d')`s of 8 bytes per value, with NaN where a value
+    was not reported. The decimal places of the float columns are kept in `gpa_places` and
+    `gre_aw_places` byte arrays (`UNKNOWN_PLACES` when not read from text).
+    Indexing or iterating a batch builds `Applicant` records.
+    """
+
+    __slots__ = (*FIELDS, "gpa_places", "gre_aw_places")
+
+    def __init__(self, applicants=()):
+        """Builds a batch from `Applicant` records or JSON record dicts."""
+        for field in TEXT_FIELDS:
+            setattr(self, field, [])
+        self.gre, self.gre_v = array("d"), array("d")
+        self.gpa, self.gre_aw = array("d"), array("d")
+        self.gpa_places = array("B")
+        self.gre_aw_places = array("B")
+        for applicant in applicants:
+            self.append(applicant)
+
+    @classmethod
+    def batches(cls, applicants, size):
+        """Yields batches of up to `size` applicants from an iterable of records or dicts."""
+        batch = cls()
+        for applicant in applicants:
+            batch.append(applicant)
+            if len(batch) == size:
+                yield batch
+                batch = cls()
+        if len(batch):
+            yield batch
+
+    def append(self, applicant):
+        """Adds an `Applicant` or a JSON record dict to the end of the batch.
+
+        JSON records are parsed straight into the columns, without building an `Applicant`.
+        """
+        if isinstance(applicant, Applicant):
+            get = functools.partial(getattr, applicant)
+            gre, gre_v = applicant.gre, applicant.gre_v
+            gpa, gpa_places = applicant.gpa, applicant.gpa_places
+            gre_aw, gre_aw_places = applicant.gre_aw, applicant.gre_aw_places
+        else:
+            get = applicant.get
+            gre = _parse_int(get("gre"))
+            gre_v = _parse_int(get("gre_v"))
+            gpa, gpa_places = _parse_float(get("gpa"))
+            gre_aw, gre_aw_places = _parse_float(get("gre_aw"))
+        for field in TEXT_FIELDS:
+            getattr(self, field).append(get(field))
+        for column, value in ((self.gre, gre), (self.gre_v, gre_v), (self.gpa, gpa),
+                              (self.gre_aw, gre_aw)):
+            column.append(math.nan if value is None else value)
+        for column, places in ((self.gpa_places, gpa_places),
+                               (self.gre_aw_places, gre_aw_places)):
+            column.append(UNKNOWN_PLACES if places is None else places)
+
+    def values(self, field):
+        """Returns a numeric column as a list of ints or floats, with None where missing."""
+        convert = int if field in INT_FIELDS else float
+        return [None if math.isnan(value) else convert(value) for value in getattr(self, field)]
+
+    def texts(self, field):
+        """Returns a column as the strings of the JSON records (None where missing)."""
+        if field in INT_FIELDS:
+            return [None if math.isnan(value) else str(int(value))
+                    for value in getattr(self, field)]
+        if field in FLOAT_FIELDS:
+            return [None if math.isnan(value)
+                    else _format_float(value, None if places == UNKNOWN_PLACES else places)
+                    for value, places in zip(getattr(self, field),
+                                             getattr(self, f"{field}_places"))]
+        return list(getattr(self, field))
+
+    def __len__(self):
+        return len(self.gpa)
+
+    def __getitem__(self, index):
+        fields = {field: getattr(self, field)[index] for field in TEXT_FIELDS}
+        for field in INT_FIELDS + FLOAT_FIELDS:
+            value = getattr(self, field)[index]
+            convert = int if field in INT_FIELDS else float
+            fields[field] = None if math.isnan(value) else convert(value)
+        for field in FLOAT_FIELDS:
+            places = getattr(self, f"{field}_places")[index]
+            fields[f"{field}_places"] = None if places == UNKNOWN_PLACES else places
+        return Applicant(**fields)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def to_json(self):
+        """Returns the applicants as a list of JSON records."""
+        return [applicant.to_json() for applicant in self]
@@ -0,0 +1,287 @@
+"""Benchmarks the scrape -> clean -> load -> query pipeline on synthetic GradCafe data.
+
+For each size, synthetic results pages are generated and timed through page parsing,
+`_extract_applicant_fields` and `clean_data` (module 2), then `insert_data`, every
+`query_data` function and the Flask dashboard route (this module). Timings are written as
+JSON, and a previous results file can be compared against to catch regressions.
+
+The database stages run in a scratch database (default `gradcafe_benchmark`, created if
+missing) whose tables are rebuilt on every run, so they never touch real data.
+
+Run from the project root:
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000
+    python benchmarks/bench_pipeline.py --sizes 1000 --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+# pylint: disable=wrong-import-position,import-error
+from web_scraper.clean import clean_data
+from web_scraper.parsers import DEFAULT_PARSER
+from web_scraper.scrape import _parse_page
+from web_scraper.storage import iter_records, write_records
+from web_scraper.utils import _extract_applicant_fields
+import app
+import load_data
+import query_data
+from db_pool import ConnectionPool
+# pylint: enable=wrong-import-position,import-error
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Applicants per synthetic results page, as on GradCafe
+PAGE_SIZE = 20
+
+# Slowdown relative to the compared run above which a stage is reported as a regression
+REGRESSION_THRESHOLD = 1.25
+
+# Reported names of universities, including aliases and misspellings the cleaner resolves
+UNIVERSITIES = ("Johns Hopkins University", "JHU", "John Hopkins University", "MIT",
+                "Massachusetts Institute of Technology", "Stanford University",
+                "Standford University", "Carnegie Mellon University", "CMU", "UC Berkeley",
+                "University of Michigan", "Georgia Tech", "New York University")
+PROGRAMS = ("Computer Science", "Electrical Engineering", "Physics", "Mathematics",
+            "Biology", "Economics", "Data Science", "Public Health")
+DEGREES = ("Masters", "PhD", "MS", "MFA", "MBA")
+STATUSES = ("Accepted", "Rejected", "Wait listed", "Interview")
+TERMS = ("Fall 2024", "Spring 2025", "Fall 2025", "Spring 2026")
+NATIONALITIES = ("American", "International")
+
+def _row(applicant_id:int, rng:random.Random) -> list[str]:
+    """Builds the row HTML of one synthetic applicant, as GradCafe lays it out."""
+    added = date(2024, 1, 1) + timedelta(days=rng.randrange(730))
+    decided = added - timedelta(days=rng.randrange(30))
+    rows = [
+        '<tr><td><div class="tw-flex"><div class="tw-font-medium tw-text-gray-900 tw-text-sm">'
+        f'{rng.choice(UNIVERSITIES)}</div></div></td>\n'
+        f'<td><div class="tw-text-gray-900"><span>{rng.choice(PROGRAMS)}</span>'
+        f'<span class="tw-text-gray-500">{rng.choice(DEGREES)}</span></div></td>\n'
+        f'<td class="tw-px-3">{added.strftime("%B %d, %Y")}</td>\n'
+        f'<td><div class="tw-inline-flex">{rng.choice(STATUSES)} on '
+        f'{decided.day} {decided.strftime("%b")}</div></td>\n'
+        f'<td><div><a href="/result/{applicant_id}">See More</a><a href="#">Report</a></div>'
+        '</td></tr>'
+    ]
+    badges = [rng.choice(TERMS), rng.choice(NATIONALITIES)]
+    if rng.random() < 0.6:
+        badges += [f"GRE {rng.randint(290, 340)}", f"GRE V {rng.randint(140, 170)}",
+                   f"GRE AW {rng.randint(6, 12) / 2:.1f}"]
+    if rng.random() < 0.8:
+        badges.append(f"GPA {rng.uniform(2.5, 4.0):.2f}")
+    rows.append('<tr class="tw-border-none"><td colspan="5"><div class="tw-flex">'
+                + "".join(f'<div class="tw-inline-flex tw-items-center">{badge}</div>'
+                          for badge in badges)
+                + '</div></td></tr>')
+    if rng.random() < 0.3:
+        rows.append('<tr class="tw-border-none"><td colspan="5"><p class="tw-text-gray-500">'
+                    f'Comment {applicant_id} about funding &amp; visa</p></td></tr>')
+    return rows
+
+def synthetic_raw_data(applicants:int, seed:int=0) -> list[list[str]]:
+    """Generates the raw row HTML of `applicants` applicants, newest (highest id) first."""
+    rng = random.Random(seed)
+    return [_row(1_000_000 + applicants - i, rng) for i in range(applicants)]
+
+def synthetic_pages(raw_data:list[list[str]]) -> list[bytes]:
+    """Lays raw applicant rows out as GradCafe results pages of `PAGE_SIZE` applicants."""
+    return [
+        ("<html><body><table><tbody>"
+         + "".join(row for rows in raw_data[start:start + PAGE_SIZE] for row in rows)
+         + "</tbody></table></body></html>").encode("utf-8")
+        for start in range(0, len(raw_data), PAGE_SIZE)
+    ]
+
+def timed(function, *args, repeat:int=1) -> float:
+    """Returns the best wall-clock seconds of `repeat` calls of `function(*args)`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# `query_data` functions, called with representative arguments
+QUERIES = {
+    "count_spring_2025_entries": query_data.count_spring_2025_entries,
+    "percent_international": query_data.percent_international,
+    "average_metrics": query_data.average_metrics,
+    "average_gpa_american_spring_2025": query_data.average_gpa_american_spring_2025,
+    "percent_acceptances_spring_2025": query_data.percent_acceptances_spring_2025,
+    "average_gpa_accepted_spring_2025": query_data.average_gpa_accepted_spring_2025,
+    "count_jhu_cs_masters": query_data.count_jhu_cs_masters,
+    "dashboard_stats": query_data.dashboard_stats,
+    "count_applicants": lambda conn: query_data.count_applicants(
+        conn, university="JHU", degree=["Master", "MS"], program="Computer Science"),
+    "recent_decisions": query_data.recent_decisions,
+    "weekly_decisions": lambda conn: query_data.weekly_decisions(
+        conn, date(2025, 1, 1), date(2025, 6, 30)),
+    "decision_timeline": lambda conn: query_data.decision_timeline(
+        conn, university="JHU", term="Fall 2025"),
+    "search": lambda conn: query_data.search(conn, "funding"),
+    "export": lambda conn: sum(len(chunk) for chunk in query_data.export(conn, "ndjson")),
+}
+
+def bench_clean(raw_data:list[list[str]], workdir:Path) -> tuple[dict[str, float], Path]:
+    """Times the module 2 stages; returns the timings and the cleaned data's path."""
+    results = {}
+    pages = synthetic_pages(raw_data)
+    results["parse_pages"] = timed(lambda: [_parse_page(html) for html in pages])
+    del pages
+    results["extract_applicant_fields"] = timed(
+        lambda: [_extract_applicant_fields(rows) for rows in raw_data])
+    raw_path = workdir / "raw_data.jsonl"
+    clean_path = workdir / "applicant_data.jsonl"
+    write_records(raw_path, raw_data)
+    results["clean_data"] = timed(clean_data, clean_path, raw_path)
+    return results, clean_path
+
+def ensure_database(args:argparse.Namespace) -> None:
+    """Creates the scratch benchmark database if it does not exist yet."""
+    connection = psycopg2.connect(dbname="postgres", user=args.db_user,
+                                  password=args.db_password, host=args.db_host,
+                                  port=args.db_port)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (args.db_name,))
+        if cursor.fetchone() is None:
+            cursor.execute(f'CREATE DATABASE "{args.db_name}";')
+    connection.close()
+
+def bench_database(clean_path:Path, args:argparse.Namespace) -> dict[str, float]:
+    """Times loading, every query and the dashboard route against the scratch database."""
+    results = {}
+    db_config = {"dbname": args.db_name, "user": args.db_user, "password": args.db_password,
+                 "host": args.db_host, "port": args.db_port}
+    connection = psycopg2.connect(**db_config)
+    # The loader reports progress on stdout; keep the benchmark's own output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_data.create_table(connection, rebuild=True)
+        results["insert_data"] = timed(
+            lambda: load_data.insert_data(connection, iter_records(clean_path)))
+        results["insert_data_unchanged"] = timed(
+            lambda: load_data.insert_data(connection, iter_records(clean_path)))
+    for name, query in QUERIES.items():
+        results[f"query.{name}"] = timed(query, connection, repeat=args.repeat)
+        connection.rollback()
+    connection.close()
+
+    app.ARGS = argparse.Namespace(**vars(args), cache_ttl=300, cache_size=256,
+                                  db_pool_min=1, db_pool_max=2)
+    app.app.extensions["db_pool"] = ConnectionPool(1, 2, **db_config)
+    client = app.app.test_client()
+    cache = app.get_cache(app.ARGS)
+
+    def home(cached:bool):
+        if not cached:
+            cache.invalidate()
+        if client.get("/").status_code != 200:
+            raise RuntimeError("The dashboard route failed")
+
+    results["flask_home"] = timed(home, False, repeat=args.repeat)
+    results["flask_home_cached"] = timed(home, True, repeat=args.repeat)
+    app.app.extensions.pop("db_pool").closeall()
+    app.app.extensions.pop("result_cache")
+    return results
+
+def compare(results:dict, previous_path:Path, threshold:float) -> list[str]:
+    """Prints each stage's time relative to a previous run; returns the regressed stages."""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)["results"]
+    regressions = []
+    for size, stages in results.items():
+        for stage, seconds in stages.items():
+            before = previous.get(size, {}).get(stage)
+            if not before:
+                continue
+            ratio = seconds / before
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{size}/{stage}")
+            print(f"{size:>7} {stage:<40} {before:10.4f} s -> {seconds:10.4f} s"
+                  f"  x{ratio:5.2f}{flag}")
+    return regressions
+
+def parse_args() -> argparse.Namespace:
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the GradCafe data pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Numbers of synthetic applicants to benchmark with")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs of each query and route; the fastest is recorded")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--output", type=Path,
+                        help="Results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare with")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown ratio reported as a regression when comparing")
+    parser.add_argument("--skip_db", action="store_true",
+                        help="Only benchmark the stages that do not need PostgreSQL")
+    parser.add_argument("--db_name", default="gradcafe_benchmark",
+                        help="Scratch database, created if missing (its tables are rebuilt)")
+    parser.add_argument("--db_user", default="postgres", help="Database user")
+    parser.add_argument("--db_password", default="12345", help="Database password")
+    parser.add_argument("--db_host", default="localhost", help="Database host")
+    parser.add_argument("--db_port", default="5432", help="Database port")
+    return parser.parse_args()
+
+def main() -> None:
+    """Runs every stage at every size, saves the timings and compares them if asked."""
+    args = parse_args()
+    if not args.skip_db:
+        try:
+            ensure_database(args)
+        except psycopg2.OperationalError as error:
+            print(f"Database unavailable, skipping the database stages: {error}")
+            args.skip_db = True
+
+    results = {}
+    for size in args.sizes:
+        raw_data = synthetic_raw_data(size, args.seed)
+        with tempfile.TemporaryDirectory() as workdir:
+            stages, clean_path = bench_clean(raw_data, Path(workdir))
+            del raw_data
+            if not args.skip_db:
+                stages.update(bench_database(clean_path, args))
+        results[str(size)] = stages
+        for stage, seconds in stages.items():
+            print(f"{size:>7} {stage:<40} {seconds:10.4f} s")
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parser": DEFAULT_PARSER,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than x{args.threshold}: "
+                  + ", ".join(regressions))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
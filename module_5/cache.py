@@ -0,0 +1,154 @@
+"""In-process result cache for dashboard queries, invalidated when the loader changes data."""
+
+import select
+import threading
+import time
+from collections import OrderedDict
+import psycopg2
+
+# Channel the loader notifies after committing changed applicants
+CHANNEL = "applicants_changed"
+
+class ResultCache:
+    """Caches computed results by key for `ttl` seconds, keeping at most `maxsize` of them.
+
+    When the cache is full, the least recently used entry is evicted. Concurrent misses on
+    the same key are single-flight: one caller computes the value while the others wait
+    for it, so an expired entry never sends a stampede of identical queries to the
+    database. `invalidate()` drops entries before they expire.
+    """
+
+    def __init__(self, ttl=300, maxsize=256):
+        """Creates an empty cache.
+
+        Args:
+            ttl (float): Seconds a computed result stays valid.
+            maxsize (int): Most results kept at once.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        # Keys being computed, each with its lock and the number of callers using it
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def _lookup(self, key):
+        """Returns `(found, value)` for a live entry, counting the hit. Requires `_lock`."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._counters["hits"] += 1
+            self._entries.move_to_end(key)
+            return True, entry[0]
+        return False, None
+
+    def _store(self, key, value):
+        """Adds an entry, evicting the least recently used ones past `maxsize`. Requires `_lock`."""
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for `key`, calling `compute()` to fill it on a miss.
+
+        Args:
+            key: Hashable cache key.
+            compute: Zero-argument callable producing the value.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            with key_lock[0]:
+                with self._lock:
+                    # Another request may have computed it while we waited
+                    found, value = self._lookup(key)
+                    if found:
+                        return value
+                    self._counters["misses"] += 1
+                    generation = self._generation
+                value = compute()
+                with self._lock:
+                    # Don't store a result computed from data invalidated mid-computation
+                    if generation == self._generation:
+                        self._store(key, value)
+                return value
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                # The last caller drops the lock, unless invalidate() already has
+                if not key_lock[1] and self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def invalidate(self):
+        """Drops every cached result.
+
+        Callers computing a result when the cache is invalidated don't store it, and new
+        callers don't wait for them.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self._generation += 1
+            self._counters["invalidations"] += 1
+
+    def stats(self):
+        """Returns the hit/miss/invalidation/eviction counters and the number of cached entries."""
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "maxsize": self.maxsize,
+                    "ttl": self.ttl}
+
+def listen_for_changes(cache, db_config, retry_delay=5):
+    """Invalidates `cache` whenever the loader sends a NOTIFY on `CHANNEL`.
+
+    Runs forever on a dedicated connection (meant for a daemon thread), reconnecting after
+    `retry_delay` seconds if the connection is lost. The cache is also invalidated on each
+    reconnect, since notifications sent while disconnected are missed.
+
+    Args:
+        cache (ResultCache): Cache to invalidate.
+        db_config (dict): Keyword arguments for `psycopg2.connect`.
+        retry_delay (float): Seconds to wait before reconnecting.
+    """
+    reconnecting = False
+    while True:
+        connection = None
+        try:
+            connection = psycopg2.connect(**db_config)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL};")
+            if reconnecting:
+                cache.invalidate()
+            reconnecting = True
+            while True:
+                if select.select([connection], [], [], 60) == ([], [], []):
+                    continue
+                connection.poll()
+                if connection.notifies:
+                    connection.notifies.clear()
+                    cache.invalidate()
+        except psycopg2.Error as error:
+            print(f"Cache invalidation listener disconnected: {error}")
+            time.sleep(retry_delay)
+        finally:
+            if connection is not None:
+                connection.close()
+
+def start_listener(cache, db_config):
+    """Starts `listen_for_changes` on a daemon thread and returns the thread."""
+    thread = threading.Thread(
+        target=listen_for_changes, args=(cache, db_config), name="cache-listener", daemon=True
+    )
+    thread.start()
+    return thread
@@ -1,35 +1,281 @@
 """Module for loading applicant data into a PostgreSQL database."""
 
+import re
 import json
+import hashlib
 import argparse
+from datetime import date
 from pathlib import Path
 import psycopg2
-from psycopg2 import OperationalError
+from psycopg2 import OperationalError, sql
+from psycopg2.extras import execute_values
+# Dates are parsed the way module 2's cleaner parses them
+from web_scraper.utils import _iso_date_added, _iso_decision_date
+# Cleaned data files are read by the module that writes them
+from web_scraper.storage import iter_records
+# University names are matched the way the cleaner matches them
+from web_scraper.universities import KNOWN_ALIASES, normalize_name
+from applicant import ApplicantBatch
+from query_data import DECISIONS, NATIONALITIES, jhu_cs_masters_condition
 
-INSERT_QUERY = """
-    INSERT INTO applicants (
-        p_id, program, university, comments, date_added, url, status, date_decision, term,
-        us_or_international, gpa, gre, gre_v, gre_aw, degree
-    )
-    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+DEFAULT_DATA_PATH = Path(__file__).parent / "data" / "applicant_data.jsonl"
+
+COLUMNS = (
+    "p_id", "program", "university", "comments", "date_added", "url", "status", "date_decision",
+    "term", "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
+    "term_season", "term_year", "decision", "nationality", "university_id", "content_hash"
+)
+
+# Columns of the rows built by `applicant_rows`. `university_id` is resolved in the
+# database from the canonical university name the cleaner adds to each applicant, and
+# both names are recorded as aliases under their `normalize_name` keys.
+ROW_COLUMNS = (*COLUMNS[:-2], "canonical_university", "content_hash", "university_alias",
+               "canonical_alias")
+
+# Values of the normalized enum columns, parsed from the free-text term/status/nationality
+# (the decision and nationality values are shared with `query_data`'s filters)
+TERM_SEASONS = ("Fall", "Spring", "Summer", "Winter")
+
+TERM_PATTERN = re.compile(r"(Fall|Spring|Summer|Winter)\s*(\d{4})", re.IGNORECASE)
+
+# Rows per round trip for the execute_values fallback
+BATCH_SIZE = 1000
+
+# Metrics whose sums and counts are kept in applicant_stats so averages can be derived
+STATS_METRICS = ("gpa", "gre", "gre_v", "gre_aw")
+
+STATS_COLUMNS = (
+    "term_season", "term_year", "decision", "nationality", "jhu_cs_masters", "applicants",
+    *(f"{metric}_{agg}" for metric in STATS_METRICS for agg in ("count", "sum"))
+)
+
+# Applicant columns that the applicant_stats and decision_weeks rollups are computed from
+STATS_SOURCE_COLUMNS = (
+    "term_season", "term_year", "decision", "nationality", "university_id", "degree", "program",
+    "date_decision", *STATS_METRICS
+)
+
+TIMELINE_COLUMNS = (
+    "university_id", "program", "term_year", "term_season", "week", "decision", "applicants"
+)
+
+RESULT_ID_PATTERN = re.compile(r"/result/(\d+)")
+
+# Rows whose content hash is unchanged are left untouched by the upsert
+UPSERT_CLAUSE = f"""
     ON CONFLICT (p_id) DO UPDATE SET
-        program = EXCLUDED.program,
-        university = EXCLUDED.university,
-        comments = EXCLUDED.comments,
-        date_added = EXCLUDED.date_added,
-        url = EXCLUDED.url,
-        status = EXCLUDED.status,
-        date_decision = EXCLUDED.date_decision,
-        term = EXCLUDED.term,
-        us_or_international = EXCLUDED.us_or_international,
-        gpa = EXCLUDED.gpa,
-        gre = EXCLUDED.gre,
-        gre_v = EXCLUDED.gre_v,
-        gre_aw = EXCLUDED.gre_aw,
-        degree = EXCLUDED.degree
-;
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS[1:])}
+    WHERE applicants.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+"""
+
+# `ordinal` numbers the staged rows in load order, so when one load holds the same p_id
+# more than once the last of its rows wins, as it does in `offline.ColumnarStore`
+STAGING_QUERY = """
+    CREATE TEMP TABLE applicants_staging
+    (LIKE applicants INCLUDING DEFAULTS, canonical_university TEXT, university_alias TEXT,
+     canonical_alias TEXT, ordinal BIGSERIAL)
+    ON COMMIT DROP;
 """
 
+COPY_QUERY = f"COPY applicants_staging ({', '.join(ROW_COLUMNS)}) FROM STDIN;"
+
+STAGING_INSERT_QUERY = f"INSERT INTO applicants_staging ({', '.join(ROW_COLUMNS)}) VALUES %s;"
+
+# Adds the staged canonical names to universities and the reported and canonical names
+# (normalized) to university_aliases, then sets each staged row's university_id.
+# Applicants cleaned before canonical names were added fall back to a known alias of
+# their reported name, then to the reported name itself.
+RESOLVE_UNIVERSITIES_QUERY = """
+    UPDATE applicants_staging AS staged SET canonical_university = universities.name
+    FROM university_aliases JOIN universities USING (university_id)
+    WHERE staged.canonical_university IS NULL
+        AND university_aliases.alias = staged.university_alias;
+    UPDATE applicants_staging
+    SET canonical_university = university, canonical_alias = university_alias
+    WHERE canonical_university IS NULL;
+    INSERT INTO universities (name)
+    SELECT DISTINCT canonical_university FROM applicants_staging
+    WHERE canonical_university IS NOT NULL
+    ON CONFLICT (name) DO NOTHING;
+    INSERT INTO university_aliases (alias, university_id)
+    SELECT DISTINCT ON (names.alias) names.alias, universities.university_id
+    FROM applicants_staging AS staged
+    JOIN universities ON universities.name = staged.canonical_university
+    CROSS JOIN LATERAL (VALUES (staged.university_alias), (staged.canonical_alias)) AS names (alias)
+    WHERE names.alias <> ''
+    ORDER BY names.alias, staged.ordinal DESC
+    ON CONFLICT (alias) DO UPDATE SET university_id = EXCLUDED.university_id;
+    UPDATE applicants_staging AS staged SET university_id = universities.university_id
+    FROM universities WHERE universities.name = staged.canonical_university;
+"""
+
+# Bumps the data version and notifies listening dashboards; NOTIFY is delivered on commit
+BUMP_VERSION_QUERY = """
+    WITH bumped AS (
+        UPDATE applicants_meta SET data_version = data_version + 1 RETURNING data_version
+    )
+    SELECT pg_notify('applicants_changed', data_version::text) FROM bumped;
+"""
+
+def _stats_rows(source):
+    """Builds a SELECT that aggregates signed applicant rows into applicant_stats rows.
+
+    Args:
+        source (sql.Composable): Relation with a `sign` column (1 to add a row to the
+            statistics, -1 to remove it) followed by `STATS_SOURCE_COLUMNS`.
+
+    Returns:
+        sql.Composed: SELECT yielding one row per group, in `STATS_COLUMNS` order.
+    """
+    metric_aggregates = sql.SQL(", ").join(
+        sql.SQL(
+            "COALESCE(SUM(sign) FILTER (WHERE {metric} IS NOT NULL), 0), "
+            "COALESCE(SUM(sign * {metric}::numeric), 0)"
+        ).format(metric=sql.Identifier(metric))
+        for metric in STATS_METRICS
+    )
+    return sql.SQL("""
+        SELECT
+            COALESCE(term_season::text, ''), COALESCE(term_year, 0),
+            COALESCE(decision::text, ''), COALESCE(nationality::text, ''),
+            COALESCE({jhu_cs_masters}, FALSE), SUM(sign), {metric_aggregates}
+        FROM {source} AS signed_rows
+        GROUP BY 1, 2, 3, 4, 5
+    """).format(
+        jhu_cs_masters=jhu_cs_masters_condition(),
+        metric_aggregates=metric_aggregates,
+        source=source,
+    )
+
+def _timeline_rows(source):
+    """Builds a SELECT that counts signed applicant rows per decision week for decision_weeks.
+
+    Args:
+        source (sql.Composable): Relation with a `sign` column (1 to add a row to the
+            counts, -1 to remove it) followed by `STATS_SOURCE_COLUMNS`.
+
+    Returns:
+        sql.Composed: SELECT yielding one row per group, in `TIMELINE_COLUMNS` order.
+    """
+    return sql.SQL("""
+        SELECT
+            COALESCE(university_id, 0), COALESCE(program, ''),
+            COALESCE(term_year, 0), COALESCE(term_season::text, ''),
+            date_trunc('week', date_decision)::date, COALESCE(decision::text, ''), SUM(sign)
+        FROM {source} AS signed_rows
+        WHERE date_decision IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """).format(source=source)
+
+def _identifiers(columns, table=None):
+    """Comma-separated column identifiers, optionally qualified with a table name."""
+    return sql.SQL(", ").join(
+        sql.Identifier(table, column) if table else sql.Identifier(column) for column in columns
+    )
+
+# Unknown terms, decisions and nationalities are grouped under '' (and term year 0).
+# Sums/counts are NUMERIC/BIGINT so adding and removing rows never drifts from a recount.
+STATS_TABLE_QUERY = f"""
+    CREATE TABLE IF NOT EXISTS applicant_stats (
+        term_season TEXT NOT NULL,
+        term_year INTEGER NOT NULL,
+        decision TEXT NOT NULL,
+        nationality TEXT NOT NULL,
+        jhu_cs_masters BOOLEAN NOT NULL,
+        applicants BIGINT NOT NULL,
+        {", ".join(f"{metric}_count BIGINT NOT NULL, {metric}_sum NUMERIC NOT NULL"
+                   for metric in STATS_METRICS)},
+        PRIMARY KEY (term_year, term_season, decision, nationality, jhu_cs_masters)
+    );
+    CREATE TABLE IF NOT EXISTS decision_weeks (
+        university_id INTEGER NOT NULL,
+        program TEXT NOT NULL,
+        term_year INTEGER NOT NULL,
+        term_season TEXT NOT NULL,
+        week DATE NOT NULL,
+        decision TEXT NOT NULL,
+        applicants BIGINT NOT NULL,
+        PRIMARY KEY (university_id, program, term_year, term_season, week, decision)
+    );
+    CREATE INDEX IF NOT EXISTS decision_weeks_term_idx
+        ON decision_weeks (term_year, term_season, week);
+"""
+
+REFRESH_STATS_QUERY = sql.SQL("""
+    TRUNCATE applicant_stats, decision_weeks;
+    CREATE TEMP TABLE signed ON COMMIT DROP AS
+        SELECT 1 AS sign, {source_columns} FROM applicants;
+    INSERT INTO applicant_stats ({stats_columns})
+    {stats_rows};
+    INSERT INTO decision_weeks ({timeline_columns})
+    {timeline_rows};
+    DROP TABLE signed;
+""").format(
+    source_columns=_identifiers(STATS_SOURCE_COLUMNS),
+    stats_columns=_identifiers(STATS_COLUMNS),
+    stats_rows=_stats_rows(sql.Identifier('signed')),
+    timeline_columns=_identifiers(TIMELINE_COLUMNS),
+    timeline_rows=_timeline_rows(sql.Identifier('signed')),
+)
+
+# Upserts the staged rows and applies their net effect to applicant_stats and
+# decision_weeks in one statement:
+# rows being replaced are counted with sign -1 (all CTEs see the table as it was before the
+# statement) and the inserted or updated rows with sign +1.
+# (xmax = 0) is true for freshly inserted rows and false for updated ones.
+MERGE_QUERY = sql.SQL("""
+    WITH staged AS (
+        SELECT DISTINCT ON (p_id) {columns} FROM applicants_staging
+        ORDER BY p_id, ordinal DESC
+    ),
+    replaced AS (
+        SELECT -1 AS sign, {replaced_columns}
+        FROM applicants JOIN staged USING (p_id)
+        WHERE applicants.content_hash IS DISTINCT FROM staged.content_hash
+    ),
+    merged AS (
+        INSERT INTO applicants ({columns})
+        SELECT {columns} FROM staged
+        {upsert_clause}
+        RETURNING (xmax = 0) AS inserted, {source_columns}
+    ),
+    signed AS (
+        SELECT 1 AS sign, {source_columns} FROM merged
+        UNION ALL SELECT * FROM replaced
+    ),
+    stats AS (
+        INSERT INTO applicant_stats ({stats_columns})
+        {stats_rows}
+        ON CONFLICT (term_year, term_season, decision, nationality, jhu_cs_masters) DO UPDATE SET
+            {accumulate}
+    ),
+    timeline AS (
+        INSERT INTO decision_weeks ({timeline_columns})
+        {timeline_rows}
+        ON CONFLICT (university_id, program, term_year, term_season, week, decision) DO UPDATE SET
+            applicants = decision_weeks.applicants + EXCLUDED.applicants
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted),
+        COUNT(*) FILTER (WHERE NOT inserted),
+        (SELECT COUNT(*) FROM staged)
+    FROM merged;
+""").format(
+    columns=_identifiers(COLUMNS),
+    replaced_columns=_identifiers(STATS_SOURCE_COLUMNS, "applicants"),
+    upsert_clause=sql.SQL(UPSERT_CLAUSE),
+    source_columns=_identifiers(STATS_SOURCE_COLUMNS),
+    stats_columns=_identifiers(STATS_COLUMNS),
+    stats_rows=_stats_rows(sql.Identifier('signed')),
+    timeline_columns=_identifiers(TIMELINE_COLUMNS),
+    timeline_rows=_timeline_rows(sql.Identifier('signed')),
+    accumulate=sql.SQL(", ").join(
+        sql.SQL("{column} = applicant_stats.{column} + EXCLUDED.{column}").format(
+            column=sql.Identifier(column))
+        for column in STATS_COLUMNS[5:]
+    ),
+)
+
 def create_connection(db_name, db_user, db_password, db_host, db_port):
     """Creates a connection to a PostgreSQL database.
 
@@ -57,18 +303,158 @@ def create_connection(db_name, db_user, db_password, db_host, db_port):
         print(f"Error while connecting to database:\n{e}")
     return connection
 
-def create_table(connection):
-    """Drops the applicants table if it exists and creates a new applicants table.
+def _create_enum_query(name, values):
+    """SQL creating an enum type unless it already exists (CREATE TYPE has no IF NOT EXISTS)."""
+    labels = ", ".join(f"'{value}'" for value in values)
+    return f"""
+    DO $$ BEGIN
+        CREATE TYPE {name} AS ENUM ({labels});
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$;"""
+
+# Dates a text decision date of an older table the way the cleaner dates it (see
+# `_iso_dates`): an ISO date or "15 Mar 2025" as is, and a year-less "15 Mar" on the latest
+# such day on or before the date added or, without one, before the start of the term
+LEGACY_DECISION_DATE_FUNCTION = r"""
+    CREATE OR REPLACE FUNCTION pg_temp.legacy_decision_date(day TEXT, added DATE, term TEXT)
+    RETURNS DATE LANGUAGE plpgsql IMMUTABLE AS $$
+    DECLARE
+        parts TEXT[] := regexp_match(day, '^\s*(\d{1,2})\s+([A-Za-z]+)(?:\s+(\d{4}))?\s*$');
+        month INTEGER;
+        season TEXT[];
+        latest DATE := added;
+        decided DATE;
+    BEGIN
+        IF day ~ '^\d{4}-\d{2}-\d{2}$' THEN
+            RETURN day::DATE;
+        END IF;
+        month := greatest(
+            array_position(ARRAY['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug',
+                                 'sep', 'oct', 'nov', 'dec'], lower(parts[2])),
+            array_position(ARRAY['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                                 'august', 'september', 'october', 'november', 'december'],
+                           lower(parts[2])));
+        IF month IS NULL THEN
+            RETURN NULL;
+        END IF;
+        IF parts[3] IS NOT NULL THEN
+            RETURN make_date(parts[3]::INTEGER, month, parts[1]::INTEGER);
+        END IF;
+        IF latest IS NULL THEN
+            season := regexp_match(term, '(Fall|Spring|Summer|Winter)\s*(\d{4})', 'i');
+            IF season IS NULL THEN
+                RETURN NULL;
+            END IF;
+            latest := make_date(season[2]::INTEGER, CASE lower(season[1])
+                WHEN 'spring' THEN 2 WHEN 'summer' THEN 6 WHEN 'fall' THEN 9 ELSE 12 END, 1);
+        END IF;
+        FOR year IN REVERSE extract(YEAR FROM latest)::INTEGER
+                            ..extract(YEAR FROM latest)::INTEGER - 4 LOOP
+            BEGIN
+                decided := make_date(year, month, parts[1]::INTEGER);
+            EXCEPTION WHEN datetime_field_overflow THEN  -- not a day, or 29 Feb outside a leap year
+                CONTINUE;
+            END;
+            IF decided <= latest THEN
+                RETURN decided;
+            END IF;
+        END LOOP;
+        RETURN NULL;
+    EXCEPTION WHEN datetime_field_overflow OR invalid_datetime_format THEN
+        RETURN NULL;
+    END $$;
+"""
+
+def _create_trigram_indexes(cursor):
+    """Indexes `program` and `comments` for substring (`ILIKE '%...%'`) search with pg_trgm.
+
+    pg_trgm ships with PostgreSQL's contrib modules, which some installations lack; without
+    it substring search still works, only unindexed.
+    """
+    cursor.execute("SAVEPOINT trigram;")
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT trigram;")
+        print(f"pg_trgm is not available, substring search will not be indexed:\n{e}")
+        return
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS applicants_program_trgm_idx
+            ON applicants USING GIN (program gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS applicants_comments_trgm_idx
+            ON applicants USING GIN (comments gin_trgm_ops);
+    """)
+
+def _seed_university_aliases(cursor):
+    """Re-keys stored aliases by `normalize_name` and adds the cleaner's `KNOWN_ALIASES`."""
+    cursor.execute("SELECT alias, university_id FROM university_aliases;")
+    stale = [(alias, university_id) for alias, university_id in cursor.fetchall()
+             if normalize_name(alias) != alias]
+    if stale:
+        cursor.execute("DELETE FROM university_aliases WHERE alias = ANY(%s);",
+                       ([alias for alias, _ in stale],))
+        execute_values(cursor, """
+            INSERT INTO university_aliases (alias, university_id) VALUES %s
+            ON CONFLICT (alias) DO NOTHING;
+        """, [(normalize_name(alias), university_id) for alias, university_id in stale])
+    execute_values(cursor, "INSERT INTO universities (name) VALUES %s ON CONFLICT DO NOTHING;",
+                   [(canonical,) for canonical in KNOWN_ALIASES])
+    execute_values(cursor, """
+        INSERT INTO university_aliases (alias, university_id)
+        SELECT known.alias, universities.university_id
+        FROM (VALUES %s) AS known (alias, name) JOIN universities USING (name)
+        ON CONFLICT (alias) DO UPDATE SET university_id = EXCLUDED.university_id;
+    """, [(normalize_name(name), canonical) for canonical, names in KNOWN_ALIASES.items()
+          for name in (canonical, *names)])
+
+def create_table(connection, rebuild=False):
+    """Creates the applicants table if it does not exist yet.
+
+    The table is kept between runs so loads only touch changed rows. The single-row
+    `applicants_meta` table holds the data version bumped by each changing load, and
+    `applicant_stats` (dashboard aggregates) and `decision_weeks` (weekly decision counts
+    per university, program and term) are rollups that `insert_data` keeps up to date.
+    They are recomputed from the existing applicants when first created and whenever their
+    definition (grouping or metrics) has changed since they were computed. `universities`
+    holds one row per canonical institution and `university_aliases` maps each reported
+    or canonical name, normalized with module 2's `normalize_name`, to one. The aliases
+    are seeded with the cleaner's `KNOWN_ALIASES` (e.g. 'JHU'), and aliases stored by
+    older versions under their lowercased name are re-keyed.
+
+    Tables created by older versions get the `content_hash` and normalized
+    term/decision/nationality/university columns added; their rows are filled in when the
+    next load rewrites them. `date_decision` is converted from text to DATE in place (see
+    `LEGACY_DECISION_DATE_FUNCTION`). The normalized
+    columns and dates are indexed for equality and range lookups, and
+    `program` and `comments` for keyword (`search_tsv`) and substring (pg_trgm) search.
+    `rebuild` drops and recreates the tables first, which is needed once for tables whose
+    `p_id`s were assigned by position rather than taken from the GradCafe result id.
 
     Args:
         connection: psycopg2 database connection object.
+        rebuild (bool): Whether to drop the existing table first.
 
     Returns:
         None
     """
     cursor = connection.cursor()
-    cursor.execute("DROP TABLE IF EXISTS applicants;")
-    create_table_query = """
+    if rebuild:
+        cursor.execute(
+            "DROP TABLE IF EXISTS applicants, applicant_stats, decision_weeks, "
+            "university_aliases, universities;")
+    create_table_query = f"""
+    {_create_enum_query("term_season", TERM_SEASONS)}
+    {_create_enum_query("decision_status", DECISIONS)}
+    {_create_enum_query("nationality", NATIONALITIES)}
+    {LEGACY_DECISION_DATE_FUNCTION}
+    CREATE TABLE IF NOT EXISTS universities (
+        university_id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS university_aliases (
+        alias TEXT PRIMARY KEY,
+        university_id INTEGER NOT NULL REFERENCES universities
+    );
     CREATE TABLE IF NOT EXISTS applicants (
         p_id INTEGER PRIMARY KEY,
         program TEXT,
@@ -77,57 +463,297 @@ def create_table(connection):
         date_added DATE,
         url TEXT,
         status TEXT,
-        date_decision TEXT,
+        date_decision DATE,
         term TEXT,
         us_or_international TEXT,
         gre FLOAT,
         gre_v FLOAT,
         degree TEXT,
         gpa FLOAT,
-        gre_aw FLOAT
+        gre_aw FLOAT,
+        term_season term_season,
+        term_year SMALLINT,
+        decision decision_status,
+        nationality nationality,
+        university_id INTEGER REFERENCES universities,
+        content_hash TEXT
     );
+    ALTER TABLE applicants
+        ADD COLUMN IF NOT EXISTS term_season term_season,
+        ADD COLUMN IF NOT EXISTS term_year SMALLINT,
+        ADD COLUMN IF NOT EXISTS decision decision_status,
+        ADD COLUMN IF NOT EXISTS nationality nationality,
+        ADD COLUMN IF NOT EXISTS university_id INTEGER REFERENCES universities,
+        ADD COLUMN IF NOT EXISTS content_hash TEXT;
+    CREATE INDEX IF NOT EXISTS applicants_term_idx ON applicants (term_year, term_season);
+    CREATE INDEX IF NOT EXISTS applicants_decision_idx ON applicants (decision);
+    CREATE INDEX IF NOT EXISTS applicants_nationality_idx ON applicants (nationality);
+    CREATE INDEX IF NOT EXISTS applicants_university_idx ON applicants (university_id);
+    DO $$ BEGIN
+        -- Older versions stored "15 Mar" decision days
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'applicants' AND column_name = 'date_decision') = 'text' THEN
+            ALTER TABLE applicants ALTER COLUMN date_decision TYPE DATE
+                USING pg_temp.legacy_decision_date(date_decision, date_added, term);
+        END IF;
+    END $$;
+    CREATE INDEX IF NOT EXISTS applicants_date_decision_idx ON applicants (date_decision);
+    CREATE INDEX IF NOT EXISTS applicants_date_added_idx ON applicants USING BRIN (date_added);
+    ALTER TABLE applicants ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(program, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(comments, '')), 'B')
+    ) STORED;
+    CREATE INDEX IF NOT EXISTS applicants_search_idx ON applicants USING GIN (search_tsv);
+    CREATE TABLE IF NOT EXISTS applicants_meta (
+        singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+        data_version BIGINT NOT NULL DEFAULT 0
+    );
+    ALTER TABLE applicants_meta ADD COLUMN IF NOT EXISTS stats_definition TEXT;
+    INSERT INTO applicants_meta DEFAULT VALUES ON CONFLICT DO NOTHING;
     """
     try:
         cursor.execute(create_table_query)
+        # Statistics computed under another definition can't be updated incrementally
+        stats_definition = hashlib.md5(
+            (STATS_TABLE_QUERY + REFRESH_STATS_QUERY.as_string(cursor)).encode('utf-8')
+        ).hexdigest()
+        cursor.execute("""
+            SELECT stats_definition IS DISTINCT FROM %s
+                OR to_regclass('applicant_stats') IS NULL
+                OR to_regclass('decision_weeks') IS NULL
+            FROM applicants_meta;
+        """, (stats_definition,))
+        if cursor.fetchone()[0]:
+            cursor.execute("DROP TABLE IF EXISTS applicant_stats, decision_weeks;")
+            cursor.execute(STATS_TABLE_QUERY)
+            cursor.execute(REFRESH_STATS_QUERY)
+            cursor.execute("UPDATE applicants_meta SET stats_definition = %s;",
+                           (stats_definition,))
+        _create_trigram_indexes(cursor)
+        _seed_university_aliases(cursor)
         connection.commit()
         print("Table checked/created successfully.")
     except OperationalError as e:
         print(f"Error while creating table:\n{e}")
     cursor.close()
 
-def insert_data(connection, data):
-    """Inserts applicant data into the applicants table.
+def _normalize(text, values):
+    """Maps free text to the first of `values` it contains (case-insensitive).
+
+    Text matching none of them maps to the last value (the catch-all); missing text to None.
+    """
+    if not text:
+        return None
+    folded = text.casefold()
+    return next((value for value in values if value.casefold() in folded), values[-1])
+
+def _parse_term(term):
+    """Splits a term such as 'Spring 2025' into its season and year (None when unparsable)."""
+    match = TERM_PATTERN.search(term or '')
+    if match is None:
+        return None, None
+    return match.group(1).title(), int(match.group(2))
+
+def _iso_dates(date_added, date_decision, term):
+    """Returns the ISO date added and decision date of an applicant (None if unparsable).
+
+    The cleaner writes ISO dates. Data cleaned by older versions has dates added like
+    "January 17, 2025" and year-less decision days like "15 Mar", which are converted as
+    the cleaner converts them (see `web_scraper.utils._iso_decision_date`).
+    """
+    added = decided = None
+    if date_added:
+        try:
+            added = date.fromisoformat(date_added).isoformat()
+        except ValueError:
+            added = _iso_date_added(date_added)
+    if date_decision:
+        try:
+            decided = date.fromisoformat(date_decision).isoformat()
+        except ValueError:
+            decided = _iso_decision_date(date_decision, added, term)
+    return added, decided
+
+def _batch_rows(batch):  # pylint: disable=too-many-locals
+    """Yields the rows of an `ApplicantBatch` (see `applicant_rows`), a column at a time.
+
+    Terms, statuses, nationalities, dates and university names repeat across applicants,
+    so each distinct value is parsed once per batch. The content hash is taken over the
+    numbers as written in the JSON records, so it does not depend on how they are parsed.
+    """
+    terms = {term: _parse_term(term) for term in set(batch.term)}
+    decisions = {status: _normalize(status, DECISIONS) for status in set(batch.status)}
+    nationalities = {text: _normalize(text, NATIONALITIES) for text in set(batch.nationality)}
+    dates = {key: _iso_dates(*key)
+             for key in set(zip(batch.date_added, batch.date_decision, batch.term))}
+    aliases = {name: normalize_name(name) if name else None
+               for name in set(batch.university) | set(batch.canonical_university)}
+    metrics = zip(*(batch.values(metric) for metric in STATS_METRICS))
+    metric_texts = zip(*(batch.texts(metric) for metric in STATS_METRICS))
+    text_columns = zip(batch.program, batch.university, batch.comments, batch.date_added,
+                       batch.url, batch.status, batch.date_decision, batch.term,
+                       batch.nationality, batch.degree, batch.canonical_university)
+    for texts, numbers, numbers_text in zip(text_columns, metrics, metric_texts):
+        (program, university, comments, date_added, url, status, date_decision, term,
+         nationality, degree, canonical_university) = texts
+        match = RESULT_ID_PATTERN.search(url or '')
+        if match is None:
+            continue
+        date_added, date_decision = dates[date_added, date_decision, term]
+        head = (program, university, comments, date_added, url, status, date_decision, term,
+                nationality)
+        tail = (degree, *terms[term], decisions[status], nationalities[nationality],
+                canonical_university)
+        content_hash = hashlib.md5(
+            json.dumps((*head, *numbers_text, *tail), ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        yield (int(match.group(1)), *head, *numbers, *tail, content_hash, aliases[university],
+               aliases[canonical_university])
+
+def applicant_rows(data):
+    """Yields one tuple of column values (in `ROW_COLUMNS` order) per applicant.
+
+    `p_id` is the GradCafe result id taken from the applicant's URL, so it is stable
+    across scrapes. Applicants without a result URL cannot be keyed and are skipped.
+    The term, status and nationality are also parsed into the normalized `term_season`,
+    `term_year`, `decision` and `nationality` columns, and the `canonical_university` added
+    by the cleaner is passed on to be resolved to a `university_id`, along with the reported
+    and canonical names normalized as alias keys. The content hash covers every
+    column, so rows are rewritten when the parsing changes as well as when the data does.
+
+    Applicants are read into `ApplicantBatch`es of `BATCH_SIZE`, so the GPA and GRE metrics
+    come out as numbers and each batch is parsed a column at a time.
+
+    Args:
+        data (iterable): Applicant JSON record dicts or `applicant.Applicant` records.
+    """
+    for batch in ApplicantBatch.batches(data, BATCH_SIZE):
+        yield from _batch_rows(batch)
+
+def _copy_value(value):
+    """Formats a value for PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+class RowStream:  # pylint: disable=too-few-public-methods
+    """Read-only file-like object that renders rows as COPY text lines on demand.
+
+    Lets `cursor.copy_expert` stream a generator of rows to the server without building
+    the whole payload in memory.
+    """
+
+    def __init__(self, rows):
+        self._lines = ("\t".join(map(_copy_value, row)) + "\n" for row in rows)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        """Returns up to `size` characters of COPY data (all remaining data if negative)."""
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+def _copy_insert(cursor, rows):
+    """Streams rows into the staging table with COPY."""
+    cursor.copy_expert(COPY_QUERY, RowStream(rows))
+
+def _batched_insert(cursor, rows):
+    """Inserts rows into the staging table with INSERT statements of `BATCH_SIZE` rows each."""
+    execute_values(cursor, STAGING_INSERT_QUERY, rows, page_size=BATCH_SIZE)
+
+def insert_data(connection, data, method="copy"):
+    """Upserts applicant data into the applicants table.
+
+    Rows are keyed by GradCafe result id and carry a hash of their content; rows whose
+    hash has not changed are skipped, so reloads only write new or changed applicants.
+    When the data holds the same result id more than once, its last record wins.
+    The whole load runs in one transaction, so readers never see a partial load. When any
+    row changes, the data version in `applicants_meta` is bumped and a NOTIFY is sent on
+    `applicants_changed`, which tells running dashboards to drop their cached results.
+
+    Rows are staged in a temporary table, their universities are resolved to ids through
+    `universities` and `university_aliases`, and they are merged into applicants with a single
+    `INSERT ... ON CONFLICT DO UPDATE`, which also applies the net change of the merged rows
+    to the `applicant_stats` and `decision_weeks` rollups. The default `copy` method streams
+    rows into the staging table with `COPY FROM STDIN`. The `values` method is a fallback for
+    servers or proxies that do not support COPY, and sends batches of `BATCH_SIZE` rows per
+    statement.
+
+    Args:
+        connection: psycopg2 database connection object.
+        data (iterable): Applicant dicts or `applicant.Applicant` records (a list or a
+            generator).
+        method (str): Load method, `copy` (default) or `values`.
+
+    Returns:
+        dict: Numbers of `inserted`, `updated` and `unchanged` applicants.
+    """
+    stage = {"copy": _copy_insert, "values": _batched_insert}.get(method)
+    if stage is None:
+        raise ValueError(f"Unknown load method: {method}")
+    cursor = connection.cursor()
+    cursor.execute(STAGING_QUERY)
+    stage(cursor, applicant_rows(data))
+    cursor.execute(RESOLVE_UNIVERSITIES_QUERY)
+    cursor.execute(MERGE_QUERY)
+    inserted, updated, total = cursor.fetchone()
+    if inserted or updated:
+        cursor.execute("""
+            DELETE FROM applicant_stats WHERE applicants = 0;
+            DELETE FROM decision_weeks WHERE applicants = 0;
+        """)
+        cursor.execute(BUMP_VERSION_QUERY)
+    connection.commit()
+    counts = {"inserted": inserted, "updated": updated, "unchanged": total - inserted - updated}
+    print(f"Data loaded successfully: {counts['inserted']} inserted, "
+          f"{counts['updated']} updated, {counts['unchanged']} unchanged.")
+    cursor.close()
+    return counts
+
+def refresh_stats(connection):
+    """Recomputes the `applicant_stats` and `decision_weeks` rollups from the applicants table.
+
+    `insert_data` keeps the statistics up to date on its own; this is for repairing them
+    after the applicants table was changed by something other than the loader. The data
+    version is bumped, and a NOTIFY sent on `applicants_changed`, in the same transaction,
+    so running dashboards drop results cached before the refresh.
 
     Args:
         connection: psycopg2 database connection object.
-        data (list): List of dictionaries containing applicant data.
 
     Returns:
         None
     """
     cursor = connection.cursor()
-    for i, applicant in enumerate(data):
-        cursor.execute(INSERT_QUERY, (
-            i,
-            applicant.get('program'),
-            applicant.get('university'),
-            applicant.get('comments'),
-            applicant.get('date_added'),
-            applicant.get('url'),
-            applicant.get('status'),
-            applicant.get('date_decision'),
-            applicant.get('term'),
-            applicant.get('nationality'),
-            applicant.get('gpa'),
-            applicant.get('gre'),
-            applicant.get('gre_v'),
-            applicant.get('gre_aw'),
-            applicant.get('degree')
-        ))
+    cursor.execute(REFRESH_STATS_QUERY)
+    cursor.execute(BUMP_VERSION_QUERY)
     connection.commit()
-    print("Data inserted successfully.")
     cursor.close()
 
+def known_result_ids(connection):
+    """Returns the GradCafe result ids (`/result/<id>`) already stored in the applicants table.
+
+    Used as the `known_ids` of an incremental scrape so only newer results are fetched.
+
+    Args:
+        connection: psycopg2 database connection object.
+
+    Returns:
+        set: Result ids as strings.
+    """
+    cursor = connection.cursor()
+    cursor.execute("SELECT p_id FROM applicants;")
+    result_ids = {str(row[0]) for row in cursor.fetchall()}
+    cursor.close()
+    return result_ids
+
 def parse_args():
     """Parses command-line arguments for database credentials.
 
@@ -140,6 +766,15 @@ def parse_args():
     parser.add_argument('--db_password', default='12345', help='Database password')
     parser.add_argument('--db_host', default='localhost', help='Database host')
     parser.add_argument('--db_port', default='5432', help='Database port')
+    parser.add_argument('--data_path', type=Path, default=DEFAULT_DATA_PATH,
+                        help='Cleaned applicant data (.jsonl, or .json array)')
+    parser.add_argument('--load_method', choices=['copy', 'values'], default='copy',
+                        help='Bulk load with COPY (default) or batched INSERT ... VALUES')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Drop and recreate the applicants table before loading')
+    parser.add_argument('--refresh_stats', action='store_true',
+                        help='Recompute the applicant_stats and decision_weeks rollups '
+                             'from scratch after loading')
     return parser.parse_args()
 
 def main(cmd_args):
@@ -162,12 +797,12 @@ def main(cmd_args):
         print("Failed to connect to DB. Exiting.")
         return
 
-    create_table(conn)
+    create_table(conn, rebuild=cmd_args.rebuild)
+
+    insert_data(conn, iter_records(cmd_args.data_path), cmd_args.load_method)
 
-    data_path = Path(__file__).parent / "data" / "applicant_data.json"
-    with open(data_path, 'r', encoding='utf-8') as file:
-        applicants = json.load(file)
-    insert_data(conn, applicants)
+    if cmd_args.refresh_stats:
+        refresh_stats(conn)
 
     conn.close()
 
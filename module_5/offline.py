@@ -0,0 +1,183 @@
+"""In-memory columnar backend for the `query_data` metrics, for runs without PostgreSQL.
+
+`ColumnarStore` loads cleaned applicant data into NumPy arrays, and the metric functions
+here take a store where `query_data`'s take a database connection, with the same names and
+results. Applicants are parsed exactly as `load_data` parses them, so the metrics match
+those of the same data loaded into the database. NumPy is an optional dependency that is
+only needed here.
+"""
+
+import numpy as np
+from web_scraper.storage import iter_records
+from web_scraper.universities import KNOWN_ALIASES, normalize_name
+import load_data
+import query_data
+
+# Normalized columns stored dictionary-encoded, with the values they can take
+CATEGORIES = {
+    'term_season': load_data.TERM_SEASONS,
+    'decision': load_data.DECISIONS,
+    'nationality': load_data.NATIONALITIES,
+}
+
+# Case-insensitive substrings matched by `query_data.MASTERS_PATTERNS`
+MASTERS_SUBSTRINGS = tuple({pattern.strip('%').casefold()
+                            for pattern in query_data.MASTERS_PATTERNS})
+
+class ColumnarStore:  # pylint: disable=too-many-instance-attributes
+    """Applicants held column by column in NumPy arrays.
+
+    The term season, decision and nationality are dictionary-encoded as small integer
+    codes into `CATEGORIES` (-1 when missing), and canonical university names as codes
+    into `universities`. GPA/GRE metrics are float arrays with NaN where not reported.
+    Filters are boolean masks over the rows, so each metric is a few vectorized passes.
+    """
+
+    def __init__(self, applicants):
+        """Builds the columns from applicant dicts, keyed and parsed like `load_data` does.
+
+        Applicants without a result URL are skipped, and a later applicant with the same
+        result id replaces an earlier one. Universities without a canonical name are
+        matched through the cleaner's known aliases and the names other applicants reported
+        for a canonical one, falling back to the reported name, as `load_data` resolves them.
+
+        Args:
+            applicants: Iterable of cleaned applicant dicts.
+        """
+        rows = {row[0]: dict(zip(load_data.ROW_COLUMNS, row))
+                for row in load_data.applicant_rows(applicants)}
+        rows = list(rows.values())
+        self.aliases = {normalize_name(name): canonical
+                        for canonical, names in KNOWN_ALIASES.items()
+                        for name in (canonical, *names)}
+        self.aliases.update((row[key], row['canonical_university']) for row in rows
+                            for key in ('university_alias', 'canonical_alias')
+                            if row[key] and row['canonical_university'])
+        canonical = [
+            row['canonical_university'] or self.aliases.get(row['university_alias'])
+            or row['university']
+            for row in rows
+        ]
+        self.universities = tuple(sorted({name for name in canonical if name}))
+        self.university_codes = _encode(canonical, self.universities)
+        self.p_id = np.array([row['p_id'] for row in rows], dtype=np.int64)
+        self.codes = {column: _encode([row[column] for row in rows], values)
+                      for column, values in CATEGORIES.items()}
+        self.term_year = np.array([row['term_year'] or -1 for row in rows], dtype=np.int16)
+        self.metrics = {metric: np.array([row[metric] for row in rows], dtype=np.float64)
+                        for metric in load_data.STATS_METRICS}
+        self.degree = np.array([(row['degree'] or '').casefold() for row in rows], dtype=np.str_)
+        self.program = np.array([(row['program'] or '').casefold() for row in rows],
+                                dtype=np.str_)
+
+    @classmethod
+    def from_file(cls, data_path=load_data.DEFAULT_DATA_PATH):
+        """Loads a JSON Lines (`.jsonl`) or JSON array (`.json`) file of cleaned applicants."""
+        return cls(iter_records(data_path))
+
+    def __len__(self):
+        return len(self.p_id)
+
+    def equals(self, column, value):
+        """Mask of the rows whose dictionary-encoded `column` is `value`."""
+        values = CATEGORIES[column]
+        if value not in values:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[column] == values.index(value)
+
+    def term(self, season, year):
+        """Mask of the rows applying for the given term season and year."""
+        return self.equals('term_season', season) & (self.term_year == year)
+
+    def university(self, name):
+        """Mask of the rows at a university given by its canonical name or any alias."""
+        names = {self.aliases.get(normalize_name(name))}
+        names.update(university for university in self.universities
+                     if university.lower() == name.lower())
+        codes = [code for code, university in enumerate(self.universities) if university in names]
+        return np.isin(self.university_codes, codes)
+
+    def close(self):
+        """Does nothing; lets a store stand in for a database connection."""
+
+def _encode(values, categories):
+    """Dictionary-encodes `values` as int16 indexes into `categories` (-1 for missing)."""
+    index = {category: code for code, category in enumerate(categories)}
+    return np.array([index.get(value, -1) for value in values], dtype=np.int16)
+
+def _total(mask):
+    """Number of rows selected by `mask`."""
+    return int(np.count_nonzero(mask))
+
+def _average(store, metric, mask=None):
+    """Average of a metric over the rows in `mask` that reported it (None when none did)."""
+    values = store.metrics[metric]
+    reported = ~np.isnan(values) if mask is None else mask & ~np.isnan(values)
+    return float(values[reported].mean()) if reported.any() else None
+
+def _percent(part, total):
+    """`part` as a percentage of `total`, rounded like the database queries (0 when empty)."""
+    return round(part / total * 100, 2) if total > 0 else 0
+
+def _spring_2025(store):
+    """Mask of the Spring 2025 applicants."""
+    return store.term('Spring', 2025)
+
+def _jhu_cs_masters(store):
+    """Mask matching `query_data.jhu_cs_masters_condition`."""
+    masters = np.zeros(len(store), dtype=bool)
+    for substring in MASTERS_SUBSTRINGS:
+        masters |= np.strings.find(store.degree, substring) >= 0
+    computer_science = np.strings.find(store.program, 'computer science') >= 0
+    return store.university(query_data.JHU) & masters & computer_science
+
+def count_spring_2025_entries(connection):
+    """Counts number of applicants for Spring 2025."""
+    return _total(_spring_2025(connection))
+
+def percent_international(connection):
+    """Calculates percentage of international students (not American or Other)."""
+    return _percent(_total(connection.equals('nationality', 'International')), len(connection))
+
+def average_metrics(connection):
+    """Finds the average GPA, GRE, GRE V, and GRE AW for applicants who provided each metric."""
+    return tuple(_average(connection, metric) for metric in load_data.STATS_METRICS)
+
+def average_gpa_american_spring_2025(connection):
+    """Finds average GPA of American students who applied for Spring 2025."""
+    return _average(connection, 'gpa',
+                    connection.equals('nationality', 'American') & _spring_2025(connection))
+
+def percent_acceptances_spring_2025(connection):
+    """Percent of Spring 2025 entries that are Acceptances."""
+    spring = _spring_2025(connection)
+    return _percent(_total(spring & connection.equals('decision', 'Accepted')), _total(spring))
+
+def average_gpa_accepted_spring_2025(connection):
+    """Average GPA of accepted applicants who applied for Spring 2025."""
+    return _average(connection, 'gpa',
+                    _spring_2025(connection) & connection.equals('decision', 'Accepted'))
+
+def count_jhu_cs_masters(connection):
+    """Counts entries for JHU, masters, Computer Science."""
+    return _total(_jhu_cs_masters(connection))
+
+def dashboard_stats(connection):
+    """Computes every dashboard metric.
+
+    Returns:
+        query_data.DashboardStats: The dashboard metrics.
+    """
+    avg_gpa, avg_gre, avg_gre_v, avg_gre_aw = average_metrics(connection)
+    return query_data.DashboardStats(
+        spring_2025_count=count_spring_2025_entries(connection),
+        percent_international=percent_international(connection),
+        avg_gpa=avg_gpa,
+        avg_gre=avg_gre,
+        avg_gre_v=avg_gre_v,
+        avg_gre_aw=avg_gre_aw,
+        avg_gpa_american_spring_2025=average_gpa_american_spring_2025(connection),
+        percent_acceptances_spring_2025=percent_acceptances_spring_2025(connection),
+        avg_gpa_accepted_spring_2025=average_gpa_accepted_spring_2025(connection),
+        jhu_cs_masters=count_jhu_cs_masters(connection),
+    )
@@ -0,0 +1,100 @@
+"""Scrapes GradCafe and loads the applicants into PostgreSQL in one pipelined run.
+
+Fetching pages, parsing/cleaning applicants (module 2's `web_scraper.pipeline`) and loading
+them (`load_data.insert_data`) run as concurrent stages connected by bounded queues, so the
+applicants are never round-tripped through JSON files between the stages.
+"""
+
+import argparse
+from pathlib import Path
+from web_scraper.cache import PageCache
+from web_scraper.pipeline import QUEUE_SIZE, scrape_pipeline
+from web_scraper.storage import RecordWriter
+import load_data
+
+def _tee(applicants, writer):
+    """Yields applicants unchanged, also writing each one with `writer`."""
+    for applicant in applicants:
+        writer.write(applicant)
+        yield applicant
+
+def run(connection, cmd_args):
+    """Scrapes applicants and loads them through `connection` as they are cleaned.
+
+    The load is a single `insert_data` transaction that stages applicants while they are
+    still being scraped. With `--incremental`, scraping stops at the first page whose
+    applicants are all in the database already. With `--cache_dir`, the scrape resumes
+    from its page cache if a previous run failed before committing.
+
+    Args:
+        connection: psycopg2 database connection object.
+        cmd_args: Parsed command-line arguments.
+
+    Returns:
+        dict: Numbers of `inserted`, `updated` and `unchanged` applicants.
+    """
+    known_ids = load_data.known_result_ids(connection) if cmd_args.incremental else None
+    cache = PageCache(cmd_args.cache_dir) if cmd_args.cache_dir else None
+    applicants = scrape_pipeline(cmd_args.pages, cmd_args.workers, cmd_args.max_rate,
+                                 known_ids, cache=cache, queue_size=cmd_args.queue_size)
+    if cmd_args.save_path:
+        with RecordWriter(cmd_args.save_path) as writer:
+            counts = load_data.insert_data(connection, _tee(applicants, writer),
+                                           cmd_args.load_method)
+    else:
+        counts = load_data.insert_data(connection, applicants, cmd_args.load_method)
+    if cache is not None:
+        cache.finish_run()
+    return counts
+
+def parse_args():
+    """Parses command-line arguments for the scrape and the database.
+
+    Returns:
+        argparse.Namespace: Parsed command-line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Scrape GradCafe straight into PostgreSQL.")
+    parser.add_argument('--db_name', default='postgres', help='Database name')
+    parser.add_argument('--db_user', default='postgres', help='Database user')
+    parser.add_argument('--db_password', default='12345', help='Database password')
+    parser.add_argument('--db_host', default='localhost', help='Database host')
+    parser.add_argument('--db_port', default='5432', help='Database port')
+    parser.add_argument('--pages', type=int, default=750, help='Result pages to scrape')
+    parser.add_argument('--workers', type=int, default=1, help='Pages fetched concurrently')
+    parser.add_argument('--max_rate', type=float,
+                        help='Maximum requests per second to GradCafe (default: adaptive)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Stop at the first page of applicants already in the database')
+    parser.add_argument('--cache_dir', type=Path,
+                        default=Path(__file__).parent / "data" / "page_cache",
+                        help='Directory of the on-disk page cache used to resume failed runs')
+    parser.add_argument('--queue_size', type=int, default=QUEUE_SIZE,
+                        help='Items each stage may run ahead of the next one')
+    parser.add_argument('--save_path', type=Path,
+                        help='Also save the cleaned applicants to this .jsonl/.json file')
+    parser.add_argument('--load_method', choices=['copy', 'values'], default='copy',
+                        help='Bulk load with COPY (default) or batched INSERT ... VALUES')
+    return parser.parse_args()
+
+def main(cmd_args):
+    """Main entry point for the pipelined scrape and load.
+
+    Args:
+        cmd_args: Parsed command-line arguments.
+    """
+    conn = load_data.create_connection(
+        db_name=cmd_args.db_name,
+        db_user=cmd_args.db_user,
+        db_password=cmd_args.db_password,
+        db_host=cmd_args.db_host,
+        db_port=cmd_args.db_port
+    )
+    if conn is None:
+        print("Failed to connect to DB. Exiting.")
+        return
+    load_data.create_table(conn)
+    run(conn, cmd_args)
+    conn.close()
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -1,11 +1,84 @@
-"""Module for querying applicant data from a PostgreSQL database."""
+"""Module for querying applicant data from a PostgreSQL database.
+
+Queries read the `applicant_stats` aggregates table maintained by `load_data`, not the
+applicants table itself.
+"""
 
 import argparse
+import csv
+import importlib
+import io
+import itertools
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
 import psycopg2
 from psycopg2 import sql
+from web_scraper.universities import normalize_name
+
+try:
+    import pyarrow
+    from pyarrow import parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None  # pylint: disable=invalid-name
 
 LIMIT = 100
 
+# Largest page of search results returned at once
+MAX_PAGE_SIZE = 100
+
+SEARCH_COLUMNS = ('p_id', 'university', 'program', 'degree', 'term', 'status', 'url', 'comments')
+
+# Applicant fields written by `export`, in order
+EXPORT_COLUMNS = ('p_id', 'program', 'university', 'canonical_university', 'comments',
+                  'date_added', 'url', 'status', 'date_decision', 'term', 'us_or_international',
+                  'gpa', 'gre', 'gre_v', 'gre_aw', 'degree')
+EXPORT_FORMATS = ('csv', 'ndjson', 'parquet')
+
+# Rows fetched from the server-side cursor (and written as one chunk) at a time
+EXPORT_ITERSIZE = 2000
+
+# Canonical name given to Johns Hopkins (and its aliases, e.g. JHU) by the cleaner
+JHU = 'Johns Hopkins University'
+MASTERS_PATTERNS = ['%Master%', '%MS%', '%Masters%']
+
+TERM_PATTERN = re.compile(r"(Fall|Spring|Summer|Winter)\s*(\d{4})", re.IGNORECASE)
+
+# Values of the `decision` and `nationality` enum columns filled in by `load_data`
+DECISIONS = ("Accepted", "Rejected", "Wait listed", "Interview", "Other")
+NATIONALITIES = ("American", "International", "Other")
+
+@dataclass(frozen=True)
+class DashboardStats:  # pylint: disable=too-many-instance-attributes
+    """Every metric shown on the results dashboard.
+
+    Averages are None when no applicant in the group reported the metric.
+    """
+    spring_2025_count: int
+    percent_international: float
+    avg_gpa: float | None
+    avg_gre: float | None
+    avg_gre_v: float | None
+    avg_gre_aw: float | None
+    avg_gpa_american_spring_2025: float | None
+    percent_acceptances_spring_2025: float
+    avg_gpa_accepted_spring_2025: float | None
+    jhu_cs_masters: int
+
+@dataclass(frozen=True)
+class SearchPage:
+    """One page of ranked search results.
+
+    `results` holds one dict per applicant, with the `SEARCH_COLUMNS` and its `rank`.
+    """
+    query: str
+    page: int
+    per_page: int
+    has_more: bool
+    results: list
+
 def create_connection(db_name, db_user, db_password, db_host, db_port):
     """Creates a connection to a PostgreSQL database."""
     try:
@@ -22,45 +95,62 @@ def create_connection(db_name, db_user, db_password, db_host, db_port):
         print(f"Database connection failed: {error}")
         return None
 
-def count_spring_2025_entries(connection):
-    """Counts number of applicants for Spring 2025."""
-    cursor = connection.cursor()
-    query = sql.SQL(
-        "SELECT COUNT(*) FROM {table} WHERE {col} ILIKE {pattern} LIMIT {limit}"
+def _matches(column, pattern):
+    """Builds `column ILIKE pattern`."""
+    return sql.SQL("{col} ILIKE {val}").format(
+        col=sql.Identifier(column), val=sql.Literal(pattern))
+
+def _total(condition=sql.SQL("TRUE")):
+    """Sums the applicants of the `applicant_stats` groups matching `condition`."""
+    return sql.SQL("COALESCE(SUM({count}) FILTER (WHERE {cond}), 0)::bigint").format(
+        count=sql.Identifier('applicants'), cond=condition)
+
+def _average(metric, condition=sql.SQL("TRUE")):
+    """Averages a metric over the `applicant_stats` groups matching `condition`.
+
+    Only applicants who reported the metric count; NULL when none did.
+    """
+    return sql.SQL(
+        "(SUM({total}) FILTER (WHERE {cond})"
+        " / NULLIF(SUM({count}) FILTER (WHERE {cond}), 0))::float"
     ).format(
-        table=sql.Identifier('applicants'),
-        col=sql.Identifier('term'),
-        pattern=sql.Literal('%Spring 2025%'),
+        total=sql.Identifier(f'{metric}_sum'),
+        count=sql.Identifier(f'{metric}_count'),
+        cond=condition,
+    )
+
+def _equals(column, value):
+    """Builds `column = value`."""
+    return sql.SQL("{col} = {val}").format(col=sql.Identifier(column), val=sql.Literal(value))
+
+# Equality predicates on the normalized columns parsed by `load_data`
+SPRING_2025 = sql.SQL("{} AND {}").format(_equals('term_season', 'Spring'),
+                                          _equals('term_year', 2025))
+ACCEPTED = _equals('decision', 'Accepted')
+INTERNATIONAL = _equals('nationality', 'International')
+AMERICAN = _equals('nationality', 'American')
+
+def _select_stats(cursor, *columns):
+    """Runs a SELECT of aggregate columns over `applicant_stats` and returns the row."""
+    query = sql.SQL("SELECT {columns} FROM {table} LIMIT {limit}").format(
+        columns=sql.SQL(", ").join(columns),
+        table=sql.Identifier('applicant_stats'),
         limit=sql.Literal(LIMIT),
     )
     cursor.execute(query)
-    result = cursor.fetchone()[0]
+    return cursor.fetchone()
+
+def count_spring_2025_entries(connection):
+    """Counts number of applicants for Spring 2025."""
+    cursor = connection.cursor()
+    result = _select_stats(cursor, _total(SPRING_2025))[0]
     cursor.close()
     return result
 
 def percent_international(connection):
     """Calculates percentage of international students (not American or Other)."""
     cursor = connection.cursor()
-    # International count
-    query_intl = sql.SQL(
-        "SELECT COUNT(*) FROM {table} WHERE {col} ILIKE {pattern} LIMIT {limit}"
-    ).format(
-        table=sql.Identifier('applicants'),
-        col=sql.Identifier('us_or_international'),
-        pattern=sql.Literal('%International%'),
-        limit=sql.Literal(LIMIT),
-    )
-    cursor.execute(query_intl)
-    international = cursor.fetchone()[0]
-    # Total count
-    query_total = sql.SQL(
-        "SELECT COUNT(*) FROM {table} LIMIT {limit}"
-    ).format(
-        table=sql.Identifier('applicants'),
-        limit=sql.Literal(LIMIT),
-    )
-    cursor.execute(query_total)
-    total = cursor.fetchone()[0]
+    international, total = _select_stats(cursor, _total(INTERNATIONAL), _total())
     percent = (international / total) * 100 if total > 0 else 0
     cursor.close()
     return round(percent, 2)
@@ -68,73 +158,23 @@ def percent_international(connection):
 def average_metrics(connection):
     """Finds the average GPA, GRE, GRE V, and GRE AW for applicants who provided each metric."""
     cursor = connection.cursor()
-    metrics = {}
-    for col in ['gpa', 'gre', 'gre_v', 'gre_aw']:
-        query = sql.SQL(
-            "SELECT AVG({col}) FROM {table} WHERE {col} IS NOT NULL LIMIT {limit}"
-        ).format(
-            col=sql.Identifier(col),
-            table=sql.Identifier('applicants'),
-            limit=sql.Literal(LIMIT),
-        )
-        cursor.execute(query)
-        metrics[col] = cursor.fetchone()[0]
+    metrics = _select_stats(cursor, *(_average(col) for col in ['gpa', 'gre', 'gre_v', 'gre_aw']))
     cursor.close()
-    return metrics['gpa'], metrics['gre'], metrics['gre_v'], metrics['gre_aw']
+    return metrics
 
 def average_gpa_american_spring_2025(connection):
     """Finds average GPA of American students who applied for Spring 2025."""
     cursor = connection.cursor()
-    query = sql.SQL("""
-        SELECT AVG({gpa}) FROM {table}
-        WHERE {nation} ILIKE {american}
-        AND {term_col} ILIKE {term}
-        AND {gpa} IS NOT NULL
-        LIMIT {limit}
-    """).format(
-        gpa=sql.Identifier('gpa'),
-        table=sql.Identifier('applicants'),
-        nation=sql.Identifier('us_or_international'),
-        american=sql.Literal('%American%'),
-        term_col=sql.Identifier('term'),
-        term=sql.Literal('%Spring 2025%'),
-        limit=sql.Literal(LIMIT),
-    )
-    cursor.execute(query)
-    result = cursor.fetchone()[0]
+    condition = sql.SQL("{} AND {}").format(AMERICAN, SPRING_2025)
+    result = _select_stats(cursor, _average('gpa', condition))[0]
     cursor.close()
     return result
 
 def percent_acceptances_spring_2025(connection):
     """Percent of Spring 2025 entries that are Acceptances."""
     cursor = connection.cursor()
-    # Total
-    query_total = sql.SQL(
-        "SELECT COUNT(*) FROM {table} WHERE {term_col} ILIKE {term} LIMIT {limit}"
-    ).format(
-        table=sql.Identifier('applicants'),
-        term_col=sql.Identifier('term'),
-        term=sql.Literal('%Spring 2025%'),
-        limit=sql.Literal(LIMIT),
-    )
-    cursor.execute(query_total)
-    total = cursor.fetchone()[0]
-    # Accepted
-    query_accepted = sql.SQL("""
-        SELECT COUNT(*) FROM {table}
-        WHERE {term_col} ILIKE {term}
-        AND {status_col} ILIKE {status}
-        LIMIT {limit}
-    """).format(
-        table=sql.Identifier('applicants'),
-        term_col=sql.Identifier('term'),
-        term=sql.Literal('%Spring 2025%'),
-        status_col=sql.Identifier('status'),
-        status=sql.Literal('%Accepted%'),
-        limit=sql.Literal(LIMIT),
-    )
-    cursor.execute(query_accepted)
-    accepted = cursor.fetchone()[0]
+    accepted, total = _select_stats(
+        cursor, _total(sql.SQL("{} AND {}").format(SPRING_2025, ACCEPTED)), _total(SPRING_2025))
     percent = (accepted / total) * 100 if total > 0 else 0
     cursor.close()
     return round(percent, 2)
@@ -142,19 +182,118 @@ def percent_acceptances_spring_2025(connection):
 def average_gpa_accepted_spring_2025(connection):
     """Average GPA of accepted applicants who applied for Spring 2025."""
     cursor = connection.cursor()
-    query = sql.SQL("""
-        SELECT AVG({gpa}) FROM {table}
-        WHERE {term_col} ILIKE {term}
-        AND {status_col} ILIKE {status}
-        AND {gpa} IS NOT NULL
-        LIMIT {limit}
-    """).format(
-        gpa=sql.Identifier('gpa'),
+    condition = sql.SQL("{} AND {}").format(SPRING_2025, ACCEPTED)
+    result = _select_stats(cursor, _average('gpa', condition))[0]
+    cursor.close()
+    return result
+
+def _ilike_any(column, patterns):
+    """Builds `(column ILIKE p1 OR column ILIKE p2 ...)` for a list of patterns."""
+    return sql.SQL("(") + sql.SQL(" OR ").join(
+        _matches(column, pattern) for pattern in patterns) + sql.SQL(")")
+
+def _university_condition(university):
+    """Builds a condition matching applicants of a university given by any of its names.
+
+    The name is normalized like module 2's cleaner normalizes it (case, punctuation and a
+    leading 'The' are ignored) and looked up in `university_aliases` (known aliases such as
+    'JHU', and the reported and canonical names of loaded applicants) and in `universities`,
+    so the applicants are found by their indexed `university_id` rather than by matching
+    their `university` text.
+    """
+    return sql.SQL("""{col} IN (
+        SELECT university_id FROM university_aliases WHERE alias = {alias}
+        UNION SELECT university_id FROM universities WHERE lower(name) = lower({name})
+    )""").format(col=sql.Identifier('university_id'), alias=sql.Literal(normalize_name(university)),
+                 name=sql.Literal(university))
+
+def _term_condition(term):
+    """Builds a condition on the normalized term columns for a term such as 'Spring 2025'.
+
+    Raises:
+        ValueError: If `term` is not a season followed by a year.
+    """
+    match = TERM_PATTERN.fullmatch(term.strip())
+    if match is None:
+        raise ValueError(f"Unrecognized term {term!r}; expected e.g. 'Spring 2025'")
+    return sql.SQL("{} AND {}").format(_equals('term_season', match.group(1).title()),
+                                       _equals('term_year', int(match.group(2))))
+
+def _contains_any(column, values):
+    """Builds a case-insensitive substring match of `column` against one or more values."""
+    values = [values] if isinstance(values, str) else values
+    return _ilike_any(column, [f'%{value}%' for value in values])
+
+def jhu_cs_masters_condition():
+    """Condition on applicant rows matching JHU masters applicants in Computer Science.
+
+    `load_data` evaluates it when grouping applicants into `applicant_stats`, where the
+    result is stored in the `jhu_cs_masters` column.
+    """
+    return sql.SQL("{jhu} AND {masters} AND {cs}").format(
+        jhu=_university_condition(JHU),
+        masters=_ilike_any('degree', MASTERS_PATTERNS),
+        cs=_matches('program', '%Computer Science%'),
+    )
+
+def _enum_condition(column, value, values):
+    """Builds `column = value` for an enum column whose labels are `values`.
+
+    Raises:
+        ValueError: If `value` is not one of `values`.
+    """
+    if value not in values:
+        raise ValueError(f"Unrecognized {column} {value!r}; expected one of {values}")
+    return _equals(column, value)
+
+def _applicant_filters(*, university=None,  # pylint: disable=too-many-arguments
+                       degree=None, program=None, term=None, decision=None, nationality=None):
+    """Builds the WHERE clause for `count_applicants` and `export` filters (see there).
+
+    Raises:
+        ValueError: If the term, decision or nationality is not recognized.
+    """
+    conditions = [sql.SQL("TRUE")]
+    if university is not None:
+        conditions.append(_university_condition(university))
+    if degree is not None:
+        conditions.append(_contains_any('degree', degree))
+    if program is not None:
+        conditions.append(_contains_any('program', program))
+    if term is not None:
+        conditions.append(_term_condition(term))
+    if decision is not None:
+        conditions.append(_enum_condition('decision', decision, DECISIONS))
+    if nationality is not None:
+        conditions.append(_enum_condition('nationality', nationality, NATIONALITIES))
+    return sql.SQL(" AND ").join(conditions)
+
+def count_applicants(connection, *, university=None,  # pylint: disable=too-many-arguments
+                     degree=None, program=None, term=None, decision=None, nationality=None):
+    """Counts the applicants matching every given filter.
+
+    Args:
+        connection: psycopg2 database connection object.
+        university (str): Canonical name or any reported alias of the institution
+            (e.g. 'JHU' or 'Johns Hopkins University').
+        degree (str or list): Case-insensitive substring(s) of the degree; any may match.
+        program (str or list): Case-insensitive substring(s) of the program; any may match.
+        term (str): Term such as 'Spring 2025'.
+        decision (str): One of `DECISIONS`, e.g. 'Accepted'.
+        nationality (str): One of `NATIONALITIES`, e.g. 'International'.
+
+    Returns:
+        int: Number of matching applicants.
+
+    Raises:
+        ValueError: If `term` is not a season followed by a year, or `decision` or
+            `nationality` is not one of the known values.
+    """
+    cursor = connection.cursor()
+    query = sql.SQL("SELECT COUNT(*) FROM {table} WHERE {where_clause} LIMIT {limit}").format(
         table=sql.Identifier('applicants'),
-        term_col=sql.Identifier('term'),
-        term=sql.Literal('%Spring 2025%'),
-        status_col=sql.Identifier('status'),
-        status=sql.Literal('%Accepted%'),
+        where_clause=_applicant_filters(university=university, degree=degree, program=program,
+                                        term=term, decision=decision, nationality=nationality),
         limit=sql.Literal(LIMIT),
     )
     cursor.execute(query)
@@ -165,46 +304,343 @@ def average_gpa_accepted_spring_2025(connection):
 def count_jhu_cs_masters(connection):
     """Counts entries for JHU, masters, Computer Science."""
     cursor = connection.cursor()
-    jhu_conditions = [
-        sql.SQL("{univ} ILIKE {val}").format(
-            univ=sql.Identifier('university'),
-            val=sql.Literal(pattern)
-        ) for pattern in [
-            '%JHU%', '%Johns Hopkins%', '%John Hopkins%', '%John Hopkin%', '%Johns Hopkin%'
-        ]
-    ]
-    degree_conditions = [
-        sql.SQL("{deg} ILIKE {val}").format(
-            deg=sql.Identifier('degree'),
-            val=sql.Literal(pattern)
-        ) for pattern in [
-            '%Master%', '%MS%', '%Masters%'
-        ]
-    ]
-    where_clause = (
-        sql.SQL("(")
-        + sql.SQL(" OR ").join(jhu_conditions)
-        + sql.SQL(") AND (")
-        + sql.SQL(" OR ").join(degree_conditions)
-        + sql.SQL(")")
-    )
+    result = _select_stats(cursor, _total(sql.Identifier('jhu_cs_masters')))[0]
+    cursor.close()
+    return result
+
+def data_version(connection):
+    """Returns the data version, which `load_data` bumps whenever a load changes applicants."""
+    cursor = connection.cursor()
+    cursor.execute("SELECT data_version FROM applicants_meta;")
+    result = cursor.fetchone()[0]
+    cursor.close()
+    return result
+
+def decision_timeline(connection, university=None, program=None, term=None):
+    """Counts decisions per week (starting Monday), optionally for one university, program and term.
+
+    Reads the `decision_weeks` rollup that `load_data` keeps up to date, so no applicants
+    are scanned.
+
+    Args:
+        connection: psycopg2 database connection object.
+        university (str): Canonical name or any reported alias of the institution.
+        program (str): Program name, matched exactly (case-insensitive).
+        term (str): Term such as 'Fall 2025'.
+
+    Returns:
+        list: `(week_start, decision, count)` tuples ordered by week, then decision.
+
+    Raises:
+        ValueError: If `term` is not a season followed by a year.
+    """
+    conditions = [sql.SQL("TRUE")]
+    if university is not None:
+        conditions.append(_university_condition(university))
+    if program is not None:
+        conditions.append(sql.SQL("lower({col}) = lower({val})").format(
+            col=sql.Identifier('program'), val=sql.Literal(program)))
+    if term is not None:
+        conditions.append(_term_condition(term))
+    cursor = connection.cursor()
     query = sql.SQL("""
-        SELECT COUNT(*) FROM {table}
+        SELECT {week}, {decision}, SUM({count})::bigint
+        FROM {table}
         WHERE {where_clause}
-        AND {prog} ILIKE {cs}
+        GROUP BY {week}, {decision}
+        ORDER BY {week}, {decision}
+    """).format(
+        week=sql.Identifier('week'),
+        decision=sql.Identifier('decision'),
+        count=sql.Identifier('applicants'),
+        table=sql.Identifier('decision_weeks'),
+        where_clause=sql.SQL(" AND ").join(conditions),
+    )
+    cursor.execute(query)
+    result = cursor.fetchall()
+    cursor.close()
+    return result
+
+def recent_decisions(connection, days=7):
+    """Counts the decisions made in the last `days` days (including today), by decision.
+
+    Args:
+        connection: psycopg2 database connection object.
+        days (int): Length of the window in days.
+
+    Returns:
+        dict: Number of applicants per decision, e.g. {'Accepted': 12, 'Rejected': 30}.
+    """
+    cursor = connection.cursor()
+    query = sql.SQL("""
+        SELECT {decision}, COUNT(*) FROM {table}
+        WHERE {date} > CURRENT_DATE - {days}
+        GROUP BY {decision}
         LIMIT {limit}
     """).format(
+        decision=sql.Identifier('decision'),
         table=sql.Identifier('applicants'),
-        where_clause=where_clause,
-        prog=sql.Identifier('program'),
-        cs=sql.Literal('%Computer Science%'),
+        date=sql.Identifier('date_decision'),
+        days=sql.Literal(days),
         limit=sql.Literal(LIMIT),
     )
     cursor.execute(query)
-    result = cursor.fetchone()[0]
+    result = dict(cursor.fetchall())
     cursor.close()
     return result
 
+def weekly_decisions(connection, start, end):
+    """Counts decisions per week (starting Monday) and decision between two dates.
+
+    Args:
+        connection: psycopg2 database connection object.
+        start (datetime.date): First day included.
+        end (datetime.date): First day excluded.
+
+    Returns:
+        list: `(week_start, decision, count)` tuples ordered by week, then decision.
+    """
+    cursor = connection.cursor()
+    query = sql.SQL("""
+        SELECT date_trunc('week', {date})::date AS week, {decision}, COUNT(*)
+        FROM {table}
+        WHERE {date} >= {start} AND {date} < {end}
+        GROUP BY week, {decision}
+        ORDER BY week, {decision}
+    """).format(
+        date=sql.Identifier('date_decision'),
+        decision=sql.Identifier('decision'),
+        table=sql.Identifier('applicants'),
+        start=sql.Literal(start),
+        end=sql.Literal(end),
+    )
+    cursor.execute(query)
+    result = cursor.fetchall()
+    cursor.close()
+    return result
+
+def _like_pattern(text):
+    """Escapes LIKE wildcards in `text` and wraps it for a substring match."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def search(connection, text, page=1, per_page=20):
+    """Searches applicants' programs and comments, best matches first.
+
+    An applicant matches when its program or comments contain `text` as a substring
+    (case-insensitive, indexed with pg_trgm), or when they match it as a keyword query
+    (`websearch_to_tsquery` syntax: words, "quoted phrases", `or`, `-excluded`) against
+    the `search_tsv` full-text column. Program substring matches rank first, then
+    applicants by full-text rank, with program words weighted above comment words.
+
+    Args:
+        connection: psycopg2 database connection object.
+        text (str): Search text.
+        page (int): 1-based page number.
+        per_page (int): Results per page, at most `MAX_PAGE_SIZE`.
+
+    Returns:
+        SearchPage: The requested page of results.
+
+    Raises:
+        ValueError: If `text` is blank or `page`/`per_page` are out of range.
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("Search text must not be empty")
+    if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+        raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_PAGE_SIZE}")
+    cursor = connection.cursor()
+    query = sql.SQL("""
+        SELECT {columns},
+            CASE WHEN {program} ILIKE {pattern} THEN 1 ELSE 0 END
+            + ts_rank({tsv}, websearch_to_tsquery('english', {text})) AS rank
+        FROM {table}
+        WHERE {tsv} @@ websearch_to_tsquery('english', {text})
+            OR {program} ILIKE {pattern}
+            OR {comments} ILIKE {pattern}
+        ORDER BY rank DESC, {p_id} DESC
+        LIMIT {limit} OFFSET {offset}
+    """).format(
+        columns=sql.SQL(", ").join(sql.Identifier(col) for col in SEARCH_COLUMNS),
+        program=sql.Identifier('program'),
+        comments=sql.Identifier('comments'),
+        tsv=sql.Identifier('search_tsv'),
+        p_id=sql.Identifier('p_id'),
+        pattern=sql.Literal(_like_pattern(text)),
+        text=sql.Literal(text),
+        table=sql.Identifier('applicants'),
+        # One extra row tells whether another page follows
+        limit=sql.Literal(per_page + 1),
+        offset=sql.Literal((page - 1) * per_page),
+    )
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    cursor.close()
+    results = [dict(zip((*SEARCH_COLUMNS, 'rank'), row)) for row in rows[:per_page]]
+    return SearchPage(query=text, page=page, per_page=per_page,
+                      has_more=len(rows) > per_page, results=results)
+
+def _csv_chunks(batches):
+    """Yields a CSV header, then one block of CSV lines per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for rows in itertools.chain([[EXPORT_COLUMNS]], batches):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def _ndjson_chunks(batches):
+    """Yields one block of JSON lines (one object per applicant) per batch of rows."""
+    for rows in batches:
+        yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n"
+                      for row in rows)
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only file whose written bytes are handed back, and released, by `drain()`.
+
+    `tell()` keeps counting across drains, since Parquet records absolute file offsets.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        """Returns the bytes written since the last call."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _parquet_chunks(batches):
+    """Yields a Parquet file in pieces, writing each batch of rows as one row group."""
+    types = {
+        'p_id': pyarrow.int32(),
+        'date_added': pyarrow.date32(),
+        'date_decision': pyarrow.date32(),
+        **{metric: pyarrow.float64() for metric in ('gpa', 'gre', 'gre_v', 'gre_aw')},
+    }
+    schema = pyarrow.schema([(column, types.get(column, pyarrow.string()))
+                             for column in EXPORT_COLUMNS])
+    sink = _StreamBuffer()
+    with parquet.ParquetWriter(sink, schema) as writer:
+        for rows in batches:
+            writer.write_table(pyarrow.Table.from_pylist(
+                [dict(zip(EXPORT_COLUMNS, row)) for row in rows], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+_EXPORT_WRITERS = {'csv': _csv_chunks, 'ndjson': _ndjson_chunks, 'parquet': _parquet_chunks}
+
+def export(connection, fmt='csv', *, itersize=EXPORT_ITERSIZE, **filters):
+    """Exports the applicants matching `filters`, ordered by id, as a stream of chunks.
+
+    Rows are read through a named (server-side) cursor `itersize` rows at a time and each
+    batch is encoded as it arrives, so memory use does not depend on how many rows match.
+    The query only runs once the returned generator is iterated; the connection must stay
+    open, and not be used for anything else, until it is exhausted or closed.
+
+    Args:
+        connection: psycopg2 database connection object.
+        fmt (str): One of `EXPORT_FORMATS`. CSV and NDJSON chunks are `str`, Parquet
+            chunks are `bytes`; Parquet needs the optional pyarrow package.
+        itersize (int): Rows fetched from the server, and encoded, per chunk.
+        **filters: Any of the `count_applicants` filters (university, degree, program,
+            term, decision, nationality).
+
+    Returns:
+        Generator of str or bytes chunks that together form the exported file.
+
+    Raises:
+        ValueError: If the format is unknown or unavailable, or a filter is invalid.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+    if fmt == 'parquet' and pyarrow is None:
+        raise ValueError("Parquet export requires the optional pyarrow package")
+    columns = [
+        sql.SQL("(SELECT {name} FROM {universities} u WHERE u.{id} = {university_id})").format(
+            name=sql.Identifier('name'),
+            universities=sql.Identifier('universities'),
+            id=sql.Identifier('university_id'),
+            university_id=sql.Identifier('applicants', 'university_id'),
+        ) if column == 'canonical_university' else sql.Identifier('applicants', column)
+        for column in EXPORT_COLUMNS
+    ]
+    query = sql.SQL("SELECT {columns} FROM {table} WHERE {where_clause} ORDER BY {p_id}").format(
+        columns=sql.SQL(", ").join(columns),
+        table=sql.Identifier('applicants'),
+        where_clause=_applicant_filters(**filters),
+        p_id=sql.Identifier('p_id'),
+    )
+    return _export_chunks(connection, query, _EXPORT_WRITERS[fmt], itersize)
+
+def _export_chunks(connection, query, writer, itersize):
+    """Runs `query` on a server-side cursor and yields `writer`'s chunks for its rows."""
+    cursor = connection.cursor(name='applicants_export')
+    cursor.itersize = itersize
+    try:
+        cursor.execute(query)
+        yield from writer(itertools.batched(cursor, itersize))
+    finally:
+        cursor.close()
+
+def dashboard_stats(connection):
+    """Computes every dashboard metric in one query over the `applicant_stats` table.
+
+    `applicant_stats` holds per-group counts and metric sums that `load_data` keeps up to
+    date, so the query reads a few hundred rows however many applicants are stored. Each
+    metric aggregates the groups matching its own `FILTER (WHERE ...)` clause.
+
+    Returns:
+        DashboardStats: The dashboard metrics.
+    """
+    cursor = connection.cursor()
+    spring_accepted = sql.SQL("{} AND {}").format(SPRING_2025, ACCEPTED)
+    (spring_count, total, international, avg_gpa, avg_gre, avg_gre_v, avg_gre_aw,
+     avg_gpa_american, spring_accepted_count, avg_gpa_accepted, jhu_cs_masters) = _select_stats(
+        cursor,
+        _total(SPRING_2025),
+        _total(),
+        _total(INTERNATIONAL),
+        _average('gpa'),
+        _average('gre'),
+        _average('gre_v'),
+        _average('gre_aw'),
+        _average('gpa', sql.SQL("{} AND {}").format(SPRING_2025, AMERICAN)),
+        _total(spring_accepted),
+        _average('gpa', spring_accepted),
+        _total(sql.Identifier('jhu_cs_masters')),
+    )
+    cursor.close()
+    return DashboardStats(
+        spring_2025_count=spring_count,
+        percent_international=round(international / total * 100, 2) if total > 0 else 0,
+        avg_gpa=avg_gpa,
+        avg_gre=avg_gre,
+        avg_gre_v=avg_gre_v,
+        avg_gre_aw=avg_gre_aw,
+        avg_gpa_american_spring_2025=avg_gpa_american,
+        percent_acceptances_spring_2025=(
+            round(spring_accepted_count / spring_count * 100, 2) if spring_count > 0 else 0
+        ),
+        avg_gpa_accepted_spring_2025=avg_gpa_accepted,
+        jhu_cs_masters=jhu_cs_masters,
+    )
+
 def parse_args():
     """Parses command-line arguments for DB connection.
 
@@ -217,32 +653,44 @@ def parse_args():
     parser.add_argument('--db_password', default='12345', help='Database password')
     parser.add_argument('--db_host', default='localhost', help='Database host')
     parser.add_argument('--db_port', default='5432', help='Database port')
+    parser.add_argument(
+        '--offline', nargs='?', type=Path, metavar='DATA_PATH',
+        const=Path(__file__).parent / "data" / "applicant_data.jsonl",
+        help='Compute the metrics in memory from a cleaned data file (default '
+             'data/applicant_data.jsonl) instead of querying the database; requires NumPy')
     return parser.parse_args()
 
 def main():
     """Main function to parse arguments and run queries."""
     args = parse_args()
-    db_conn = create_connection(
-        db_name=args.db_name,
-        db_user=args.db_user,
-        db_password=args.db_password,
-        db_host=args.db_host,
-        db_port=args.db_port
-    )
+    if args.offline:
+        # Imported only when needed, since NumPy is optional
+        offline = importlib.import_module('offline')
+        queries, db_conn = offline, offline.ColumnarStore.from_file(args.offline)
+    else:
+        queries = sys.modules[__name__]
+        db_conn = create_connection(
+            db_name=args.db_name,
+            db_user=args.db_user,
+            db_password=args.db_password,
+            db_host=args.db_host,
+            db_port=args.db_port
+        )
     if db_conn:
-        print(f"Entries for Spring 2025: {count_spring_2025_entries(db_conn)}")
-        print(f"Percentage of international students: {percent_international(db_conn)}")
-        metrics = average_metrics(db_conn)
+        print(f"Entries for Spring 2025: {queries.count_spring_2025_entries(db_conn)}")
+        print(f"Percentage of international students: {queries.percent_international(db_conn)}")
+        metrics = queries.average_metrics(db_conn)
         print(f"Average GPA: {metrics[0]:.2f}, "
               f"GRE: {metrics[1]:.2f}, "
               f"GRE V: {metrics[2]:.2f}, "
               f"GRE AW: {metrics[3]:.2f} ")
         print(f"Average GPA (American, Spring 2025): "
-              f"{average_gpa_american_spring_2025(db_conn):.2f}")
-        print(f"Percent Acceptances (Spring 2025): {percent_acceptances_spring_2025(db_conn):.2f}")
+              f"{queries.average_gpa_american_spring_2025(db_conn):.2f}")
+        print(f"Percent Acceptances (Spring 2025): "
+              f"{queries.percent_acceptances_spring_2025(db_conn):.2f}")
         print(f"Average GPA (Accepted, Spring 2025): "
-              f"{average_gpa_accepted_spring_2025(db_conn):.2f}")
-        print(f"JHU Masters Computer Science applicants: {count_jhu_cs_masters(db_conn)}")
+              f"{queries.average_gpa_accepted_spring_2025(db_conn):.2f}")
+        print(f"JHU Masters Computer Science applicants: {queries.count_jhu_cs_masters(db_conn)}")
         db_conn.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+"""Fixtures for tests that need a PostgreSQL server.
+
+Tests connect to a scratch database named by `TEST_DB_NAME` (default `gradcafe_test`),
+which is created if missing. The host, port, user and password come from the standard
+libpq environment variables (`PGHOST`, `PGPORT`, `PGUSER`, `PGPASSWORD`). Tests using
+`connection` are skipped when no server is reachable.
+"""
+import os
+import psycopg2
+import pytest
+
+import app
+import load_data
+from db_pool import ConnectionPool
+
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME", "gradcafe_test")
+
+def _connect():
+    """Connects to the test database, creating it first if it does not exist."""
+    try:
+        return psycopg2.connect(dbname=TEST_DB_NAME)
+    except psycopg2.OperationalError as e:
+        if "does not exist" not in str(e):
+            raise
+    admin = psycopg2.connect(dbname="postgres")
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f'CREATE DATABASE "{TEST_DB_NAME}";')
+    admin.close()
+    return psycopg2.connect(dbname=TEST_DB_NAME)
+
+@pytest.fixture
+def connection():
+    """A connection to the test database."""
+    try:
+        conn = _connect()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e}")
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def applicants_db(connection):  # pylint: disable=redefined-outer-name
+    """The test database with freshly created, empty applicant tables."""
+    load_data.create_table(connection, rebuild=True)
+    return connection
+
+@pytest.fixture
+def client(applicants_db):  # pylint: disable=redefined-outer-name,unused-argument
+    """A Flask test client whose requests use the test database."""
+    app.app.extensions["db_pool"] = ConnectionPool(1, 2, dbname=TEST_DB_NAME)
+    yield app.app.test_client()
+    app.app.extensions.pop("db_pool").closeall()
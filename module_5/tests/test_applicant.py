@@ -0,0 +1,37 @@
+"""Tests for the typed applicant records."""
+import pytest
+
+from applicant import Applicant, ApplicantBatch
+
+@pytest.mark.load
+def test_plain_numbers_round_trip():
+    """Test that plain numbers are written back exactly as they were read."""
+    record = {"gpa": "3.80", "gre": "320", "gre_v": "160", "gre_aw": "4.0"}
+    applicant = Applicant.from_json(record)
+    assert (applicant.gpa, applicant.gre, applicant.gre_v, applicant.gre_aw) == (3.8, 320, 160, 4.0)
+    assert {key: applicant.to_json()[key] for key in record} == record
+    assert {key: ApplicantBatch([record]).to_json()[0][key] for key in record} == record
+
+@pytest.mark.load
+@pytest.mark.parametrize("text, value, written", [
+    ("03.5", 3.5, "3.5"),
+    (" 3.50 ", 3.5, "3.50"),
+    ("3.8.1", None, None),
+    ("n/a", None, None),
+    ("nan", None, None),
+    ("inf", None, None),
+])
+def test_other_gpa_text_is_read_leniently(text, value, written):
+    """Test that a GPA that is not a plain number is normalized or read as missing."""
+    applicant = Applicant.from_json({"gpa": text})
+    assert applicant.gpa == value
+    assert applicant.to_json()["gpa"] == written
+    assert ApplicantBatch([{"gpa": text}]).texts("gpa") == [written]
+
+@pytest.mark.load
+@pytest.mark.parametrize("text, value", [("0320", 320), ("320.0", 320), (" 320 ", 320),
+                                         ("320.5", None), ("high", None)])
+def test_other_gre_text_is_read_leniently(text, value):
+    """Test that a GRE score that is not a plain integer is normalized or read as missing."""
+    assert Applicant.from_json({"gre": text}).gre == value
+    assert ApplicantBatch([{"gre": text}]).values("gre") == [value]
@@ -0,0 +1,58 @@
+"""Tests for the dashboard's result cache."""
+import threading
+
+import pytest
+
+from cache import ResultCache
+
+@pytest.mark.cache
+def test_least_recently_used_entry_is_evicted():
+    """Test that a full cache evicts the entry used longest ago."""
+    cache = ResultCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: None)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.get_or_compute("a", lambda: "recomputed") == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 2
+
+@pytest.mark.cache
+def test_key_locks_are_dropped():
+    """Test that no per-key lock outlives the computation or an invalidation."""
+    cache = ResultCache()
+    for key in range(100):
+        cache.get_or_compute(("timeline", key), lambda: [])
+    assert not cache._key_locks  # pylint: disable=protected-access
+    started, release = threading.Event(), threading.Event()
+    worker = threading.Thread(target=cache.get_or_compute,
+                              args=("slow", lambda: started.set() or release.wait()))
+    worker.start()
+    started.wait()
+    cache.invalidate()
+    assert not cache._key_locks  # pylint: disable=protected-access
+    release.set()
+    worker.join()
+    assert not cache._key_locks  # pylint: disable=protected-access
+    assert cache.stats()["entries"] == 0
+
+@pytest.mark.cache
+def test_concurrent_misses_compute_once():
+    """Test that callers missing the same key at once share one computation."""
+    cache = ResultCache()
+    calls, release = [], threading.Event()
+    def compute():
+        calls.append(None)
+        release.wait()
+        return "value"
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(5)]
+    for worker in workers:
+        worker.start()
+    release.set()
+    for worker in workers:
+        worker.join()
+    assert results == ["value"] * 5
+    assert len(calls) == 1
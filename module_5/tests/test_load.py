@@ -0,0 +1,63 @@
+"""Tests for loading applicants into PostgreSQL."""
+import pytest
+
+import load_data
+
+def _record(result_id, **fields):
+    """A cleaned applicant record for GradCafe result `result_id`."""
+    record = {
+        "program": "Computer Science", "university": "Johns Hopkins University",
+        "comments": None, "date_added": "2025-01-17",
+        "url": f"https://www.thegradcafe.com/result/{result_id}", "status": "Accepted",
+        "date_decision": "2025-01-15", "term": "Fall 2025", "nationality": "American",
+        "gre": None, "gre_v": None, "degree": "Masters", "gpa": "3.80", "gre_aw": None,
+        "canonical_university": "Johns Hopkins University",
+    }
+    record.update(fields)
+    return record
+
+def _applicants(connection):
+    """Returns the stored (p_id, program, gpa) rows in p_id order."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT p_id, program, gpa FROM applicants ORDER BY p_id;")
+        return cursor.fetchall()
+
+@pytest.mark.db
+@pytest.mark.load
+@pytest.mark.parametrize("method", ["copy", "values"])
+def test_last_duplicate_wins(applicants_db, method):
+    """Test that a result id loaded more than once in one load keeps its last record."""
+    data = [_record(index % 50, program=f"Program {index}", gpa=f"{index % 4}.50")
+            for index in range(5000)]
+    counts = load_data.insert_data(applicants_db, data, method=method)
+    assert counts == {"inserted": 50, "updated": 0, "unchanged": 0}
+    assert _applicants(applicants_db) == [
+        (p_id, f"Program {4950 + p_id}", (4950 + p_id) % 4 + 0.5) for p_id in range(50)
+    ]
+
+@pytest.mark.db
+@pytest.mark.load
+def test_text_decision_dates_are_converted(connection):
+    """Test that a table with text decision days keeps them as dates after create_table."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            DROP TABLE IF EXISTS applicants, applicant_stats, decision_weeks, university_aliases,
+                universities, applicants_meta;
+            CREATE TABLE applicants (
+                p_id INTEGER PRIMARY KEY, program TEXT, university TEXT, comments TEXT,
+                date_added DATE, url TEXT, status TEXT, date_decision TEXT, term TEXT,
+                us_or_international TEXT, gre FLOAT, gre_v FLOAT, degree TEXT, gpa FLOAT,
+                gre_aw FLOAT
+            );
+            INSERT INTO applicants (p_id, date_added, date_decision, term) VALUES
+                (1, '2025-01-17', '15 Mar', 'Fall 2025'),
+                (2, NULL, '9 Jan', 'Spring 2024'),
+                (3, '2025-03-01', '2025-02-03', NULL),
+                (4, '2025-01-17', 'soon', 'Fall 2025');
+        """)
+    connection.commit()
+    load_data.create_table(connection)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT p_id, date_decision::TEXT FROM applicants ORDER BY p_id;")
+        assert cursor.fetchall() == [(1, "2024-03-15"), (2, "2024-01-09"), (3, "2025-02-03"),
+                                     (4, None)]
@@ -0,0 +1,46 @@
+"""Tests that the offline columnar metrics match the database's."""
+import dataclasses
+import itertools
+import random
+
+import pytest
+
+import load_data
+import query_data
+from tests.test_rollups import _loads
+
+offline = pytest.importorskip("offline", exc_type=ImportError)
+
+def _alias_records(first_id):
+    """Applicants reported under aliases, some cleaned before canonical names were added."""
+    return [
+        {"url": f"https://www.thegradcafe.com/result/{first_id + i}", "university": university,
+         "canonical_university": canonical, "program": "Computer Science", "degree": "Masters",
+         "term": "Spring 2025", "status": "Accepted", "nationality": "American", "gpa": "3.50"}
+        for i, (university, canonical) in enumerate([
+            ("JHU", "Johns Hopkins University"),
+            ("Johns Hopkins", None),
+            ("jhu", None),
+            ("Stanford", "Stanford University"),
+        ])
+    ]
+
+@pytest.mark.db
+@pytest.mark.query
+def test_offline_dashboard_stats_match_the_database(applicants_db):
+    """Test that offline.dashboard_stats equals query_data.dashboard_stats on the same loads."""
+    loads = list(_loads(random.Random(19)))
+    loads[-1] += _alias_records(10_000)
+    for data in loads:
+        load_data.insert_data(applicants_db, data)
+
+    store = offline.ColumnarStore(itertools.chain.from_iterable(loads))
+    expected = dataclasses.asdict(query_data.dashboard_stats(applicants_db))
+    actual = dataclasses.asdict(offline.dashboard_stats(store))
+    assert expected["jhu_cs_masters"] > 0
+    assert actual.keys() == expected.keys()
+    for metric, value in expected.items():
+        if value is None:
+            assert actual[metric] is None, metric
+        else:
+            assert actual[metric] == pytest.approx(value, rel=1e-9), metric
@@ -0,0 +1,131 @@
+"""Tests for the applicant filters of query_data and the Flask routes using them."""
+import pytest
+
+import load_data
+import query_data
+
+@pytest.mark.db
+@pytest.mark.query
+@pytest.mark.parametrize("filters", [{"decision": "accepted"}, {"nationality": "foo"}])
+def test_count_applicants_rejects_unknown_enum_values(applicants_db, filters):
+    """Test that count_applicants raises ValueError for an unknown decision or nationality."""
+    with pytest.raises(ValueError):
+        query_data.count_applicants(applicants_db, **filters)
+
+@pytest.mark.db
+@pytest.mark.query
+def test_count_applicants_accepts_known_enum_values(applicants_db):
+    """Test that count_applicants filters by every known decision and nationality."""
+    for decision in query_data.DECISIONS:
+        for nationality in query_data.NATIONALITIES:
+            assert query_data.count_applicants(applicants_db, decision=decision,
+                                               nationality=nationality) == 0
+
+@pytest.mark.db
+@pytest.mark.query
+@pytest.mark.parametrize("query", ["decision=accepted", "nationality=foo", "term=soon"])
+def test_export_rejects_unknown_filters(client, query):
+    """Test that /export answers 400, before streaming anything, for an invalid filter."""
+    response = client.get(f"/export?{query}")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+@pytest.mark.db
+@pytest.mark.query
+def test_export_with_known_filters(client):
+    """Test that /export streams a CSV for valid filters."""
+    response = client.get("/export?decision=Accepted&nationality=International")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+
+def _applicant(result_id, university, canonical_university):
+    """A cleaned applicant record reported under `university`."""
+    return {"url": f"https://www.thegradcafe.com/result/{result_id}", "university": university,
+            "canonical_university": canonical_university}
+
+@pytest.mark.db
+@pytest.mark.query
+def test_count_applicants_by_university_alias(applicants_db):
+    """Test that a university is found by its canonical name or any known or reported alias."""
+    load_data.insert_data(applicants_db, [
+        _applicant(1, "JHU", "Johns Hopkins University"),
+        _applicant(2, "Johns Hopkins", "Johns Hopkins University"),
+        _applicant(3, "johns hopkins university", "Johns Hopkins University"),
+        _applicant(4, "Jhu", None),  # cleaned before canonical names were added
+        _applicant(5, "Stanford", "Stanford University"),
+    ])
+    canonical = query_data.count_applicants(applicants_db, university="Johns Hopkins University")
+    assert canonical == 4
+    assert query_data.count_applicants(applicants_db, university="JHU") == canonical
+    for name in ("Johns Hopkins", "The Johns Hopkins University", "johns-hopkins university"):
+        assert query_data.count_applicants(applicants_db, university=name) == canonical
+    assert query_data.count_applicants(applicants_db, university="stanford") == 1
+
+@pytest.mark.db
+@pytest.mark.query
+def test_lowercased_aliases_are_rekeyed(applicants_db):
+    """Test that aliases stored lowercased by older versions are found after create_table."""
+    with applicants_db.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO universities (name) VALUES ('Stanford University');
+            INSERT INTO university_aliases (alias, university_id)
+            SELECT 'the stanford-university', university_id FROM universities
+            WHERE name = 'Stanford University';
+        """)
+    applicants_db.commit()
+    load_data.create_table(applicants_db)
+    load_data.insert_data(applicants_db, [_applicant(1, "The Stanford-University", None)])
+    assert query_data.count_applicants(applicants_db, university="Stanford University") == 1
+
+def _search_applicant(result_id, program, comments=None):
+    """A cleaned applicant record for `program` with optional `comments`."""
+    return {"url": f"https://www.thegradcafe.com/result/{result_id}", "program": program,
+            "comments": comments, "university": "Stanford University",
+            "canonical_university": "Stanford University"}
+
+@pytest.mark.db
+@pytest.mark.query
+def test_search_ranks_program_matches_first(applicants_db):
+    """Test that search ranks program substring matches above comment-only matches."""
+    load_data.insert_data(applicants_db, [
+        _search_applicant(1, "History", "Thinking of switching to robotics next year"),
+        _search_applicant(2, "Robotics"),
+        _search_applicant(3, "Mechanical Engineering", "Robotics lab, great robotics funding"),
+        _search_applicant(4, "Chemistry", "Nothing to report"),
+        _search_applicant(5, "Robotics and Autonomy", "Robotics robotics robotics"),
+    ])
+    found = query_data.search(applicants_db, "robotics")
+    ids = [result["p_id"] for result in found.results]
+    assert set(ids) == {1, 2, 3, 5}
+    assert set(ids[:2]) == {2, 5}
+    ranks = [result["rank"] for result in found.results]
+    assert ranks == sorted(ranks, reverse=True)
+    assert not found.has_more
+
+    excluded = query_data.search(applicants_db, "robotics -funding")
+    assert 3 not in [result["p_id"] for result in excluded.results]
+
+@pytest.mark.db
+@pytest.mark.query
+def test_search_pages_split_at_per_page(applicants_db):
+    """Test that search pages hold per_page results, has_more is exact, and none repeat."""
+    load_data.insert_data(applicants_db, [_search_applicant(i, "Physics") for i in range(1, 6)])
+    pages = [query_data.search(applicants_db, "physics", page=page, per_page=2)
+             for page in (1, 2, 3, 4)]
+    assert [len(page.results) for page in pages] == [2, 2, 1, 0]
+    assert [page.has_more for page in pages] == [True, True, False, False]
+    ids = [result["p_id"] for page in pages for result in page.results]
+    assert ids == [5, 4, 3, 2, 1]
+
+    exact = query_data.search(applicants_db, "physics", per_page=5)
+    assert len(exact.results) == 5
+    assert not exact.has_more
+
+@pytest.mark.db
+@pytest.mark.query
+@pytest.mark.parametrize("kwargs", [{"text": "  "}, {"text": "physics", "page": 0},
+                                    {"text": "physics", "per_page": query_data.MAX_PAGE_SIZE + 1}])
+def test_search_rejects_invalid_arguments(applicants_db, kwargs):
+    """Test that search raises ValueError for blank text or an out-of-range page."""
+    with pytest.raises(ValueError):
+        query_data.search(applicants_db, **kwargs)
@@ -0,0 +1,95 @@
+"""Tests that the loader keeps its rollups in step with the applicants table."""
+import random
+import select
+
+import psycopg2
+import pytest
+
+import load_data
+import query_data
+from tests.conftest import TEST_DB_NAME
+
+PROGRAMS = ("Computer Science", "Physics", "Mathematics")
+UNIVERSITIES = ("Johns Hopkins University", "Stanford University", "MIT")
+DEGREES = ("Masters", "PhD")
+TERMS = ("Fall 2025", "Spring 2025", "Fall 2024", None)
+STATUSES = ("Accepted", "Rejected", "Wait listed", "Interview", "Other", None)
+NATIONALITIES = ("American", "International", None)
+
+def _random_record(rng, result_id):
+    """A cleaned applicant record for GradCafe result `result_id` with random fields."""
+    university = rng.choice(UNIVERSITIES)
+    return {
+        "program": rng.choice(PROGRAMS), "university": university, "comments": None,
+        "date_added": f"2025-0{rng.randint(1, 9)}-{rng.randint(10, 28)}",
+        "url": f"https://www.thegradcafe.com/result/{result_id}",
+        "status": rng.choice(STATUSES),
+        "date_decision": rng.choice((None, f"2025-0{rng.randint(1, 9)}-{rng.randint(10, 28)}")),
+        "term": rng.choice(TERMS), "nationality": rng.choice(NATIONALITIES),
+        "gre": rng.choice((None, str(rng.randint(290, 340)))),
+        "gre_v": rng.choice((None, str(rng.randint(140, 170)))),
+        "degree": rng.choice(DEGREES),
+        "gpa": rng.choice((None, f"{rng.uniform(2.5, 4.0):.2f}")),
+        "gre_aw": rng.choice((None, f"{rng.randint(6, 12) / 2:.1f}")),
+        "canonical_university": university,
+    }
+
+def _table(connection, table):
+    """Returns every row of a rollup table, sorted."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT * FROM {table};")
+        return sorted(cursor.fetchall(), key=repr)
+
+def _loads(rng):
+    """Yields the data of successive loads: new, changed, unchanged and repeated applicants."""
+    records = {result_id: _random_record(rng, result_id) for result_id in range(300)}
+    yield list(records.values())
+    for _ in range(3):
+        for result_id in rng.sample(sorted(records), 100):
+            records[result_id] = _random_record(rng, result_id)
+        for result_id in range(len(records), len(records) + 50):
+            records[result_id] = _random_record(rng, result_id)
+        repeated = [_random_record(rng, result_id) for result_id in rng.sample(sorted(records), 20)]
+        yield repeated + list(records.values())
+
+@pytest.mark.db
+@pytest.mark.load
+@pytest.mark.parametrize("method", ["copy", "values"])
+def test_incremental_stats_match_refresh(applicants_db, method):
+    """Test that applicant_stats after each load equals a full recomputation."""
+    for data in _loads(random.Random(12)):
+        load_data.insert_data(applicants_db, data, method=method)
+        incremental = _table(applicants_db, "applicant_stats")
+        load_data.refresh_stats(applicants_db)
+        assert incremental == _table(applicants_db, "applicant_stats")
+
+@pytest.mark.db
+@pytest.mark.load
+@pytest.mark.parametrize("method", ["copy", "values"])
+def test_incremental_decision_weeks_match_refresh(applicants_db, method):
+    """Test that decision_weeks after each load equals a full recomputation."""
+    for data in _loads(random.Random(17)):
+        load_data.insert_data(applicants_db, data, method=method)
+        incremental = _table(applicants_db, "decision_weeks")
+        assert incremental
+        load_data.refresh_stats(applicants_db)
+        assert incremental == _table(applicants_db, "decision_weeks")
+
+@pytest.mark.db
+@pytest.mark.load
+def test_refresh_bumps_data_version_and_notifies(applicants_db):
+    """Test that refresh_stats bumps the data version and notifies listening dashboards."""
+    load_data.insert_data(applicants_db, list(_loads(random.Random(1)))[0])
+    version = query_data.data_version(applicants_db)
+    applicants_db.commit()
+    listener = psycopg2.connect(dbname=TEST_DB_NAME)
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute("LISTEN applicants_changed;")
+    load_data.refresh_stats(applicants_db)
+    # The notification is delivered asynchronously, after the refresh commits
+    select.select([listener], [], [], 5)
+    listener.poll()
+    assert [notify.payload for notify in listener.notifies] == [str(version + 1)]
+    assert query_data.data_version(applicants_db) == version + 1
+    listener.close()